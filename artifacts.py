@@ -0,0 +1,285 @@
+# artifacts.py
+"""
+Index of the files produced by training runs (Q-tables, GA states, best parameters).
+
+Brains and tools used to find their inputs by listing the working directory and
+taking the newest matching file by ctime, which gets slow in crowded directories and
+picks the wrong file as soon as another run writes something similar. The registry
+keeps one JSON index per directory instead:
+
+    {"artifacts": {path: {kind, brain, run_id, created, size, metrics}},
+     "latest": {kind: path}, "best": {kind: path}, "runs": {run_id: {kind: path}}}
+
+so `latest`, `best` (highest metrics['score']) and run id lookups are dict accesses.
+The index and the artifacts registered through save_atomic are written to a
+temporary file and renamed, so readers never see half-written files. Registrations
+reread, update and rewrite the index under an exclusive lock on INDEX_FILE.lock
+(fcntl, POSIX only), so concurrent processes do not lose each other's entries. In a
+directory without an index, lookups scan the existing files (REBUILD_PATTERNS) in
+memory; the index file is only written by register and rebuild.
+
+Usage:
+    python artifacts.py list [--kind q_table]
+    python artifacts.py find q_table [latest|best|<run id>]
+    python artifacts.py rebuild
+"""
+import os
+import json
+import time
+import argparse
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: registrations are not serialized between processes
+    fcntl = None
+
+INDEX_FILE = 'artifacts.json'
+LOCK_SUFFIX = '.lock'  # Lock file next to the index, held while the index is rewritten
+BEST_METRIC = 'score'  # Metric compared by the 'best' tag, higher is better
+
+Q_TABLE = 'q_table'
+GA_STATE = 'ga_state'
+BEST_PARAMS = 'best_params'
+
+# Kind -> (file name prefix, extensions) of the files imported into a new index
+REBUILD_PATTERNS = {
+    Q_TABLE: ('q_table-', ('.npz', '.pkl')),
+    GA_STATE: ('ga_state-', ('.pkl',)),
+    BEST_PARAMS: ('best_brain_params', ('.json',)),
+}
+REBUILD_EXCLUDE = ('.snapshot.', '.tmp-')  # Actor snapshots (qlearning_actors.py) and unfinished writes
+
+
+def temporary_path(path):
+    """A sibling of path with the same extension (np.savez would otherwise append '.npz')."""
+    root, extension = os.path.splitext(path)
+    return f"{root}.tmp-{os.getpid()}{extension}"
+
+
+def save_atomic(path, save):
+    """
+    Calls save(temporary path), then renames the result over path.
+
+    Args:
+        save (callable): Writes the artifact to the path it is given.
+    """
+    temporary = temporary_path(path)
+    try:
+        save(temporary)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def write_json_atomic(path, data):
+    def save(temporary):
+        with open(temporary, 'w') as f:
+            json.dump(data, f)
+    save_atomic(path, save)
+
+
+class ArtifactRegistry:
+    """
+    Args:
+        directory (str): Directory of the artifacts and of its INDEX_FILE.
+    """
+
+    def __init__(self, directory='.'):
+        self.directory = directory or '.'
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._index = None
+        self._mtime = None
+
+    # ============================
+    # Index
+    # ============================
+
+    @staticmethod
+    def empty_index():
+        return {'artifacts': {}, 'latest': {}, 'best': {}, 'runs': {}}
+
+    def index(self):
+        """
+        The index, reread only when another process replaced it. Without a readable index file,
+        the directory is scanned in memory (nothing is written until register or rebuild).
+        """
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            if self._index is None or self._mtime is not None:
+                self._index, self._mtime = self.scan(), None
+            return self._index
+        if self._index is None or mtime != self._mtime:
+            try:
+                with open(self.index_path) as f:
+                    self._index = json.load(f)
+                self._mtime = mtime
+            except (OSError, ValueError) as e:
+                print(f"Unreadable artifact index {self.index_path} ({e}), scanning the directory.")
+                self._index, self._mtime = self.scan(), mtime
+        return self._index
+
+    @contextmanager
+    def locked(self):
+        """Exclusive lock between processes for a read-modify-write of the index."""
+        with open(self.index_path + LOCK_SUFFIX, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _write(self, index):
+        write_json_atomic(self.index_path, index)
+        self._index = index
+        self._mtime = os.stat(self.index_path).st_mtime_ns
+
+    def rebuild(self):
+        """Recreates the index file from the files matching REBUILD_PATTERNS."""
+        with self.locked():
+            index = self.scan()
+            self._write(index)
+        return index
+
+    def scan(self):
+        """An index of the files matching REBUILD_PATTERNS, oldest first, built in memory."""
+        index = self.empty_index()
+        found = []
+        for name in os.listdir(self.directory):
+            for kind, (prefix, extensions) in REBUILD_PATTERNS.items():
+                if name.startswith(prefix) and name.endswith(extensions) \
+                        and not any(part in name for part in REBUILD_EXCLUDE):
+                    found.append((os.path.getctime(os.path.join(self.directory, name)), name, kind))
+        for created, name, kind in sorted(found):
+            stem = os.path.splitext(name)[0]
+            # Run files are named <kind>-<brain>-<date>-<time>-<run id>
+            parts = stem.split('-')
+            run_id = parts[-1] if len(parts) >= 5 else None
+            brain = parts[1] if len(parts) >= 5 else None
+            self._add(index, name, kind, brain, run_id, {}, created)
+        return index
+
+    # ============================
+    # Registration and lookup
+    # ============================
+
+    def _add(self, index, name, kind, brain, run_id, metrics, created):
+        path = os.path.join(self.directory, name)
+        previous = index['artifacts'].get(name)
+        index['artifacts'][name] = {
+            'kind': kind,
+            'brain': brain,
+            'run_id': run_id,
+            'created': previous['created'] if previous else created,
+            'updated': created,
+            'size': os.path.getsize(path) if os.path.exists(path) else None,
+            'metrics': metrics,
+        }
+        index['latest'][kind] = name
+        if run_id is not None:
+            index['runs'].setdefault(run_id, {})[kind] = name
+
+        score = metrics.get(BEST_METRIC)
+        best = index['best'].get(kind)
+        best_record = index['artifacts'].get(best)
+        if best == name:
+            if score is None or previous is None or score < previous['metrics'].get(BEST_METRIC, score):
+                # The best artifact got worse: compare it with the others of its kind again
+                self._rank(index, kind)
+        elif score is not None and (best_record is None
+                                    or score > best_record['metrics'].get(BEST_METRIC, float('-inf'))):
+            index['best'][kind] = name
+
+    @staticmethod
+    def _rank(index, kind):
+        candidates = [(record['metrics'][BEST_METRIC], name) for name, record in index['artifacts'].items()
+                      if record['kind'] == kind and record['metrics'].get(BEST_METRIC) is not None]
+        if candidates:
+            index['best'][kind] = max(candidates)[1]
+        else:
+            index['best'].pop(kind, None)
+
+    def register(self, path, kind, brain=None, run_id=None, metrics=None):
+        """
+        Records (or updates) an artifact written to path and makes it the latest of its kind.
+
+        Args:
+            path (str): The artifact, inside the registry directory.
+            kind (str): Q_TABLE, GA_STATE, BEST_PARAMS...
+            metrics (dict): JSON values; metrics[BEST_METRIC] ranks the artifacts for the 'best' tag.
+        """
+        # Reread the index under the lock, so registrations of other processes are kept
+        with self.locked():
+            self._index = None
+            index = self.index()
+            self._add(index, os.path.relpath(path, self.directory), kind, brain, run_id,
+                      dict(metrics or {}), time.time())
+            self._write(index)
+
+    def find(self, kind, tag='latest'):
+        """
+        Args:
+            tag (str): 'latest', 'best' or a run id.
+
+        Returns:
+            str: Path of the artifact, None if there is none. When the file of 'latest' or 'best'
+                 was deleted, the next one still on disk.
+        """
+        index = self.index()
+        if tag in ('latest', 'best'):
+            name = index[tag].get(kind)
+        else:
+            name = index['runs'].get(tag, {}).get(kind)
+        if name is None:
+            return None
+        path = os.path.join(self.directory, name)
+        if os.path.exists(path):
+            return path
+        if tag == 'latest':
+            # The file was deleted behind the registry's back: fall back to the newest one still there
+            for other, record in reversed(self.artifacts(kind)):
+                if os.path.exists(os.path.join(self.directory, other)):
+                    return os.path.join(self.directory, other)
+        elif tag == 'best':
+            ranked = sorted(((record['metrics'][BEST_METRIC], other) for other, record in self.artifacts(kind)
+                             if record['metrics'].get(BEST_METRIC) is not None), reverse=True)
+            for _, other in ranked:
+                if os.path.exists(os.path.join(self.directory, other)):
+                    return os.path.join(self.directory, other)
+        return None
+
+    def record(self, path):
+        return self.index()['artifacts'].get(os.path.relpath(path, self.directory))
+
+    def artifacts(self, kind=None):
+        """(name, record) pairs, least recently updated first."""
+        items = self.index()['artifacts'].items()
+        return sorted(((name, record) for name, record in items if kind is None or record['kind'] == kind),
+                      key=lambda item: item[1]['updated'])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Index of training artifacts.')
+    parser.add_argument('--directory', type=str, default='.', help='Directory of the artifacts.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    list_parser = subparsers.add_parser('list', help='List the registered artifacts.')
+    list_parser.add_argument('--kind', type=str, default=None, help='Only this kind.')
+    find_parser = subparsers.add_parser('find', help='Print the path of an artifact.')
+    find_parser.add_argument('kind', help='Artifact kind, e.g. q_table.')
+    find_parser.add_argument('tag', nargs='?', default='latest', help="'latest', 'best' or a run id.")
+    subparsers.add_parser('rebuild', help='Recreate the index from the files in the directory.')
+    args = parser.parse_args()
+
+    registry = ArtifactRegistry(args.directory)
+    if args.command == 'rebuild':
+        print(f"Indexed {len(registry.rebuild()['artifacts'])} artifacts in {registry.index_path}")
+    elif args.command == 'find':
+        print(registry.find(args.kind, args.tag) or f"No {args.kind} artifact for '{args.tag}'.")
+    else:
+        for name, record in registry.artifacts(args.kind):
+            created = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record['created']))
+            print(f"{created}  {record['kind']:>12}  {record['run_id'] or '-':>32}  {name}  {record['metrics']}")
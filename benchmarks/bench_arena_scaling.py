@@ -0,0 +1,91 @@
+# benchmarks/bench_arena_scaling.py
+"""
+Ticks per second of large training-mode arenas as the number of ships grows.
+
+The arena area, asteroid count and initial gold scale with the ship count so the
+density stays that of a regular 6-ship game. Each size is run with the grid broad
+phases and, up to --max-all-pairs ships, with the all-pairs collision loops.
+
+Usage:
+    python -m benchmarks.bench_arena_scaling [--ships 6 25 50 100 200 400] [--ticks 300] [--brain crowd]
+"""
+import os
+import math
+import time
+import random
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from brain_interface import SpaceshipBrain, Action
+from brains.cpu1 import AggressiveHunterBrain
+from game_config import DEFAULT_CONFIG
+from space_game import GameEnvironment, SpaceGame
+
+CROWD_ACTIONS = [Action.ACCELERATE, Action.ROTATE_LEFT, Action.ROTATE_RIGHT, Action.SHOOT, Action.SHOOT]
+
+
+class CrowdBrain(SpaceshipBrain):
+    """Cheap random brain that shoots a lot, so the timings are dominated by the engine."""
+
+    def __init__(self, brain_id):
+        self._id = brain_id
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    def decide_what_to_do_next(self, game_state) -> Action:
+        return random.choice(CROWD_ACTIONS)
+
+
+def make_brains(kind, count):
+    brains = []
+    for i in range(count):
+        if kind == 'hunter':
+            brain = AggressiveHunterBrain()
+            brain._id = f"Hunter-{i}"
+        else:
+            brain = CrowdBrain(f"Crowd-{i}")
+        brains.append(brain)
+    return brains
+
+
+def run_arena(environment, ships, ticks, brain_kind, broad_phase, seed=0):
+    random.seed(seed)
+    base = DEFAULT_CONFIG
+    scale = ships / base.number_of_brains
+    side = math.sqrt(max(scale, 1))
+    config = base.replace(arena_width=int(base.arena_width * side), arena_height=int(base.arena_height * side),
+                          number_of_asteroids=int(base.number_of_asteroids * scale),
+                          initial_gold_count=int(base.initial_gold_count * scale),
+                          max_tick_count=ticks)
+    game = SpaceGame(environment, {}, brains=make_brains(brain_kind, ships), broad_phase=broad_phase, config=config)
+    entities = len(game.ships) + len(game.asteroids) + len(game.gold_positions)
+    start = time.perf_counter()
+    game.run()
+    elapsed = time.perf_counter() - start
+    return game.tick_count / elapsed, entities, len(game.bullets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Large arena scaling benchmark.')
+    parser.add_argument('--ships', type=int, nargs='+', default=[6, 25, 50, 100, 200, 400], help='Ship counts.')
+    parser.add_argument('--ticks', type=int, default=300, help='Ticks per run.')
+    parser.add_argument('--brain', choices=['crowd', 'hunter'], default='crowd', help='Brain for every ship.')
+    parser.add_argument('--max-all-pairs', type=int, default=200, help='Largest ship count run without the broad phase.')
+    args = parser.parse_args()
+
+    environment = GameEnvironment(training_mode=True)
+    print(f"{'ships':>6} {'entities':>9} {'bullets':>8} {'grid ticks/s':>13} {'all-pairs ticks/s':>18}")
+    for ships in args.ships:
+        grid_rate, entities, bullets = run_arena(environment, ships, args.ticks, args.brain, broad_phase=True)
+        if ships <= args.max_all_pairs:
+            all_pairs_rate = f"{run_arena(environment, ships, args.ticks, args.brain, broad_phase=False)[0]:18.1f}"
+        else:
+            all_pairs_rate = f"{'-':>18}"
+        print(f"{ships:6d} {entities:9d} {bullets:8d} {grid_rate:13.1f} {all_pairs_rate}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# benchmarks/bench_cma_es.py
+"""
+Games needed to reach a target fitness: genetic trainer vs CMA-ES.
+
+Both optimizers search trainer.PARAM_BOUNDS with trainer.GAMES_PER_INDIVIDUAL games
+per individual. After every generation the params an optimizer would hand out are
+checked against the target: the best individual ever for the genetic trainer (what
+trainer.py saves), the distribution mean for CMA-ES. The count reported is the
+number of games played until then.
+
+By default fitness is simulated: a smooth anisotropic peak over the unit cube of the
+bounds (max 600, the order of a good game score) plus Gaussian per-game noise, so
+hundreds of runs take seconds and the true fitness of any params is known. --real
+plays headless games scored like the trainer scores them instead (trainer.evaluate_params,
+about a second per game),
+where the noisy estimate of the recommended params is compared to the target.
+
+Usage:
+    python -m benchmarks.bench_cma_es [--runs 20] [--target 0.95] [--noise 120]
+    python -m benchmarks.bench_cma_es --real --max-games 600 --target 600
+"""
+import random
+import argparse
+import statistics
+
+import numpy as np
+
+import trainer
+from cma_es import CMAES
+
+PEAK_FITNESS = 600
+OPTIMUM = np.array([0.3, 0.35, 0.2, 0.8])  # Unit cube coordinates of the simulated optimum, PARAM_BOUNDS order
+WIDTHS = np.array([0.25, 0.3, 0.5, 0.35])  # Peak width per parameter
+
+
+def unit(params):
+    lower = np.array([bounds[0] for bounds in trainer.PARAM_BOUNDS.values()], dtype=float)
+    upper = np.array([bounds[1] for bounds in trainer.PARAM_BOUNDS.values()], dtype=float)
+    values = np.array([params[name] for name in trainer.PARAM_BOUNDS], dtype=float)
+    return (values - lower) / (upper - lower)
+
+
+def true_fitness(params):
+    return PEAK_FITNESS * float(np.exp(-np.sum(((unit(params) - OPTIMUM) / WIDTHS) ** 2)))
+
+
+class SimulatedGames:
+    def __init__(self, noise, rng):
+        self.noise = noise
+        self.rng = rng
+        self.games = 0
+
+    def fitness(self, params):
+        games = trainer.GAMES_PER_INDIVIDUAL
+        self.games += games
+        return true_fitness(params) + self.rng.normal(0, self.noise, games).mean()
+
+    def reached(self, params, target, estimate):
+        return true_fitness(params) >= target
+
+
+class RealGames:
+    def __init__(self):
+        self.games = 0
+
+    def fitness(self, params):
+        self.games += trainer.GAMES_PER_INDIVIDUAL
+        return trainer.evaluate_params(params, trainer.GAMES_PER_INDIVIDUAL,
+                                       scenarios=trainer.draw_scenarios(trainer.GAMES_PER_INDIVIDUAL))
+
+    def reached(self, params, target, estimate):
+        return estimate >= target
+
+
+def run_ga(games, target, max_games, population_size, mutation_rate):
+    """Genetic trainer loop (trainer.reproduce_population); returns games to target or None."""
+    population = [trainer.random_params() for _ in range(population_size)]
+    best_params, best_fitness = None, float('-inf')
+    while games.games < max_games:
+        results = []
+        for params in population:
+            fitness = games.fitness(params)
+            results.append((params, fitness))
+            if fitness > best_fitness:
+                best_params, best_fitness = params.copy(), fitness
+        if games.reached(best_params, target, best_fitness):
+            return games.games
+        results.sort(key=lambda x: x[1], reverse=True)
+        population = trainer.reproduce_population(results, best_params, population_size, mutation_rate)
+    return None
+
+
+def run_cma(games, target, max_games, population_size, seed):
+    """CMA-ES loop; returns games to target or None."""
+    optimizer = CMAES(trainer.PARAM_BOUNDS, population_size=population_size, seed=seed)
+    while games.games < max_games:
+        optimizer.tell([games.fitness(params) for params in optimizer.ask()])
+        mean = optimizer.mean_params()
+        estimate = games.fitness(mean) if isinstance(games, RealGames) else None
+        if games.reached(mean, target, estimate):
+            return games.games
+    return None
+
+
+def report(name, counts, runs):
+    reached = [count for count in counts if count is not None]
+    if reached:
+        print(f"{name:>22}: reached {len(reached)}/{runs}, games to target median {statistics.median(reached):8.0f}  "
+              f"min {min(reached):6d}  max {max(reached):6d}")
+    else:
+        print(f"{name:>22}: reached 0/{runs}")
+    return statistics.median(reached) if reached else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Games-to-target benchmark of the GA and CMA-ES optimizers.')
+    parser.add_argument('--runs', type=int, default=20, help='Runs per optimizer (different seeds).')
+    parser.add_argument('--target', type=float, default=0.95,
+                        help='Target fitness, as a fraction of the peak if <= 1 (simulated mode).')
+    parser.add_argument('--noise', type=float, default=120, help='Per-game fitness noise (simulated mode).')
+    parser.add_argument('--max-games', type=int, default=30000,
+                        help='Game budget per run (the default trainer run plays 100 x 100 x 3 = 30000).')
+    parser.add_argument('--ga-population', type=int, default=100, help='Population of the genetic trainer.')
+    parser.add_argument('--cma-population', type=int, default=None, help='CMA-ES population (default 4 + 3 ln n).')
+    parser.add_argument('--real', action='store_true', help='Play real headless games instead of simulating.')
+    args = parser.parse_args()
+
+    target = args.target * PEAK_FITNESS if args.target <= 1 and not args.real else args.target
+    print(f"Target fitness {target:.0f}, {trainer.GAMES_PER_INDIVIDUAL} games per individual, "
+          f"budget {args.max_games} games, {'real games' if args.real else f'simulated, noise {args.noise}'}")
+
+    ga_counts, cma_counts = [], []
+    for run in range(args.runs):
+        random.seed(run)
+        rng = np.random.default_rng(run)
+        games = RealGames() if args.real else SimulatedGames(args.noise, rng)
+        ga_counts.append(run_ga(games, target, args.max_games, args.ga_population, 0.1))
+        random.seed(run)
+        games = RealGames() if args.real else SimulatedGames(args.noise, rng)
+        cma_counts.append(run_cma(games, target, args.max_games, args.cma_population, run))
+
+    ga_median = report(f"GA (population {args.ga_population})", ga_counts, args.runs)
+    cma_median = report("CMA-ES", cma_counts, args.runs)
+    if ga_median and cma_median:
+        print(f"CMA-ES needs {ga_median / cma_median:.1f}x fewer games to reach the target")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/bench_coarse_step.py
+"""
+Compares seeded training-mode games at the regular FIXED_DT and in coarse-step mode.
+
+Reports games per second and the mean score / win rate per brain, so coarse-step
+screening runs can be checked for statistical equivalence with the fine step.
+
+Usage:
+    python -m benchmarks.bench_coarse_step [--games 20] [--factors 1 2 4]
+"""
+import os
+import time
+import random
+import argparse
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from space_game import GameEnvironment, SpaceGame
+
+
+def run_games(environment, factor, seeds):
+    scores = {}
+    wins = {}
+    start = time.perf_counter()
+    for seed in seeds:
+        random.seed(seed)
+        game = SpaceGame(environment, wins, time_step_factor=factor)
+        game.run()
+        for ship in game.ships:
+            scores.setdefault(ship.id, []).append(ship.score)
+    elapsed = time.perf_counter() - start
+    return scores, wins, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fine vs coarse time step benchmark.')
+    parser.add_argument('--games', type=int, default=20, help='Seeded games per time step factor.')
+    parser.add_argument('--factors', type=int, nargs='+', default=[1, 2, 4], help='Time step factors to compare.')
+    args = parser.parse_args()
+
+    environment = GameEnvironment(training_mode=True)
+    seeds = range(args.games)
+    for factor in args.factors:
+        scores, wins, elapsed = run_games(environment, factor, seeds)
+        print(f"\nFactor {factor}: {args.games / elapsed:.2f} games/s ({elapsed:.1f}s)")
+        for brain_id in sorted(scores):
+            brain_scores = scores[brain_id]
+            stderr = statistics.stdev(brain_scores) / len(brain_scores) ** 0.5 if len(brain_scores) > 1 else 0
+            print(f"  {brain_id:>20}: score {statistics.mean(brain_scores):7.1f} +/- {stderr:5.1f}, "
+                  f"wins {wins.get(brain_id, 0) / args.games * 100:5.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_crn.py
+"""
+Common random numbers vs independent games for the evaluation of a GA generation.
+
+A population of random trainer params (GeneticHunterBrain) is evaluated twice in each
+mode with headless games, scored like the trainer scores them (trainer.evaluate_games):
+  - independent: every individual plays its own seeds;
+  - crn: every individual plays the same seeded scenarios (trainer.draw_scenarios),
+    start positions included, optionally mirrored.
+Reported per mode: trainer.crn_variance_reduction of the fitness matrix (close to 1
+for independent games) and the Spearman correlation between the rankings of the two
+evaluations, i.e. how reproducible the selection of a generation is.
+
+Usage:
+    python -m benchmarks.bench_crn [--population 6] [--games 4] [--mirrored] [--seed 0]
+"""
+import random
+import argparse
+
+import numpy as np
+
+import trainer
+
+
+def fitness_matrix(population, scenarios_per_individual):
+    """One row of per-game fitnesses per individual."""
+    return [trainer.evaluate_games(params, scenarios) for params, scenarios in zip(population, scenarios_per_individual)]
+
+
+def spearman(a, b):
+    ranks_a = np.argsort(np.argsort(a))
+    ranks_b = np.argsort(np.argsort(b))
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
+
+
+def evaluate_mode(population, games, mirrored, common):
+    """Two evaluations of the population; returns (variance reduction factors, ranking correlation)."""
+    factors, means = [], []
+    for _ in range(2):
+        if common:
+            scenarios = [trainer.draw_scenarios(games, mirrored)] * len(population)
+        else:
+            scenarios = [trainer.draw_scenarios(games, mirrored) for _ in population]
+        matrix = fitness_matrix(population, scenarios)
+        factors.append(trainer.crn_variance_reduction(matrix)[0])
+        means.append([sum(row) / len(row) for row in matrix])
+    return factors, spearman(means[0], means[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Common random numbers benchmark of the GA evaluation.')
+    parser.add_argument('--population', type=int, default=6, help='Individuals (random params).')
+    parser.add_argument('--games', type=int, default=4, help='Games per individual.')
+    parser.add_argument('--mirrored', action='store_true', help='Pair each scenario with mirrored start positions.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the params and scenarios.')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    population = [trainer.random_params() for _ in range(args.population)]
+    print(f"{args.population} individuals x {args.games} games x 2 evaluations per mode"
+          f"{', mirrored scenarios' if args.mirrored else ''}")
+    for name, common in (('independent', False), ('crn', True)):
+        factors, correlation = evaluate_mode(population, args.games, args.mirrored, common)
+        shown = ', '.join('n/a' if factor is None else f"{factor:.2f}" for factor in factors)
+        print(f"{name:>12}: variance reduction factor {shown}   ranking correlation {correlation:+.2f}")
+
+
+if __name__ == "__main__":
+    main()
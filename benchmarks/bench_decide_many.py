@@ -0,0 +1,76 @@
+# benchmarks/bench_decide_many.py
+"""
+Decisions for many worlds per tick: a Python loop over decide_what_to_do_next vs
+SpaceshipBrain.decide_many on a ShipBatch shared by the brains.
+
+The worlds are synthetic GameStates holding the six ships of the regular lineup at
+random positions, angles and health. Each batched brain is checked against its scalar
+decisions (same actions for every world) before it is timed. The time of building
+the ShipBatch is reported on its own, since it is paid once per tick for all brains.
+
+Usage:
+    python -m benchmarks.bench_decide_many [--worlds 1000] [--repeat 5]
+"""
+import time
+import random
+import argparse
+import statistics
+
+from brain_interface import GameState, ShipBatch
+from brains.cpu1 import AggressiveHunterBrain as CPU1
+from brains.cpu2 import AggressiveHunterBrain as CPU2
+from brains.cpu3 import AggressiveHunterBrain as CPU3
+from brains.cpu4 import AggressiveHunterBrain as CPU4
+from brains.Group1_CharlesK import GeneticHunterBrain
+
+SHIP_IDS = ['CPU1', 'CPU2', 'CPU3', 'CPU4', 'group1-CharlesK', 'Perso']
+PARAMS = {'distance_weight': 1.0, 'shoot_accuracy': 12.0, 'retreat_threshold': 0.3, 'aggressiveness': 0.5}
+
+
+def random_world(rng):
+    ships = [{'id': ship_id, 'x': rng.uniform(0, 1200), 'y': rng.uniform(0, 800), 'angle': rng.uniform(0, 360),
+              'health': rng.choice([0, 20, 50, 100])} for ship_id in SHIP_IDS]
+    return GameState(ships=ships, bullets=[], gold_positions=[], asteroids=[], game_ticks=0)
+
+
+def median_seconds(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batched brain decisions benchmark.')
+    parser.add_argument('--worlds', type=int, default=1000, help='Worlds decided per call.')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed calls (the median is reported).')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    worlds = [random_world(rng) for _ in range(args.worlds)]
+    seconds = median_seconds(lambda: ShipBatch(worlds), args.repeat)
+    print(f"{args.worlds} worlds, ShipBatch build: {seconds * 1000:7.2f} ms per tick (shared by all brains)")
+    batch = ShipBatch(worlds)
+
+    for name, factory in (('CPU1', CPU1), ('CPU2', CPU2), ('CPU3', CPU3), ('CPU4', CPU4),
+                          ('GeneticHunterBrain', lambda: GeneticHunterBrain(params=dict(PARAMS)))):
+        # One scalar brain per world (the CPUs remember a target per game), one batched brain
+        scalar_brains = [factory() for _ in worlds]
+        batched_brain = factory()
+        random.seed(1)
+        expected = [brain.decide_what_to_do_next(world) for brain, world in zip(scalar_brains, worlds)]
+        random.seed(1)
+        if batched_brain.decide_many(batch) != expected:
+            print(f"{name:>20}: batched decisions differ from the scalar ones")
+            continue
+        scalar = median_seconds(lambda: [brain.decide_what_to_do_next(world)
+                                         for brain, world in zip(scalar_brains, worlds)], args.repeat)
+        batched = median_seconds(lambda: batched_brain.decide_many(batch), args.repeat)
+        print(f"{name:>20}: scalar loop {scalar * 1000:7.2f} ms   decide_many {batched * 1000:7.2f} ms   "
+              f"{scalar / batched:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_events.py
+"""
+Cost of the engine event stream (events.py).
+
+The same seeded headless games are played, modes interleaved, with events off,
+recorded for the brains (record_events=True), and with a subscriber counting every
+event (its own NumPy work included). Reports the time per game of each mode relative
+to events off, checks that the games end identically, and that the counted hits and
+kills match the ships' counters.
+
+Usage:
+    python -m benchmarks.bench_events [--games 3]
+"""
+import os
+import time
+import random
+import argparse
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+
+from space_game import GameEnvironment, SpaceGame
+from events import EVENT_NAMES, BULLET_HIT, SHIP_DESTROYED
+
+
+def play(environment, seed, mode):
+    """Returns (seconds, final scores, event counts per type or None, counters consistent)."""
+    random.seed(seed)
+    start = time.perf_counter()
+    game = SpaceGame(environment, wins_per_brain={}, record_events=(mode == 'recorded'))
+    totals = np.zeros(len(EVENT_NAMES), dtype=np.int64)
+    hits = np.zeros(len(game.ships), dtype=np.int64)
+    kills = np.zeros(len(game.ships), dtype=np.int64)
+
+    def count(events, game):
+        records = events.events()
+        totals[:] += np.bincount(records['type'], minlength=len(EVENT_NAMES))
+        hits[:] += np.bincount(records['ship'][records['type'] == BULLET_HIT], minlength=len(hits))
+        kills[:] += np.bincount(records['other'][records['type'] == SHIP_DESTROYED], minlength=len(kills))
+
+    if mode == 'subscriber':
+        game.subscribe(count)
+    game.run()
+    seconds = time.perf_counter() - start
+    scores = [(ship.id, ship.score) for ship in game.ships]
+    consistent = all(hits[ship.index] == ship.bullets_hit_count and kills[ship.index] == ship.kills
+                     for ship in game.ships)
+    return seconds, scores, totals if mode == 'subscriber' else None, consistent
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Engine event stream overhead benchmark.')
+    parser.add_argument('--games', type=int, default=3, help='Seeded games per mode.')
+    args = parser.parse_args()
+
+    environment = GameEnvironment(training_mode=True)
+    play(environment, 0, 'off')  # Warm-up (imports, brain discovery)
+    results = {'off': [], 'recorded': [], 'subscriber': []}
+    for seed in range(args.games):
+        # Modes interleaved, so drifts of the machine affect them alike
+        for mode, runs in results.items():
+            runs.append(play(environment, seed, mode))
+    baseline = statistics.median(seconds for seconds, _, _, _ in results['off'])
+    for mode, runs in results.items():
+        seconds = statistics.median(run[0] for run in runs)
+        same = all(run[1] == off[1] for run, off in zip(runs, results['off']))
+        print(f"{mode:>11}: {seconds * 1000:8.1f} ms per game  {seconds / baseline:5.2f}x  "
+              f"{'same games' if same else 'GAMES DIFFER'}")
+    totals = sum(run[2] for run in results['subscriber'])
+    print("Events per game: " + ", ".join(f"{name} {count / args.games:.0f}" for name, count in zip(EVENT_NAMES, totals)))
+    if not all(run[3] for run in results['subscriber']):
+        print("Counted hits or kills differ from the ships' counters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# benchmarks/bench_geometry.py
+"""
+Benchmarks the geometry kernel against the former lru_cache helpers.
+
+The "cached" functions below are copies of what helpers.py used to provide. Inputs are
+random game coordinates, like the ones the engine and the brains feed in every tick.
+
+Usage:
+    python -m benchmarks.bench_geometry [--points 60] [--repeat 2000]
+"""
+import math
+import random
+import argparse
+import timeit
+from functools import lru_cache
+
+import numpy as np
+
+import geometry
+
+
+@lru_cache(maxsize=10000)
+def cached_atan2_degrees(dy, dx):
+    return math.degrees(math.atan2(dy, dx))
+
+
+@lru_cache(maxsize=10000)
+def cached_hypot(dx, dy):
+    return math.hypot(dx, dy)
+
+
+def report(name, seconds, calls, baseline=None):
+    per_call = seconds / calls * 1e9
+    speedup = f"  ({baseline / seconds:5.2f}x)" if baseline else ""
+    print(f"  {name:<40} {per_call:10.1f} ns/call{speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Geometry kernel benchmark.')
+    parser.add_argument('--points', type=int, default=60, help='Entities per query (gold pieces in a default game).')
+    parser.add_argument('--repeat', type=int, default=2000, help='Queries per measurement.')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    xs = [rng.uniform(50, 1150) for _ in range(args.points)]
+    ys = [rng.uniform(50, 750) for _ in range(args.points)]
+    xs_array = np.array(xs)
+    ys_array = np.array(ys)
+    origins = [(rng.uniform(50, 1150), rng.uniform(50, 750), rng.uniform(0, 360)) for _ in range(args.repeat)]
+    calls = args.repeat * args.points
+
+    def old_hypot():
+        for x, y, _ in origins:
+            for px, py in zip(xs, ys):
+                cached_hypot(px - x, py - y)
+
+    def new_hypot():
+        hypot = geometry.hypot
+        for x, y, _ in origins:
+            for px, py in zip(xs, ys):
+                hypot(px - x, py - y)
+
+    def batched_distances():
+        for x, y, _ in origins:
+            geometry.distances(x, y, xs_array, ys_array)
+
+    def old_atan2():
+        for x, y, _ in origins:
+            for px, py in zip(xs, ys):
+                cached_atan2_degrees(py - y, px - x)
+
+    def new_atan2():
+        atan2_degrees = geometry.atan2_degrees
+        for x, y, _ in origins:
+            for px, py in zip(xs, ys):
+                atan2_degrees(py - y, px - x)
+
+    def batched_bearings():
+        for x, y, _ in origins:
+            geometry.bearings(x, y, xs_array, ys_array)
+
+    def old_nearest():
+        for x, y, _ in origins:
+            min(range(len(xs)), key=lambda i: cached_hypot(xs[i] - x, ys[i] - y))
+
+    def batched_nearest():
+        for x, y, _ in origins:
+            geometry.nearest(x, y, xs_array, ys_array)
+
+    def scalar_cone():
+        for x, y, heading in origins:
+            for px, py in zip(xs, ys):
+                geometry.in_cone(x, y, heading, px, py, 15, 500)
+
+    def batched_cone():
+        for x, y, heading in origins:
+            geometry.in_cones(x, y, heading, xs_array, ys_array, 15, 500)
+
+    def scalar_border_rays():
+        for x, y, heading in origins:
+            geometry.ray_to_border_distance(x, y, heading, 50, 1150, 50, 750)
+
+    origin_xs = np.array([o[0] for o in origins])
+    origin_ys = np.array([o[1] for o in origins])
+    origin_angles = np.array([o[2] for o in origins])
+
+    def batched_border_rays():
+        geometry.rays_to_border_distances(origin_xs, origin_ys, origin_angles, 50, 1150, 50, 750)
+
+    def measure(function):
+        cached_hypot.cache_clear()
+        cached_atan2_degrees.cache_clear()
+        return min(timeit.repeat(function, number=1, repeat=5))
+
+    print(f"{args.points} entities x {args.repeat} queries")
+    print("Distances:")
+    baseline = measure(old_hypot)
+    report("helpers.cached_hypot", baseline, calls)
+    report("geometry.hypot", measure(new_hypot), calls, baseline)
+    report("geometry.distances (batched)", measure(batched_distances), calls, baseline)
+
+    print("Bearings:")
+    baseline = measure(old_atan2)
+    report("helpers.cached_atan2_degrees", baseline, calls)
+    report("geometry.atan2_degrees", measure(new_atan2), calls, baseline)
+    report("geometry.bearings (batched)", measure(batched_bearings), calls, baseline)
+
+    print("Nearest entity:")
+    baseline = measure(old_nearest)
+    report("min() over cached_hypot", baseline, args.repeat)
+    report("geometry.nearest (batched)", measure(batched_nearest), args.repeat, baseline)
+
+    print("Cone membership:")
+    baseline = measure(scalar_cone)
+    report("geometry.in_cone", baseline, calls)
+    report("geometry.in_cones (batched)", measure(batched_cone), calls, baseline)
+
+    print("Ray to border:")
+    baseline = measure(scalar_border_rays)
+    report("geometry.ray_to_border_distance", baseline, args.repeat)
+    report("geometry.rays_to_border_distances", measure(batched_border_rays), args.repeat, baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_islands.py
+"""
+Core scaling of the island model (trainer.island_training).
+
+For each island count, that many trainer.run_island processes evolve islands of the
+same size for the same number of generations (so the work grows with the island
+count), and the evaluation throughput in games per second is compared with one
+island. Nothing is logged or saved: the reports are only counted. The scaling is
+bounded by the number of cores (os.cpu_count()).
+
+Usage:
+    python -m benchmarks.bench_islands [--max-islands 4] [--island-size 4] [--generations 2]
+"""
+import os
+import time
+import argparse
+import multiprocessing as mp
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import trainer
+
+
+def games_per_second(islands, settings):
+    inboxes = [mp.Queue() for _ in range(islands)]
+    reports = mp.Queue()
+    stop = mp.Event()
+    processes = [mp.Process(target=trainer.run_island, daemon=True,
+                            args=(island, island, settings, inboxes[island], inboxes[(island + 1) % islands],
+                                  reports, stop))
+                 for island in range(islands)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    games, running = 0, islands
+    while running:
+        message = reports.get()
+        if message[0] == 'done':
+            running -= 1
+        else:
+            games += sum(len(records) for _, _, records in message[3])
+    seconds = time.perf_counter() - start
+    for process in processes:
+        process.join()
+    return games / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Island model scaling benchmark.')
+    parser.add_argument('--max-islands', type=int, default=4, help='Largest island count (powers of two up to it).')
+    parser.add_argument('--island-size', type=int, default=4, help='Individuals per island.')
+    parser.add_argument('--generations', type=int, default=2, help='Generations per island.')
+    args = parser.parse_args()
+
+    settings = {'population_size': args.island_size, 'generations': args.generations, 'mutation_rate': 0.1,
+                'migration_interval': 1, 'migrants': 1, 'common_random_numbers': True, 'mirrored': False}
+    print(f"{os.cpu_count()} cores, islands of {args.island_size} x {args.generations} generations "
+          f"x {trainer.GAMES_PER_INDIVIDUAL} games")
+    baseline = None
+    islands = 1
+    while islands <= args.max_islands:
+        rate = games_per_second(islands, settings)
+        baseline = baseline or rate
+        print(f"{islands:>3} islands: {rate:6.2f} games/s  speedup {rate / baseline:4.2f}x")
+        islands *= 2
+
+
+if __name__ == "__main__":
+    main()
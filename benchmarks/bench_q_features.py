@@ -0,0 +1,184 @@
+# benchmarks/bench_q_features.py
+"""
+Benchmarks the vectorized Q-learner featurizer against the former get_state.
+
+reference_state_code below is a copy of what QLearningBrain.get_state did: Python
+loops over the label bins, called twice per tick (next state of the Q-update, then
+current state for the action choice). The game states are recorded from a seeded
+training game, every ship of every tick.
+
+Usage:
+    python -m benchmarks.bench_q_features [--ticks 600] [--seed 0]
+"""
+import os
+import math
+import time
+import random
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+
+from brain_interface import GameState
+from brains.cpu1 import AggressiveHunterBrain
+from game_config import DEFAULT_CONFIG
+from geometry import hypot, ray_to_border_distance
+from q_features import StateFeaturizer, NO_STATE
+from q_state import (
+    STATE_SCHEMA, MAX_LOOK_AHEAD_DISTANCE, ANGLE_DIFF_BINS, SPEED_BINS, SPEED_LABELS, HEALTH_BINS, HEALTH_LABELS,
+    DISTANCE_BINS, DISTANCE_LABELS_ENEMY, DISTANCE_LABELS_BORDER, DISTANCE_LABELS_GOLD, DISTANCE_LABELS_ASTEROID,
+    ANGLE_DIFF_LABELS_ENEMY, ANGLE_DIFF_LABELS_BORDER, ANGLE_DIFF_LABELS_GOLD, ANGLE_DIFF_LABELS_VELOCITY,
+    ANGLE_DIFF_LABELS_ASTEROID
+)
+from space_game import GameEnvironment, SpaceGame
+from spatial_index import SpatialIndex
+
+
+def bin_label(value, bins, labels):
+    for i in range(len(bins) - 1):
+        if bins[i] <= value < bins[i + 1]:
+            return labels[i]
+    return labels[-1]
+
+
+def reference_state_code(game_state, ship_id):
+    current_ship = None
+    for ship in game_state.ships:
+        if ship['id'] == ship_id:
+            current_ship = ship
+    if not current_ship:
+        return None
+    x, y = current_ship['x'], current_ship['y']
+    ship_angle = current_ship['angle'] % 360
+    config = game_state.config or DEFAULT_CONFIG
+    spatial_index = game_state.spatial_index or SpatialIndex.from_game_state(game_state, config.bounds)
+    view = spatial_index.for_ship(ship_id)
+
+    state = []
+    for kind, source, angle_labels, distance_labels, name in (
+            ('ships', game_state.ships, ANGLE_DIFF_LABELS_ENEMY, DISTANCE_LABELS_ENEMY, 'enemy'),
+            ('gold', game_state.gold_positions, ANGLE_DIFF_LABELS_GOLD, DISTANCE_LABELS_GOLD, 'gold'),
+            ('asteroids', game_state.asteroids, ANGLE_DIFF_LABELS_ASTEROID, DISTANCE_LABELS_ASTEROID, 'asteroid')):
+        angle_label, distance_label = f"angle_{name}-no-data", f"{name}-no-data"
+        for hit in view.nearest(kind):
+            target = source[hit.index]
+            target_x, target_y = (target if kind == 'gold' else (target['x'], target['y']))
+            if hit.distance < MAX_LOOK_AHEAD_DISTANCE:
+                desired_angle = math.degrees(math.atan2(target_y - y, target_x - x)) % 360
+                angle_label = bin_label((desired_angle - ship_angle + 180) % 360 - 180, ANGLE_DIFF_BINS, angle_labels)
+                distance_label = bin_label(hit.distance, DISTANCE_BINS, distance_labels)
+        state += [angle_label, distance_label]
+
+    left, top, right, bottom = config.bounds
+    rad_angle = math.radians(ship_angle)
+    border_distance = ray_to_border_distance(x, y, ship_angle, left, right, top, bottom)
+    angle_border, distance_border = "angle_border-no-data", "border-no-data"
+    if border_distance < MAX_LOOK_AHEAD_DISTANCE:
+        target_x = x + math.cos(rad_angle) * border_distance
+        target_y = y + math.sin(rad_angle) * border_distance
+        desired_angle = math.degrees(math.atan2(target_y - y, target_x - x)) % 360
+        angle_border = bin_label((desired_angle - ship_angle + 180) % 360 - 180, ANGLE_DIFF_BINS,
+                                 ANGLE_DIFF_LABELS_BORDER)
+        distance_border = bin_label(border_distance, DISTANCE_BINS, DISTANCE_LABELS_BORDER)
+
+    velocity_x, velocity_y = current_ship['velocity_x'], current_ship['velocity_y']
+    velocity_angle = math.degrees(math.atan2(velocity_y, velocity_x)) % 360
+    state = state[:2] + [angle_border, distance_border] + state[2:] + [
+        bin_label(hypot(velocity_x, velocity_y), SPEED_BINS, SPEED_LABELS),
+        bin_label((velocity_angle - ship_angle + 180) % 360 - 180, ANGLE_DIFF_BINS, ANGLE_DIFF_LABELS_VELOCITY),
+        bin_label(current_ship['health'] / config.health_full * 100, HEALTH_BINS, HEALTH_LABELS),
+        "can_shoot" if game_state.game_ticks - current_ship['last_shot_time'] >= config.bullet_cooldown
+        else "cannot_shoot",
+    ]
+    return STATE_SCHEMA.encode_labels(state)
+
+
+class RecorderBrain(AggressiveHunterBrain):
+    """Plays like CPU1 and keeps a snapshot of every game state it is given."""
+
+    def __init__(self, brain_id, recorded):
+        super().__init__()
+        self._id = brain_id
+        self.recorded = recorded
+
+    def decide_what_to_do_next(self, game_state):
+        self.recorded.append((GameState(
+            ships=list(game_state.ships), bullets=list(game_state.bullets),
+            gold_positions=list(game_state.gold_positions), asteroids=list(game_state.asteroids),
+            game_ticks=game_state.game_ticks, config=game_state.config), self.id))
+        return super().decide_what_to_do_next(game_state)
+
+
+def record_states(ticks, seed):
+    random.seed(seed)
+    recorded = []
+    brains = [RecorderBrain(f"Recorder-{i}", recorded) for i in range(DEFAULT_CONFIG.number_of_brains)]
+    game = SpaceGame(GameEnvironment(training_mode=True), {}, brains=brains,
+                     config=DEFAULT_CONFIG.replace(max_tick_count=ticks))
+    game.run()
+    return recorded
+
+
+def fresh_spatial_indexes(recorded):
+    """One new SpatialIndex per tick, shared by the states of that tick like in the engine."""
+    index = None
+    ticks = None
+    for game_state, _ in recorded:
+        if game_state.game_ticks != ticks:
+            ticks = game_state.game_ticks
+            index = SpatialIndex.from_game_state(game_state, game_state.config.bounds)
+        game_state.spatial_index = index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Q-learner featurizer benchmark.')
+    parser.add_argument('--ticks', type=int, default=600, help='Ticks of the recorded game.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the recorded game.')
+    args = parser.parse_args()
+
+    recorded = record_states(args.ticks, args.seed)
+    game_states = [game_state for game_state, _ in recorded]
+    ship_ids = [ship_id for _, ship_id in recorded]
+    print(f"{len(recorded)} game states ({args.ticks} ticks x {DEFAULT_CONFIG.number_of_brains} ships)")
+
+    def measure(function):
+        best = float('inf')
+        for _ in range(3):
+            fresh_spatial_indexes(recorded)
+            start = time.perf_counter()
+            result = function()
+            best = min(best, time.perf_counter() - start)
+        return best, result
+
+    def reference():
+        # Twice per tick, like calcRewardAndUpdateQTable followed by the action choice
+        return [(reference_state_code(game_state, ship_id), reference_state_code(game_state, ship_id))[1]
+                for game_state, ship_id in recorded]
+
+    featurizers = {ship_id: StateFeaturizer() for ship_id in set(ship_ids)}
+
+    def memoized():
+        codes = []
+        for game_state, ship_id in recorded:
+            featurizer = featurizers[ship_id]
+            featurizer.state_code(game_state, ship_id)
+            codes.append(featurizer.state_code(game_state, ship_id))
+        return codes
+
+    def batched():
+        return StateFeaturizer().state_codes(game_states, ship_ids)
+
+    baseline, reference_codes = measure(reference)
+    print(f"  {'reference get_state (x2 per tick)':<40} {baseline / len(recorded) * 1e6:8.1f} us/state")
+    for name, function in (("StateFeaturizer.state_code (x2, memoized)", memoized),
+                           ("StateFeaturizer.state_codes (one batch)", batched)):
+        seconds, codes = measure(function)
+        codes = [None if code is None or code == NO_STATE else int(code) for code in codes]
+        same = np.mean([a == b for a, b in zip(codes, reference_codes)]) * 100
+        print(f"  {name:<40} {seconds / len(recorded) * 1e6:8.1f} us/state  ({baseline / seconds:5.2f}x, "
+              f"{same:.1f}% same codes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+# benchmarks/bench_shared_state.py
+"""
+Per-decision latency of brains running in other processes (shared_state.py).
+
+The same seeded headless games are played with the first --remote brains as
+RemoteBrains and with all brains local, at each decision interval. Every decision
+call of the engine is timed, so the report shows the time per tick and the mean and
+95th percentile latency of one decision, remote and local, plus the games' final
+scores (remote brains see the state published at the start of the tick, so their
+games may drift from the local ones).
+
+Usage:
+    python -m benchmarks.bench_shared_state [--remote 2] [--ticks 600] [--intervals 1 3]
+"""
+import os
+import time
+import random
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+
+from space_game import GameEnvironment, SpaceGame
+from shared_state import SharedGameState, RemoteBrain
+from brains.cpu1 import AggressiveHunterBrain as CPU1
+from brains.cpu2 import AggressiveHunterBrain as CPU2
+from brains.cpu3 import AggressiveHunterBrain as CPU3
+from brains.cpu4 import AggressiveHunterBrain as CPU4
+
+BRAIN_CLASSES = [CPU1, CPU2, CPU3, CPU4]
+
+
+class TimedLocalBrain:
+    """Times the decisions of a brain running in the engine process."""
+
+    def __init__(self, brain, latencies):
+        self.brain = brain
+        self.latencies = latencies
+
+    @property
+    def id(self):
+        return self.brain.id
+
+    def decide_what_to_do_next(self, game_state):
+        start = time.perf_counter()
+        action = self.brain.decide_what_to_do_next(game_state)
+        self.latencies.append(time.perf_counter() - start)
+        return action
+
+    def on_game_complete(self, final_state, won):
+        self.brain.on_game_complete(final_state, won)
+
+
+class TimedRemoteBrain(RemoteBrain):
+    """Times the engine side of a remote decision: publishing aside, the wait for the child's answer."""
+
+    def __init__(self, brain_factory, shared_state, latencies):
+        super().__init__(brain_factory, shared_state)
+        self.latencies = latencies
+
+    def decide_what_to_do_next(self, game_state):
+        start = time.perf_counter()
+        action = super().decide_what_to_do_next(game_state)
+        self.latencies.append(time.perf_counter() - start)
+        return action
+
+
+def play(environment, seeds, ticks, interval, remote):
+    """Returns (seconds per tick, remote latencies, local latencies, final scores per game)."""
+    remote_latencies, local_latencies = [], []
+    shared = SharedGameState() if remote else None
+    brains = [TimedRemoteBrain(cls, shared, remote_latencies) if i < remote else TimedLocalBrain(cls(), local_latencies)
+              for i, cls in enumerate(BRAIN_CLASSES)]
+    seconds = 0.0
+    total_ticks = 0
+    scores = []
+    try:
+        for seed in seeds:
+            random.seed(seed)
+            game = SpaceGame(environment, wins_per_brain={}, brains=brains, shared_state=shared,
+                             decision_interval=interval)
+            game.max_tick_count = ticks
+            start = time.perf_counter()
+            game.run()
+            seconds += time.perf_counter() - start
+            total_ticks += game.tick_count
+            scores.append(sorted((ship.id, ship.score) for ship in game.ships))
+    finally:
+        if shared is not None:
+            shared.stop()
+            for brain in brains[:remote]:
+                brain.close()
+            shared.close()
+    return seconds / max(1, total_ticks), remote_latencies, local_latencies, scores
+
+
+def describe(latencies):
+    if not latencies:
+        return "           -"
+    latencies = np.array(latencies) * 1e6
+    return f"{latencies.mean():7.0f} us (p95 {np.percentile(latencies, 95):6.0f} us, {len(latencies)} calls)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Remote brain decision latency benchmark.')
+    parser.add_argument('--remote', type=int, default=2, help='Brains run as RemoteBrains.')
+    parser.add_argument('--games', type=int, default=2, help='Seeded games per configuration.')
+    parser.add_argument('--ticks', type=int, default=600, help='Ticks per game.')
+    parser.add_argument('--intervals', type=int, nargs='+', default=[1, 3], help='Decision intervals.')
+    args = parser.parse_args()
+
+    environment = GameEnvironment(training_mode=True)
+    seeds = list(range(args.games))
+    for interval in args.intervals:
+        local_tick, _, local_latencies, local_scores = play(environment, seeds, args.ticks, interval, 0)
+        remote_tick, remote_latencies, others, remote_scores = play(environment, seeds, args.ticks, interval,
+                                                                    args.remote)
+        print(f"decision interval {interval}:")
+        print(f"  local : {local_tick * 1000:6.2f} ms per tick, decision {describe(local_latencies)}")
+        print(f"  remote: {remote_tick * 1000:6.2f} ms per tick, decision {describe(remote_latencies)}, "
+              f"local brains {describe(others)}")
+        print(f"  {'same final scores' if remote_scores == local_scores else 'final scores differ'}")
+
+
+if __name__ == "__main__":
+    main()
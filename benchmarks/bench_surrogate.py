@@ -0,0 +1,105 @@
+# benchmarks/bench_surrogate.py
+"""
+Games needed to reach a target fitness by the genetic trainer, with and without
+surrogate pre-screening (surrogate.py).
+
+Uses the simulated fitness of bench_cma_es (smooth peak plus Gaussian per-game noise)
+and the trainer's generation loop: with a surrogate, 1 / trainer.SURROGATE_FRACTION
+times the population is bred and only the population with the best predictions (the
+elite included) is evaluated, the model being fitted on --history random logged
+individuals and on every evaluation since. The count reported is the number of games
+played until the best individual ever (what trainer.py saves) truly reaches the
+target, and the mean rank correlation between predicted and measured fitness of the
+simulated candidates.
+
+Usage:
+    python -m benchmarks.bench_surrogate [--runs 20] [--target 0.95] [--history 300] [--fraction 0.5]
+"""
+import random
+import argparse
+import statistics
+
+import numpy as np
+
+import trainer
+from surrogate import SURROGATES, make_surrogate, screen, rank_correlation
+from benchmarks.bench_cma_es import PEAK_FITNESS, SimulatedGames, true_fitness, report
+
+
+def uniform_params():
+    return {name: random.uniform(lower, upper) for name, (lower, upper) in trainer.PARAM_BOUNDS.items()}
+
+
+def run(games, target, max_games, population_size, surrogate, fraction, history):
+    """Returns (games to target or None, rank correlations of the screened generations)."""
+    model = None
+    if surrogate is not None:
+        logged = [uniform_params() for _ in range(history)]
+        model = make_surrogate(surrogate, trainer.PARAM_BOUNDS).fit(
+            logged, [true_fitness(params) + games.rng.normal(0, games.noise / np.sqrt(trainer.GAMES_PER_INDIVIDUAL))
+                     for params in logged])
+    candidates = trainer.candidate_count(population_size, surrogate, fraction)
+    population = [trainer.random_params() for _ in range(candidates)]
+    best_params, best_fitness = None, float('-inf')
+    correlations = []
+    while games.games < max_games:
+        predictions = None
+        if model is not None:
+            simulated, predictions = screen(model, population, population_size, keep=[0] if best_params else [])
+            population = [population[i] for i in simulated]
+            if predictions is not None:
+                predictions = predictions[simulated]
+        results = [(params, games.fitness(params)) for params in population]
+        fitnesses = [fitness for _, fitness in results]
+        for params, fitness in results:
+            if fitness > best_fitness:
+                best_params, best_fitness = params.copy(), fitness
+        if model is not None:
+            if predictions is not None:
+                correlation = rank_correlation(predictions, fitnesses)
+                if correlation is not None:
+                    correlations.append(correlation)
+            model.add(population, fitnesses)
+        if true_fitness(best_params) >= target:
+            return games.games, correlations
+        results.sort(key=lambda x: x[1], reverse=True)
+        population = trainer.reproduce_population(results, best_params, candidates, 0.1)
+    return None, correlations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Games-to-target benchmark of surrogate pre-screening.')
+    parser.add_argument('--runs', type=int, default=20, help='Runs per variant (different seeds).')
+    parser.add_argument('--target', type=float, default=0.95, help='Target fitness, as a fraction of the peak.')
+    parser.add_argument('--noise', type=float, default=120, help='Per-game fitness noise.')
+    parser.add_argument('--max-games', type=int, default=30000, help='Game budget per run.')
+    parser.add_argument('--population', type=int, default=100, help='Population of the genetic trainer.')
+    parser.add_argument('--fraction', type=float, default=trainer.SURROGATE_FRACTION,
+                        help='Share of the bred candidates simulated.')
+    parser.add_argument('--history', type=int, default=300, help='Logged individuals the surrogate starts from.')
+    args = parser.parse_args()
+
+    target = args.target * PEAK_FITNESS
+    print(f"Target fitness {target:.0f}, noise {args.noise}, population {args.population}, "
+          f"{args.fraction:.0%} simulated with a surrogate, {args.history} logged individuals")
+    medians = {}
+    for surrogate in (None,) + SURROGATES:
+        counts, correlations = [], []
+        for run_index in range(args.runs):
+            random.seed(run_index)
+            games = SimulatedGames(args.noise, np.random.default_rng(run_index))
+            count, run_correlations = run(games, target, args.max_games, args.population, surrogate,
+                                          args.fraction, args.history)
+            counts.append(count)
+            correlations += run_correlations
+        name = surrogate or 'none'
+        medians[name] = report(f"surrogate {name}", counts, args.runs)
+        if correlations:
+            print(f"{'':>24}mean rank correlation predicted/measured {statistics.mean(correlations):+.2f}")
+    for name in SURROGATES:
+        if medians['none'] and medians[name]:
+            print(f"Surrogate {name}: {medians['none'] / medians[name]:.2f}x fewer games to reach the target")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_trainer_log.py
+"""
+Cost of logging the individuals of a training run: the former per-individual CSV
+append (open, one row with the params as JSON, close) vs training_stats.IndividualLog
+flushed once per generation, with and without its binary copy. Also times loading the
+logs back into a DataFrame with one column per parameter.
+
+Usage:
+    python -m benchmarks.bench_trainer_log [--generations 100] [--population 100]
+"""
+import os
+import csv
+import json
+import time
+import random
+import argparse
+import tempfile
+
+import pandas as pd
+
+from trainer import PARAM_BOUNDS, random_params
+from training_stats import IndividualLog, load_stats_frame
+
+
+def per_row_append(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow(["Generation", "Individual", "Fitness", "Params"])
+    for generation, individual, fitness, params in rows:
+        with open(path, mode='a', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow([generation, individual, f"{fitness:.2f}", json.dumps(params)])
+
+
+def buffered(path, rows, population, binary_path=None):
+    log = IndividualLog(path, PARAM_BOUNDS, binary_path)
+    for count, (generation, individual, fitness, params) in enumerate(rows, 1):
+        log.append(generation, individual, fitness, params)
+        if count % population == 0:
+            log.flush()
+    log.close()
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Trainer individual log benchmark.')
+    parser.add_argument('--generations', type=int, default=100, help='Generations logged.')
+    parser.add_argument('--population', type=int, default=100, help='Individuals per generation.')
+    args = parser.parse_args()
+
+    random.seed(0)
+    rows = [(generation, individual, random.uniform(0, 600), random_params())
+            for generation in range(1, args.generations + 1) for individual in range(1, args.population + 1)]
+    with tempfile.TemporaryDirectory() as directory:
+        old, new, binary = (os.path.join(directory, name) for name in ('old.csv', 'new.csv', 'binary.csv'))
+        binary_path = os.path.join(directory, 'binary.bin')
+        print(f"{len(rows)} individuals, flushed every {args.population}")
+        seconds, _ = timed(per_row_append, old, rows)
+        print(f"{'per-row append':>24}: {seconds * 1000:8.1f} ms")
+        seconds, _ = timed(buffered, new, rows, args.population)
+        print(f"{'buffered CSV':>24}: {seconds * 1000:8.1f} ms")
+        seconds, _ = timed(buffered, binary, rows, args.population, binary_path)
+        print(f"{'buffered CSV + binary':>24}: {seconds * 1000:8.1f} ms")
+
+        def load_json_column(path):
+            frame = pd.read_csv(path)
+            return frame.join(pd.DataFrame([json.loads(params) for params in frame.pop('Params')]))
+        seconds, _ = timed(load_json_column, old)
+        print(f"{'load JSON column CSV':>24}: {seconds * 1000:8.1f} ms")
+        seconds, _ = timed(pd.read_csv, new)
+        print(f"{'load typed CSV':>24}: {seconds * 1000:8.1f} ms")
+        seconds, _ = timed(load_stats_frame, binary_path)
+        print(f"{'load binary':>24}: {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_visualize_imports.py
+"""
+Tracks the start-up cost of the visualize_q_table subcommands.
+
+Each measurement is a fresh interpreter, so nothing is already imported: `--help`
+is timed end to end, and every subcommand as importing visualize_q_table plus the
+modules it lists in SUBCOMMANDS (no Q-table is loaded and nothing is plotted).
+Subcommands whose modules are not installed are reported as such.
+
+Usage:
+    python -m benchmarks.bench_visualize_imports [--repeat 5]
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+import statistics
+
+from visualize_q_table import SUBCOMMANDS, missing_modules
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_SNIPPET = "import visualize_q_table as v; v.import_dependencies({command!r})"
+HELP_BUDGET = 1.0  # Seconds; --help and summary must start well under it
+
+
+def run_seconds(args, repeat):
+    """Median wall time of a fresh Python process."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, check=True, stdout=subprocess.DEVNULL,
+                       env=dict(os.environ, MPLBACKEND='Agg'))
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='visualize_q_table start-up benchmark.')
+    parser.add_argument('--repeat', type=int, default=5, help='Processes per measurement (the median is reported).')
+    args = parser.parse_args()
+
+    baseline = run_seconds(['-c', 'pass'], args.repeat)
+    print(f"{'interpreter':>14}: {baseline * 1000:7.0f} ms")
+    help_time = run_seconds(['visualize_q_table.py', '--help'], args.repeat)
+    print(f"{'--help':>14}: {help_time * 1000:7.0f} ms{'' if help_time < HELP_BUDGET else '  OVER BUDGET'}")
+    for command, (_, modules) in SUBCOMMANDS.items():
+        missing = missing_modules(command)
+        if missing:
+            print(f"{command:>14}: not installed ({', '.join(missing)})")
+            continue
+        seconds = run_seconds(['-c', IMPORT_SNIPPET.format(command=command)], args.repeat)
+        budget = '  OVER BUDGET' if command == 'summary' and seconds >= HELP_BUDGET else ''
+        print(f"{command:>14}: {seconds * 1000:7.0f} ms  ({', '.join(modules) or 'no plotting modules'}){budget}")
+
+
+if __name__ == "__main__":
+    main()
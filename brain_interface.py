@@ -1,6 +1,10 @@
 from enum import Enum
+from itertools import chain
+from operator import itemgetter
 from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional, Any, Sequence, Union
+
+import numpy as np
 
 class Action(Enum):
     ROTATE_RIGHT = 1
@@ -16,6 +20,120 @@ class GameState:
     gold_positions: List[Tuple[float, float]]
     asteroids: List[Dict]        # New: List of asteroid info including position and radius
     game_ticks: int              # Current game ticks
+    spatial_index: Optional[Any] = None  # spatial_index.SpatialIndex shared by all states of a tick, when provided
+    config: Optional[Any] = None         # game_config.GameConfig of the game (rules, arena bounds, ...)
+    events: Optional[Any] = None         # events.EventBuffer of the previous tick, when events are enabled
+
+# Action.value -> Action, to turn arrays of action values into actions
+ACTIONS_BY_VALUE = np.array([None] + list(Action), dtype=object)
+
+_ship_codes = {}  # Ship id -> integer code, stable for the whole process
+SHIP_BATCH_FIELDS = ('x', 'y', 'angle', 'health')  # Float arrays of a ShipBatch
+
+
+def ship_code(ship_id: str) -> int:
+    return _ship_codes.setdefault(ship_id, len(_ship_codes))
+
+
+def actions_from_values(values) -> List[Action]:
+    return ACTIONS_BY_VALUE[np.asarray(values, dtype=int)].tolist()
+
+
+class ShipBatch:
+    """
+    The ships of many worlds (one GameState per world, e.g. the same tick of many games) as
+    (worlds, ships) arrays. Worlds with fewer ships are padded (codes -1).
+
+    Building it reads every ship dict: about 3 ms for 1,000 worlds of 6 ships, against
+    under 1 ms for a batched decision and about 7 ms for the scalar loop of one brain. So
+    build it once per tick and pass it to the decide_many of every brain; a brain given the
+    states instead builds its own batch, and then saves little over the scalar loop.
+    """
+
+    def __init__(self, states: Sequence[GameState]):
+        lengths = np.array([len(state.ships) for state in states], dtype=np.int64)
+        worlds, ships = len(states), int(lengths.max(initial=0))
+        # One C-level pass over the dicts per field (itemgetter), no Python code per ship
+        flat = list(chain.from_iterable([state.ships for state in states]))
+        ids = list(map(itemgetter('id'), flat))
+        for ship_id in set(ids).difference(_ship_codes):
+            ship_code(ship_id)
+        codes = np.fromiter(map(_ship_codes.__getitem__, ids), dtype=np.int64, count=len(flat))
+        columns = [np.fromiter(map(itemgetter(name), flat), dtype=float, count=len(flat))
+                   for name in SHIP_BATCH_FIELDS]
+        if len(flat) != worlds * ships:
+            # Ship k of world w goes to w * ships + k
+            positions = np.arange(len(flat)) + np.repeat(np.arange(worlds) * ships - (np.cumsum(lengths) - lengths),
+                                                         lengths)
+            codes, padded = np.full(worlds * ships, -1, dtype=np.int64), codes
+            codes[positions] = padded
+            columns, padded = [np.zeros(worlds * ships) for _ in columns], columns
+            for column, values in zip(columns, padded):
+                column[positions] = values
+        self.codes = codes.reshape(worlds, ships)
+        self.x, self.y, self.angle, self.health = (column.reshape(worlds, ships) for column in columns)
+        self.rows = np.arange(worlds)
+        self.states = list(states)
+
+    @classmethod
+    def of(cls, states: Union['ShipBatch', Sequence[GameState]]) -> 'ShipBatch':
+        return states if isinstance(states, cls) else cls(states)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def own_ships(self, brain_id: str):
+        """(index of the brain's ship in each world, whether it was found)."""
+        mine = self.codes == ship_code(brain_id)
+        return mine.argmax(axis=1), mine.any(axis=1)
+
+    def enemies(self, brain_id: str):
+        """Mask of the other ships still alive."""
+        return (self.codes >= 0) & (self.codes != ship_code(brain_id)) & (self.health > 0)
+
+    def nearest(self, own, candidates):
+        """(index of the closest candidate ship to the own ship of each world, whether there is one)."""
+        dists = np.hypot(self.x - self.x[self.rows, own][:, None], self.y - self.y[self.rows, own][:, None])
+        dists = np.where(candidates, dists, np.inf)
+        return dists.argmin(axis=1), candidates.any(axis=1)
+
+    def aim(self, own, target):
+        """(distance to the target, signed angle to turn towards it in (-180, 180]) per world."""
+        dx = self.x[self.rows, target] - self.x[self.rows, own]
+        dy = self.y[self.rows, target] - self.y[self.rows, own]
+        angle_diff = (np.degrees(np.arctan2(dy, dx)) - self.angle[self.rows, own] + 360) % 360
+        return np.hypot(dx, dy), np.where(angle_diff > 180, angle_diff - 360, angle_diff)
+
+
+def hunt_many(brain, states, optimal_range: float, aim_tolerance: float = 10) -> List[Action]:
+    """
+    decide_many of the stock AggressiveHunterBrain (brains/cpu1.py to cpu4.py): keep the
+    current target while it is alive, otherwise chase the closest enemy; once aimed within
+    aim_tolerance degrees, shoot inside optimal_range and accelerate beyond it. The target
+    code of each world is kept in brain.current_target_codes.
+    """
+    batch = ShipBatch.of(states)
+    own, found = batch.own_ships(brain.id)
+    enemies = batch.enemies(brain.id)
+    if brain.current_target_codes is None or len(brain.current_target_codes) != len(batch):
+        brain.current_target_codes = np.full(len(batch), -1)
+
+    current = enemies & (batch.codes == brain.current_target_codes[:, None])
+    closest, has_enemy = batch.nearest(own, enemies)
+    target = np.where(current.any(axis=1), current.argmax(axis=1), closest)
+    brain.current_target_codes = np.where(found, np.where(has_enemy, batch.codes[batch.rows, target], -1),
+                                          brain.current_target_codes)
+
+    target_distance, angle_diff = batch.aim(own, target)
+    values = np.where(angle_diff > 0, Action.ROTATE_RIGHT.value, Action.ROTATE_LEFT.value)
+    ahead = np.abs(angle_diff) < aim_tolerance
+    values = np.where(ahead & (target_distance < optimal_range), Action.SHOOT.value, values)
+    values = np.where(ahead & (target_distance > optimal_range), Action.ACCELERATE.value, values)
+    values = np.where(ahead & (target_distance == optimal_range), Action.BRAKE.value, values)
+    values = np.where(found & has_enemy, values, Action.ROTATE_RIGHT.value)
+    return actions_from_values(values)
+
+
 class SpaceshipBrain:
     @property
     def id(self) -> str:
@@ -23,6 +141,19 @@ class SpaceshipBrain:
 
     def decide_what_to_do_next(self, game_state: GameState) -> Action:
         raise NotImplementedError()
+
+    def decide_many(self, states: Sequence[GameState]) -> List[Action]:
+        """
+        Decides for this brain's ship in many worlds at once, states[i] being world i.
+
+        The default calls decide_what_to_do_next per state, in order. Brains can override
+        it with array code; those that remember something between ticks (e.g. a target)
+        keep it per world, so the worlds must keep their order from one call to the next.
+        states can also be a ShipBatch built from the states, shared by all the brains.
+        """
+        if isinstance(states, ShipBatch):
+            states = states.states
+        return [self.decide_what_to_do_next(state) for state in states]
         
     def on_game_complete(self, final_state: GameState, won: bool):
         """Called when a game completes. Brains can implement this to handle end-of-game logic"""
@@ -1,8 +1,10 @@
 # brains/perso.py
 import random
-import math
 import json
-from brain_interface import SpaceshipBrain, Action, GameState
+import numpy as np
+
+from brain_interface import SpaceshipBrain, Action, GameState, ShipBatch, actions_from_values
+from geometry import distance, hypot, atan2_degrees, angle_difference
 
 class GeneticHunterBrain(SpaceshipBrain):
     def __init__(self, params=None):
@@ -14,10 +16,13 @@ class GeneticHunterBrain(SpaceshipBrain):
         """
         self._id = "group1-CharlesK"
 
-        # If params is not provided, create a random dictionary of parameters
-        self.params = params if params else self.random_params()
+        # Explicit params (e.g. an individual of genetic_algorithm.py) are used as they are
+        if params:
+            self.params = params
+            return
 
-        # Attempt to load previously trained parameters from best_brain_params.json
+        # Otherwise start from random parameters and load previously trained ones from best_brain_params.json
+        self.params = self.random_params()
         try:
             with open("best_brain_params.json", "r") as f:
                 loaded_params = json.load(f)
@@ -86,24 +91,22 @@ class GeneticHunterBrain(SpaceshipBrain):
         # 3) Pick the nearest target
         current_target = min(
             enemy_ships,
-            key=lambda s: math.hypot(s['x'] - my_ship['x'], s['y'] - my_ship['y'])
+            key=lambda s: distance(my_ship['x'], my_ship['y'], s['x'], s['y'])
         )
         dx = current_target['x'] - my_ship['x']
         dy = current_target['y'] - my_ship['y']
-        distance = math.hypot(dx, dy)
-        target_angle = math.degrees(math.atan2(dy, dx))
+        target_distance = hypot(dx, dy)
+        target_angle = atan2_degrees(dy, dx)
         # Calculate angle difference between my ship's orientation and the target
-        angle_diff = (target_angle - my_ship['angle'] + 360) % 360
-        if angle_diff > 180:
-            angle_diff -= 360
+        angle_diff = angle_difference(target_angle, my_ship['angle'])
 
         # 4) Shooting logic: shoot if aligned enough and within distance
         if abs(angle_diff) < self.params['shoot_accuracy'] and \
-           distance < self.params['distance_weight'] * 300:
+           target_distance < self.params['distance_weight'] * 300:
             return Action.SHOOT
 
         # 5) Otherwise, if the target is too far, attempt to move closer
-        if distance > self.params['distance_weight'] * 300:
+        if target_distance > self.params['distance_weight'] * 300:
             # Either accelerate or just turn, depending on 'aggressiveness'
             if random.random() < self.params['aggressiveness']:
                 return Action.ACCELERATE
@@ -114,6 +117,34 @@ class GeneticHunterBrain(SpaceshipBrain):
         else:
             return Action.ROTATE_LEFT
 
+    def decide_many(self, states) -> list:
+        """
+        decide_what_to_do_next for many worlds with array operations. The aggressiveness
+        draws use the random module in world order, like the scalar calls would.
+        """
+        batch = ShipBatch.of(states)
+        own, found = batch.own_ships(self.id)
+        target, has_enemy = batch.nearest(own, batch.enemies(self.id))
+        target_distance, angle_diff = batch.aim(own, target)
+        shooting_range = self.params['distance_weight'] * 300
+
+        # 6) Turn to align with the target, unless one of the rules before applies
+        values = np.where(angle_diff > 0, Action.ROTATE_RIGHT.value, Action.ROTATE_LEFT.value)
+        # 5) Too far: accelerate with probability 'aggressiveness'
+        retreat = found & (batch.health[batch.rows, own] < self.params['retreat_threshold'] * 100)
+        far = found & has_enemy & ~retreat & (target_distance > shooting_range)
+        draws = np.array([random.random() for _ in range(int(far.sum()))])
+        accelerate = np.zeros(len(batch), dtype=bool)
+        accelerate[far] = draws < self.params['aggressiveness']
+        values = np.where(accelerate, Action.ACCELERATE.value, values)
+        # 4) Aligned and within range: shoot
+        values = np.where((np.abs(angle_diff) < self.params['shoot_accuracy']) & (target_distance < shooting_range),
+                          Action.SHOOT.value, values)
+        # 2) No enemy left (or no ship): rotate right; 1) low health: retreat
+        values = np.where(found & has_enemy, values, Action.ROTATE_RIGHT.value)
+        values = np.where(retreat, Action.ACCELERATE.value, values)
+        return actions_from_values(values)
+
     def on_game_complete(self, final_state: GameState, won: bool):
         """
         This method is called at the end of each game, providing the final game state while training
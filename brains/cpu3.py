@@ -1,10 +1,11 @@
-from brain_interface import SpaceshipBrain, Action, GameState
-import math
+from brain_interface import SpaceshipBrain, Action, GameState, hunt_many
+from geometry import distance, hypot, atan2_degrees, angle_difference
 
 class AggressiveHunterBrain(SpaceshipBrain):
     def __init__(self):
         self._id = "CPU3"
         self.current_target_id = None
+        self.current_target_codes = None  # Target per world of decide_many (brain_interface.ship_code)
         self.optimal_range = 400  
 
     @property
@@ -31,30 +32,28 @@ class AggressiveHunterBrain(SpaceshipBrain):
         current_target = next((ship for ship in enemy_ships if ship['id'] == self.current_target_id), None)
         if not current_target or current_target['health'] <= 0:
             current_target = min(enemy_ships, 
-                key=lambda ship: math.hypot(ship['x'] - my_ship['x'], ship['y'] - my_ship['y']))
+                key=lambda ship: distance(my_ship['x'], my_ship['y'], ship['x'], ship['y']))
             self.current_target_id = current_target['id']
 
 
         # Calculate angle to target
         dx = current_target['x'] - my_ship['x']
         dy = current_target['y'] - my_ship['y']
-        target_line_angle = math.degrees(math.atan2(dy, dx))
+        target_line_angle = atan2_degrees(dy, dx)
 
-        # Calculate angle difference and normalize to -180 to 180
-        angle_diff = (target_line_angle - my_ship['angle'] + 360) % 360
-        if angle_diff > 180:
-            angle_diff -= 360  # Normalize to -180 to 180 range
+        # Calculate angle difference normalized to -180 to 180
+        angle_diff = angle_difference(target_line_angle, my_ship['angle'])
 
         # Get distance to target
-        distance = math.hypot(dx, dy)
+        target_distance = hypot(dx, dy)
 
 
         # Check if target is ahead within shooting range
         if abs(angle_diff) < 10:  # Angle difference is small enough to be considered "ahead"
-            if distance < self.optimal_range:
+            if target_distance < self.optimal_range:
                 #print("Within optimal range. Shooting.")
                 return Action.SHOOT
-            elif distance > self.optimal_range:
+            elif target_distance > self.optimal_range:
                 #print("Beyond optimal range. Accelerating towards target.")
                 return Action.ACCELERATE
             else:
@@ -67,3 +66,7 @@ class AggressiveHunterBrain(SpaceshipBrain):
             return Action.ROTATE_RIGHT
         #print("Rotating left towards target.")
         return Action.ROTATE_LEFT
+
+    def decide_many(self, states) -> list:
+        """decide_what_to_do_next for many worlds with array operations (one target per world)."""
+        return hunt_many(self, states, self.optimal_range)
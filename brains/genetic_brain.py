@@ -8,6 +8,7 @@
 #     TRAINING_MODE, SCREEN_WIDTH, SCREEN_HEIGHT, BORDER_LEFT, BORDER_RIGHT, BORDER_TOP, BORDER_BOTTOM, MAX_TICK_COUNT
 # )
 # from datetime import datetime
+# from artifacts import ArtifactRegistry, save_atomic, GA_STATE
 
 # # ============================
 # # Genetic Algorithm Parameters
@@ -57,8 +58,14 @@
 #             'generation': self.current_generation,
 #             'fitness_scores': self.fitness_scores
 #         }
-#         with open(GA_STATE_FILENAME, 'wb') as f:
-#             pickle.dump(data, f)
+#         def write(path):
+#             with open(path, 'wb') as f:
+#                 pickle.dump(data, f)
+#         save_atomic(GA_STATE_FILENAME, write)
+#         ArtifactRegistry().register(GA_STATE_FILENAME, GA_STATE, brain=CURRENT_FILE_NAME, run_id=RUN_ID, metrics={
+#             'generation': self.current_generation,
+#             'score': max(self.fitness_scores, default=0),
+#         })
 #         print(f"[DEBUG] Saved GA state to {GA_STATE_FILENAME}")
 
 #     def initialize_population(self):
@@ -1,8 +1,8 @@
 # brains/perso.py
 import random
-import math
 import json
 from brain_interface import SpaceshipBrain, Action, GameState
+from geometry import distance, hypot, atan2_degrees, angle_difference
 
 class GeneticHunterBrain(SpaceshipBrain):
     def __init__(self, params=None):
@@ -86,24 +86,22 @@ class GeneticHunterBrain(SpaceshipBrain):
         # 3) Pick the nearest target
         current_target = min(
             enemy_ships,
-            key=lambda s: math.hypot(s['x'] - my_ship['x'], s['y'] - my_ship['y'])
+            key=lambda s: distance(my_ship['x'], my_ship['y'], s['x'], s['y'])
         )
         dx = current_target['x'] - my_ship['x']
         dy = current_target['y'] - my_ship['y']
-        distance = math.hypot(dx, dy)
-        target_angle = math.degrees(math.atan2(dy, dx))
+        target_distance = hypot(dx, dy)
+        target_angle = atan2_degrees(dy, dx)
         # Calculate angle difference between my ship's orientation and the target
-        angle_diff = (target_angle - my_ship['angle'] + 360) % 360
-        if angle_diff > 180:
-            angle_diff -= 360
+        angle_diff = angle_difference(target_angle, my_ship['angle'])
 
         # 4) Shooting logic: shoot if aligned enough and within distance
         if abs(angle_diff) < self.params['shoot_accuracy'] and \
-           distance < self.params['distance_weight'] * 300:
+           target_distance < self.params['distance_weight'] * 300:
             return Action.SHOOT
 
         # 5) Otherwise, if the target is too far, attempt to move closer
-        if distance > self.params['distance_weight'] * 300:
+        if target_distance > self.params['distance_weight'] * 300:
             # Either accelerate or just turn, depending on 'aggressiveness'
             if random.random() < self.params['aggressiveness']:
                 return Action.ACCELERATE
@@ -0,0 +1,147 @@
+# cma_es.py
+"""
+CMA-ES optimizer for the continuous parameters of GeneticHunterBrain, NumPy only.
+
+The genetic trainer (trainer.py) needs about 100 generations of 100 individuals with
+averaging crossover and uniform mutation. CMA-ES instead samples each generation
+from a multivariate normal distribution and adapts its mean, step size and
+covariance to the ranking of the evaluated candidates, which needs far fewer
+evaluations on a handful of dimensions. The search runs in the unit cube: the
+bounds map to [0, 1] per parameter, and candidates outside are reflected back
+(the repaired points are the ones evaluated and used for the update).
+
+Interface (same generation loop as the genetic trainer, higher fitness is better):
+    optimizer = CMAES(PARAM_BOUNDS, seed=0)
+    population = optimizer.ask()              # List of params dicts
+    optimizer.tell([fitness(p) for p in population])
+
+Reference: N. Hansen, "The CMA Evolution Strategy: A Tutorial" (2016).
+"""
+import math
+
+import numpy as np
+
+INITIAL_SIGMA = 0.3  # Step size in unit cube coordinates
+
+
+def reflect(x):
+    """Folds coordinates back into [0, 1] (a point 0.1 beyond a bound ends 0.1 inside)."""
+    x = np.mod(x, 2.0)
+    return np.where(x > 1.0, 2.0 - x, x)
+
+
+class CMAES:
+    """
+    Args:
+        bounds (dict): {name: (lower, upper)} of the parameters.
+        mean (dict): Initial mean (e.g. the current best params), the center of the bounds if None.
+        sigma (float): Initial step size, relative to the width of the bounds.
+        population_size (int): Candidates per generation, 4 + 3 ln(n) if None.
+        seed (int): Seed of the sampling.
+    """
+
+    def __init__(self, bounds, mean=None, sigma=INITIAL_SIGMA, population_size=None, seed=None):
+        self.names = list(bounds)
+        self.lower = np.array([bounds[name][0] for name in self.names], dtype=float)
+        self.upper = np.array([bounds[name][1] for name in self.names], dtype=float)
+        n = self.dimensions = len(self.names)
+        self.rng = np.random.default_rng(seed)
+
+        # Selection and recombination
+        self.population_size = population_size or 4 + int(3 * math.log(n))
+        self.mu = self.population_size // 2
+        weights = math.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.weights = weights / weights.sum()
+        self.mueff = 1.0 / np.sum(self.weights ** 2)
+
+        # Adaptation rates
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0.0, math.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+        # Distribution
+        self.mean = np.full(n, 0.5) if mean is None else self.to_unit(mean)
+        self.sigma = sigma
+        self.C = np.eye(n)
+        self.B = np.eye(n)
+        self.D = np.ones(n)
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+
+        self.generation = 0
+        self.evaluations = 0
+        self.best_params = None
+        self.best_fitness = float('-inf')
+        self._candidates = None
+
+    # ============================
+    # Parameter space
+    # ============================
+
+    def to_unit(self, params):
+        values = np.array([params[name] for name in self.names], dtype=float)
+        return np.clip((values - self.lower) / (self.upper - self.lower), 0.0, 1.0)
+
+    def to_params(self, x):
+        values = self.lower + x * (self.upper - self.lower)
+        return dict(zip(self.names, values.tolist()))
+
+    # ============================
+    # Generation loop
+    # ============================
+
+    def ask(self):
+        """
+        Returns:
+            list: population_size params dicts to evaluate, in the order tell() expects the fitnesses.
+        """
+        z = self.rng.standard_normal((self.population_size, self.dimensions))
+        self._candidates = reflect(self.mean + self.sigma * (z * self.D) @ self.B.T)
+        return [self.to_params(x) for x in self._candidates]
+
+    def tell(self, fitnesses):
+        """
+        Updates the distribution with the fitnesses of the last ask() (higher is better).
+        """
+        fitnesses = np.asarray(fitnesses, dtype=float)
+        if self._candidates is None or len(fitnesses) != len(self._candidates):
+            raise ValueError("tell() needs one fitness per candidate of the last ask().")
+        n = self.dimensions
+        self.evaluations += len(fitnesses)
+        self.generation += 1
+        order = np.argsort(-fitnesses)
+        if fitnesses[order[0]] > self.best_fitness:
+            self.best_fitness = float(fitnesses[order[0]])
+            self.best_params = self.to_params(self._candidates[order[0]])
+
+        old_mean = self.mean
+        selected = self._candidates[order[:self.mu]]
+        self.mean = self.weights @ selected
+        y = (selected - old_mean) / self.sigma
+        y_mean = (self.mean - old_mean) / self.sigma
+
+        # Step size path (in the coordinates where the distribution is isotropic)
+        inv_sqrt_C = self.B @ np.diag(1 / self.D) @ self.B.T
+        self.ps = (1 - self.cs) * self.ps + math.sqrt(self.cs * (2 - self.cs) * self.mueff) * (inv_sqrt_C @ y_mean)
+        ps_norm = np.linalg.norm(self.ps)
+        hsig = ps_norm / math.sqrt(1 - (1 - self.cs) ** (2 * self.generation)) / self.chi_n < 1.4 + 2 / (n + 1)
+
+        # Covariance: rank-one update from the evolution path, rank-mu update from the selected steps
+        self.pc = (1 - self.cc) * self.pc + hsig * math.sqrt(self.cc * (2 - self.cc) * self.mueff) * y_mean
+        rank_one = np.outer(self.pc, self.pc) + (not hsig) * self.cc * (2 - self.cc) * self.C
+        rank_mu = (y.T * self.weights) @ y
+        self.C = (1 - self.c1 - self.cmu) * self.C + self.c1 * rank_one + self.cmu * rank_mu
+        self.sigma *= math.exp((self.cs / self.damps) * (ps_norm / self.chi_n - 1))
+
+        # Eigendecomposition for the next samples (cheap at this size, so every generation)
+        self.C = (self.C + self.C.T) / 2
+        eigenvalues, self.B = np.linalg.eigh(self.C)
+        self.D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+        self._candidates = None
+
+    def mean_params(self):
+        """Current mean of the distribution, the optimizer's estimate of the best params."""
+        return self.to_params(self.mean)
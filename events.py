@@ -0,0 +1,84 @@
+# events.py
+"""
+Typed engine events, collected per tick in a preallocated NumPy buffer.
+
+Brains and trainers used to rebuild what happened by diffing scores, health and hit
+counters between ticks. When events are enabled (a subscriber, SpaceGame(record_events=
+True), or a brain with `reads_events = True`), the engine appends one record per event
+to an EventBuffer while it plays a tick:
+
+    SHOT_FIRED      ship shot; x, y where the bullet starts
+    BULLET_HIT      ship's bullet hit other; value is the damage
+    SHIP_DESTROYED  ship was destroyed by other's bullet; value is the destruction score
+    GOLD_COLLECTED  ship picked up value gold pieces
+    GOLD_SPAWNED    a gold piece appeared at x, y (ship is the destroyed ship it came from, or -1)
+    COLLISION       ship bumped into ship other, or into an asteroid (other -1); value is the overlap
+    BONUS_AWARDED   ship got value points: for surviving the destruction of other, or for being
+                    the last ship standing (other -1)
+
+ship and other are indices into SpaceGame.ships, which are also the indices into
+GameState.ships. After the tick, subscribers are called with the buffer, and the
+GameStates of the next tick expose it as game_state.events. Without any of the above
+the engine skips all of this (one None check per event site).
+
+Usage:
+    game.subscribe(lambda events, game: print(events.counts()))
+    hits = game_state.events.of_type(BULLET_HIT)   # In a brain with reads_events = True
+"""
+import numpy as np
+
+SHOT_FIRED, BULLET_HIT, SHIP_DESTROYED, GOLD_COLLECTED, GOLD_SPAWNED, COLLISION, BONUS_AWARDED = range(7)
+EVENT_NAMES = ('shot_fired', 'bullet_hit', 'ship_destroyed', 'gold_collected', 'gold_spawned', 'collision',
+               'bonus_awarded')
+
+EVENT_DTYPE = np.dtype([('type', 'u1'), ('tick', '<i4'), ('ship', '<i2'), ('other', '<i2'), ('value', '<f8'),
+                        ('x', '<f4'), ('y', '<f4')])
+INITIAL_CAPACITY = 256  # Events per tick before the buffer grows
+
+
+class EventBuffer:
+    """
+    The events of one tick, in the order they happened.
+
+    Args:
+        capacity (int): Preallocated records; the buffer doubles when a tick needs more.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.records = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.count = 0
+        self.tick = 0  # Set by the engine at the start of each tick
+
+    def emit(self, event_type, ship=-1, other=-1, value=0.0, x=0.0, y=0.0):
+        if self.count == len(self.records):
+            self.records = np.concatenate([self.records, np.zeros(len(self.records), dtype=EVENT_DTYPE)])
+        self.records[self.count] = (event_type, self.tick, ship, other, value, x, y)
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def events(self):
+        """View of the records of the tick (valid until the buffer is reused)."""
+        return self.records[:self.count]
+
+    def of_type(self, event_type):
+        events = self.events()
+        return events[events['type'] == event_type]
+
+    def for_ship(self, ship_index):
+        """Events in which the ship took part, as ship or other."""
+        events = self.events()
+        return events[(events['ship'] == ship_index) | (events['other'] == ship_index)]
+
+    def counts(self, ship_index=None):
+        """{event name: number of events} of the tick, optionally only those where ship_index is the ship."""
+        events = self.events()
+        if ship_index is not None:
+            events = events[events['ship'] == ship_index]
+        return {EVENT_NAMES[event_type]: int(count)
+                for event_type, count in enumerate(np.bincount(events['type'], minlength=len(EVENT_NAMES)))
+                if count}
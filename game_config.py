@@ -0,0 +1,128 @@
+# game_config.py
+"""
+Rules and physics of a game as one immutable object.
+
+SpaceGame takes a GameConfig and hands it to the brains as GameState.config, so
+variants (bigger arenas, faster bullets, shorter games, ...) can run side by side
+in one process or worker pool without editing or reimporting space_game.py.
+Derived values (play area bounds, squared radii, per-step factors) are computed
+once when the config is created.
+
+    config = GameConfig(max_tick_count=2000, bullet_speed=400)
+    bigger = config.replace(arena_width=2200, arena_height=1400)
+"""
+import math
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    # Arena
+    arena_width: int = 1100          # Play area, without the borders
+    arena_height: int = 700
+    border_left: int = 50
+    border_right: int = 350          # Wider right border (leaderboard)
+    border_top: int = 50
+    border_bottom: int = 50
+
+    # Timing
+    fps: int = 60
+    fixed_dt: float = 0.016          # Fixed delta time for training mode
+    max_tick_count: int = 5000
+    decision_interval: int = 1       # Ticks between two brain decisions; the last action is repeated in between
+    time_step_factor: int = 1        # Training mode dt multiplier (2-4 for screening runs); > 1 enables swept collisions
+
+    # Ships
+    number_of_brains: int = 6
+    max_velocity: float = 170
+    acceleration: float = 50
+    friction: float = 0.98           # Velocity factor per second
+    brake_factor: float = 0.9        # Velocity factor per BRAKE action at the fixed dt
+    turn_speed: float = 120          # Degrees per second
+    health_full: int = 100
+    bullet_damage: int = 4
+    ship_size: int = 20              # Nose offset, also keeps ships this far from the borders
+    ship_collision_radius: float = 20
+    ship_collision_distance: float = 30  # Centre distance below which two ships are pushed apart
+
+    # Bullets
+    bullet_speed: float = 300
+    bullet_cooldown: float = 1000    # Milliseconds between two shots
+    bullet_size: int = 3
+
+    # Asteroids
+    number_of_asteroids: int = 13
+    asteroid_speed: float = 10
+    asteroid_radius: int = 35
+
+    # Gold
+    initial_gold_count: int = 60
+    gold_spawn_interval: float = 3000  # Milliseconds
+    gold_value: int = 15
+    gold_size: int = 5
+    gold_scatter_fraction: float = 0.5  # Fraction of gold to scatter when ship is destroyed
+    gold_scatter_distance_min: int = 20
+    gold_scatter_distance_max: int = 50
+
+    # Scoring
+    bullet_hit_score: int = 10
+    ship_destruction_score: int = 100
+    ship_destroyed_all_ships_bonus: int = 20
+    last_ship_standing_multiplier: int = 2
+
+    # Collision broad phase
+    broad_phase_min_ships: int = 40  # From this many ships, collision checks use grids instead of all-pairs loops
+    broad_phase_cell_size: int = 64
+
+    # Derived values, computed in __post_init__
+    screen_width: int = field(init=False, repr=False)
+    screen_height: int = field(init=False, repr=False)
+    bounds: Tuple[float, float, float, float] = field(init=False, repr=False)       # Play area (left, top, right, bottom)
+    ship_bounds: Tuple[float, float, float, float] = field(init=False, repr=False)  # Area ship centres are clamped to
+    gold_bounds: Tuple[float, float, float, float] = field(init=False, repr=False)
+    bullet_bounds: Tuple[float, float, float, float] = field(init=False, repr=False)  # Bullets outside are removed
+    ship_collision_radius_sq: float = field(init=False, repr=False)
+    ship_collision_distance_sq: float = field(init=False, repr=False)
+    dt: float = field(init=False, repr=False)                    # Training mode time step, fixed_dt * time_step_factor
+    tick_budget: int = field(init=False, repr=False)             # max_tick_count rescaled to the time step
+    friction_per_step: float = field(init=False, repr=False)     # friction ** dt
+    brake_factor_per_step: float = field(init=False, repr=False)  # brake_factor rescaled to the time step
+    swept_collisions: bool = field(init=False, repr=False)
+
+    def __post_init__(self):
+        derived = {
+            'screen_width': self.border_left + self.arena_width + self.border_right,
+            'screen_height': self.border_top + self.arena_height + self.border_bottom,
+        }
+        left, top = self.border_left, self.border_top
+        right = derived['screen_width'] - self.border_right
+        bottom = derived['screen_height'] - self.border_bottom
+        derived.update({
+            'bounds': (left, top, right, bottom),
+            'ship_bounds': (left + self.ship_size, top + self.ship_size, right - self.ship_size, bottom - self.ship_size),
+            'gold_bounds': (left + self.gold_size, top + self.gold_size, right - self.gold_size, bottom - self.gold_size),
+            'bullet_bounds': (left - self.bullet_size, top - self.bullet_size,
+                              right + self.bullet_size, bottom + self.bullet_size),
+            'ship_collision_radius_sq': self.ship_collision_radius ** 2,
+            'ship_collision_distance_sq': self.ship_collision_distance ** 2,
+            'dt': self.fixed_dt * self.time_step_factor,
+            'tick_budget': math.ceil(self.max_tick_count / self.time_step_factor),
+            'brake_factor_per_step': self.brake_factor ** self.time_step_factor,
+            'swept_collisions': self.time_step_factor > 1,
+        })
+        derived['friction_per_step'] = self.friction ** derived['dt']
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+
+    def replace(self, **changes) -> 'GameConfig':
+        """Copy with some fields changed; derived values are recomputed."""
+        return dataclasses.replace(self, **changes)
+
+    def friction_factor(self, dt: float) -> float:
+        """Velocity factor over `dt` seconds (precomputed for the fixed time step)."""
+        return self.friction_per_step if dt == self.dt else self.friction ** dt
+
+
+DEFAULT_CONFIG = GameConfig()
@@ -0,0 +1,114 @@
+# game_engine.py
+"""
+Headless single-game API for optimizers (genetic_algorithm.GeneticAlgorithm, ...).
+
+A GameEngine plays one seeded training-mode game with a candidate brain against a
+fixed set of opponents and returns a GameResult for the candidate. The training
+environment and the opponent classes are created once per process and reused by
+every call, and the global random state is restored after each game, so engines can
+be used from worker processes and inside optimizers that draw their own random numbers.
+Training mode never imports pygame (space_game.load_pygame is only called for a window).
+
+Usage:
+    engine = GameEngine()
+    result = engine.run_single_game(GeneticHunterBrain(params=params), seed=42)
+    fitness = result.score + 50 * result.kills
+"""
+import random
+from dataclasses import dataclass
+
+from space_game import GameEnvironment, SpaceGame, discover_brain_classes
+from game_config import DEFAULT_CONFIG
+
+_environment = None  # One training environment per process
+
+
+def training_environment():
+    global _environment
+    if _environment is None:
+        _environment = GameEnvironment(training_mode=True)
+    return _environment
+
+
+@dataclass
+class GameResult:
+    """Outcome of a game for the evaluated ship."""
+    score: int
+    kills: int       # Ships destroyed by its bullets
+    survived: bool
+    won: bool
+    gold: int        # Gold held at the end (scattered gold is lost)
+    hits: int        # Bullets that hit a ship
+    ticks: int       # Length of the game
+
+
+def default_opponents(exclude, count):
+    """Classes of the first brains of the regular lineup, without the excluded classes and the Q-learner."""
+    return [obj for _, obj in discover_brain_classes(defined_in_module_only=True)
+            if obj not in exclude and 'qlearning' not in obj.__module__][:count]
+
+
+class GameEngine:
+    """
+    Args:
+        environment (GameEnvironment): Training mode environment, shared by every engine of the process if None.
+        opponents (list): Brain classes (or factories) instantiated for every game. By default, the
+                          regular lineup without the class of the evaluated brain.
+        config (GameConfig): Rules of the games, DEFAULT_CONFIG if None.
+        **game_options: Further SpaceGame arguments (decision_interval, time_step_factor, ...).
+    """
+
+    def __init__(self, environment=None, opponents=None, config=None, **game_options):
+        if environment is not None and not environment.training_mode:
+            raise ValueError("GameEngine needs a training mode environment.")
+        self.environment = environment or training_environment()
+        self.opponents = opponents
+        self.config = config or DEFAULT_CONFIG
+        self.game_options = game_options
+        self._default_opponents = {}  # Brain class -> its default opponent classes
+
+    def opponents_for(self, brain):
+        if self.opponents is not None:
+            return self.opponents
+        brain_class = type(brain)
+        if brain_class not in self._default_opponents:
+            self._default_opponents[brain_class] = default_opponents({brain_class},
+                                                                     self.config.number_of_brains - 1)
+        return self._default_opponents[brain_class]
+
+    def run_single_game(self, brain, seed=None, opponents=None, starting_positions=None):
+        """
+        Plays one headless game.
+
+        Args:
+            brain (SpaceshipBrain): The evaluated brain (its id must differ from the opponents' ids).
+            seed (int): Seeds the game and the opponents; None plays from the current random state.
+            opponents (list): Brain classes for this game only.
+            starting_positions (list): (x, y) per ship, the evaluated brain first
+                                       (see space_game.seeded_starting_positions).
+
+        Returns:
+            GameResult: The result of the evaluated ship.
+        """
+        state = random.getstate() if seed is not None else None
+        try:
+            if seed is not None:
+                random.seed(seed)
+            brains = [brain] + [opponent() for opponent in (opponents or self.opponents_for(brain))]
+            game = SpaceGame(self.environment, wins_per_brain={}, brains=brains, config=self.config,
+                             starting_positions=starting_positions, **self.game_options)
+            winner = game.run()
+        finally:
+            if state is not None:
+                random.setstate(state)
+
+        ship = next(ship for ship in game.ships if ship.brain is brain)
+        return GameResult(
+            score=ship.score,
+            kills=ship.kills,
+            survived=not ship.is_destroyed,
+            won=winner is ship,
+            gold=ship.gold_collected,
+            hits=ship.bullets_hit_count,
+            ticks=game.tick_count,
+        )
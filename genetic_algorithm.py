@@ -1,8 +1,8 @@
 # genetic_algorithm.py
 import random
 import math
-from space_game import SpaceGame, GameEnvironment
-from helpers import GameEngine
+from game_engine import GameEngine
+from space_game import seeded_starting_positions
 from brains.Group1_CharlesK import GeneticHunterBrain
 
 class GeneticAlgorithm:
@@ -18,13 +18,14 @@ class GeneticAlgorithm:
         self.generations = generations
         self.elite_size = elite_size
 
-        # Population initialization
-        self.population = [GeneticHunterBrain() for _ in range(population_size)]
+        # Population initialization (random individuals, not copies of best_brain_params.json)
+        self.population = [GeneticHunterBrain(params=GeneticHunterBrain().random_params())
+                           for _ in range(population_size)]
 
-    def evolve(self, environment, num_games_per_individual=3):
+    def evolve(self, environment=None, num_games_per_individual=3):
         """
         Launches the genetic evolution process.
-        :param environment: the game environment (GameEnvironment).
+        :param environment: the training mode game environment (GameEnvironment), shared per process if None.
         :param num_games_per_individual: number of games to play to evaluate an individual.
         :return: the best brain found.
         """
@@ -35,9 +36,10 @@ class GeneticAlgorithm:
             print(f"\n=== Generation {generation + 1}/{self.generations} ===")
             fitness_scores = []
 
-            # (1) Evaluate each brain
+            # (1) Evaluate each brain, all of them on the same seeded scenarios (common random numbers)
+            scenarios = [random.randrange(2 ** 32) for _ in range(num_games_per_individual)]
             for brain in self.population:
-                fitness = self.evaluate_brain(brain, environment, num_games_per_individual)
+                fitness = self.evaluate_brain(brain, environment, num_games_per_individual, scenarios)
                 fitness_scores.append((brain, fitness))
 
             # (2) Sort by descending fitness
@@ -71,28 +73,29 @@ class GeneticAlgorithm:
 
         return best_brain
 
-    def evaluate_brain(self, brain, environment, num_games):
+    def evaluate_brain(self, brain, environment, num_games, scenarios=None):
         """
         Plays 'num_games' games with a given brain (individual),
         calculating a fitness score based on multiple criteria.
+        :param scenarios: optional game seeds (one game each) shared by the individuals of a generation.
         """
         total_fitness = 0
-        for _ in range(num_games):
-            engine = GameEngine(environment)
-            # run_single_game should return a dict or object containing:
-            #   score, kills, survived (bool), etc.
-            result = engine.run_single_game(brain)
+        engine = GameEngine(environment)
+        seeds = scenarios or [random.randrange(2 ** 32) for _ in range(num_games)]
+        for seed in seeds:
+            # run_single_game returns a GameResult with score, kills, survived, gold, hits and ticks
+            result = engine.run_single_game(brain, seed=seed, starting_positions=seeded_starting_positions(seed))
             
             # For example, we define fitness as a combination of:
             #   - final score
             #   - number of enemies destroyed
             #   - survival bonus (1 if survived, 0 otherwise)
-            fitness = result['score'] + (result['kills'] * 50)
-            if result['survived']:
+            fitness = result.score + (result.kills * 50)
+            if result.survived:
                 fitness += 100  # bonus if still alive
             total_fitness += fitness
 
-        return total_fitness / num_games
+        return total_fitness / len(seeds)
 
     @staticmethod
     def crossover(params1, params2):
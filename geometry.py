@@ -0,0 +1,176 @@
+# geometry.py
+"""
+Geometry kernel shared by the engine and the brains.
+
+Scalar functions are thin, uncached wrappers around the math module (game coordinates
+are floats that almost never repeat, so memoizing them only costs hashing). The
+batched functions take NumPy arrays and answer the same questions for many entities
+at once. Angles are in degrees, like everywhere else in the game.
+"""
+import math
+
+import numpy as np
+
+# ============================
+# Scalar fast paths
+# ============================
+
+hypot = math.hypot
+
+
+def distance(x0, y0, x1, y1):
+    return math.hypot(x1 - x0, y1 - y0)
+
+
+def atan2_degrees(dy, dx):
+    return math.degrees(math.atan2(dy, dx))
+
+
+def angle_difference(target_angle, current_angle):
+    """Signed difference target - current wrapped to (-180, 180]."""
+    angle_diff = (target_angle - current_angle + 360) % 360
+    if angle_diff > 180:
+        angle_diff -= 360
+    return angle_diff
+
+
+def bearing_difference(x, y, heading, target_x, target_y):
+    """Signed angle to turn from `heading` to face (target_x, target_y), in (-180, 180]."""
+    return angle_difference(atan2_degrees(target_y - y, target_x - x), heading)
+
+
+def ray_to_border_distance(x, y, angle, left, right, top, bottom):
+    """Distance from (x, y) along `angle` to the first border of the rectangle (inf if none ahead)."""
+    rad_angle = math.radians(angle)
+    dx = math.cos(rad_angle)
+    dy = math.sin(rad_angle)
+
+    distance_x = distance_y = float('inf')
+    # Vertical borders (left and right)
+    if dx > 0:
+        distance_x = (right - x) / dx
+    elif dx < 0:
+        distance_x = (left - x) / dx
+    # Horizontal borders (top and bottom)
+    if dy > 0:
+        distance_y = (bottom - y) / dy
+    elif dy < 0:
+        distance_y = (top - y) / dy
+    return min(distance_x, distance_y)
+
+
+def in_cone(x, y, heading, target_x, target_y, width, max_range):
+    """True if the target lies within `max_range` and `width` / 2 degrees of `heading`."""
+    if distance(x, y, target_x, target_y) > max_range:
+        return False
+    return abs(bearing_difference(x, y, heading, target_x, target_y)) <= width / 2
+
+
+def segment_circle_contact(x0, y0, x1, y1, cx, cy, radius):
+    """
+    Swept circle test: first fraction t in [0, 1] at which a point moving from (x0, y0)
+    to (x1, y1) comes closer than `radius` to (cx, cy), or None if it never does.
+    For two moving circles, pass the relative motion and the sum of the radii.
+    """
+    fx = x0 - cx
+    fy = y0 - cy
+    c = fx * fx + fy * fy - radius * radius
+    if c < 0:
+        return 0.0  # Already in contact at the start of the step
+    dx = x1 - x0
+    dy = y1 - y0
+    a = dx * dx + dy * dy
+    if a == 0:
+        return None
+    b = fx * dx + fy * dy
+    if b >= 0:
+        return None  # Moving away from the circle
+    discriminant = b * b - a * c
+    if discriminant < 0:
+        return None
+    t = (-b - math.sqrt(discriminant)) / a
+    return t if t <= 1 else None
+
+
+# ============================
+# Batched (NumPy) versions
+# ============================
+
+def distances(x, y, xs, ys):
+    """Distances from one point to arrays of points."""
+    return np.hypot(np.asarray(xs) - x, np.asarray(ys) - y)
+
+
+def pairwise_distances(xs_a, ys_a, xs_b, ys_b):
+    """Matrix of distances, shape (len(a), len(b))."""
+    dx = np.asarray(xs_b)[None, :] - np.asarray(xs_a)[:, None]
+    dy = np.asarray(ys_b)[None, :] - np.asarray(ys_a)[:, None]
+    return np.hypot(dx, dy)
+
+
+def bearings(x, y, xs, ys):
+    """Angles in degrees from one point to arrays of points, in (-180, 180]."""
+    return np.degrees(np.arctan2(np.asarray(ys) - y, np.asarray(xs) - x))
+
+
+def angle_differences(target_angles, current_angles):
+    """Vectorized angle_difference, wrapped to (-180, 180]."""
+    angle_diff = (np.asarray(target_angles) - current_angles + 360) % 360
+    return np.where(angle_diff > 180, angle_diff - 360, angle_diff)
+
+
+def bearing_differences(x, y, heading, xs, ys):
+    return angle_differences(bearings(x, y, xs, ys), heading)
+
+
+def rays_to_border_distances(xs, ys, angles, left, right, top, bottom):
+    """Vectorized ray_to_border_distance for arrays of origins and angles."""
+    rad_angles = np.radians(angles)
+    dx = np.cos(rad_angles)
+    dy = np.sin(rad_angles)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distance_x = np.where(dx > 0, (right - np.asarray(xs)) / dx,
+                              np.where(dx < 0, (left - np.asarray(xs)) / dx, np.inf))
+        distance_y = np.where(dy > 0, (bottom - np.asarray(ys)) / dy,
+                              np.where(dy < 0, (top - np.asarray(ys)) / dy, np.inf))
+    return np.minimum(distance_x, distance_y)
+
+
+def in_cones(x, y, heading, xs, ys, width, max_range):
+    """Boolean mask of the points inside the cone of `width` degrees around `heading`."""
+    return ((distances(x, y, xs, ys) <= max_range) &
+            (np.abs(bearing_differences(x, y, heading, xs, ys)) <= width / 2))
+
+
+def nearest(x, y, xs, ys):
+    """Index of and distance to the closest point, or (None, inf) for empty arrays."""
+    if len(xs) == 0:
+        return None, float('inf')
+    dists = distances(x, y, xs, ys)
+    index = int(np.argmin(dists))
+    return index, float(dists[index])
+
+
+def segment_circle_contacts(x0, y0, x1, y1, cxs, cys, radius):
+    """
+    Vectorized segment_circle_contact of one moving point against many circles.
+
+    Returns:
+        np.ndarray: First contact fraction per circle, NaN where there is no contact.
+    """
+    fx = x0 - np.asarray(cxs, dtype=float)
+    fy = y0 - np.asarray(cys, dtype=float)
+    c = fx * fx + fy * fy - radius * radius
+    dx = x1 - x0
+    dy = y1 - y0
+    a = dx * dx + dy * dy
+    t = np.full(c.shape, np.nan)
+    t[c < 0] = 0.0
+    if a == 0:
+        return t
+    b = fx * dx + fy * dy
+    discriminant = b * b - a * c
+    moving_in = (c >= 0) & (b < 0) & (discriminant >= 0)
+    entry = (-b[moving_in] - np.sqrt(discriminant[moving_in])) / a
+    t[moving_in] = np.where(entry <= 1, entry, np.nan)
+    return t
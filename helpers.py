@@ -1,11 +1,8 @@
-from functools import lru_cache
 import math
 
-# Define cached versions of math functions
-@lru_cache(maxsize=10000)
-def cached_atan2_degrees(dy, dx):
-    return math.degrees(math.atan2(dy, dx))
+from geometry import atan2_degrees
 
-@lru_cache(maxsize=10000)
-def cached_hypot(dx, dy):
-    return math.hypot(dx, dy)
+# The former lru_cache wrappers keyed on raw floats almost never hit, so these names are now
+# plain aliases of the geometry kernel, kept for brains that still import them from here.
+cached_atan2_degrees = atan2_degrees
+cached_hypot = math.hypot
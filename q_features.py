@@ -0,0 +1,198 @@
+# q_features.py
+"""
+Vectorized state featurizer of the Q-learner.
+
+Turns (GameState, ship id) pairs into the bin ordinals and integer state codes of
+q_state.STATE_SCHEMA. The nearest enemy, gold and asteroid of each state are found
+with one NumPy distance pass per kind, then the angles and distances of all states
+in the batch are binned together with np.searchsorted.
+
+The brain asks for the state of the same tick twice (next state of the Q-update and
+current state for the action choice), so StateFeaturizer.state_code memoizes the
+codes of the last tick.
+"""
+import math
+
+import numpy as np
+
+from game_config import DEFAULT_CONFIG
+from geometry import ray_to_border_distance
+from q_state import (
+    STATE_SCHEMA, MAX_LOOK_AHEAD_DISTANCE, ANGLE_DIFF_BINS, DISTANCE_BINS, SPEED_BINS, HEALTH_BINS
+)
+
+NO_STATE = -1  # State code of a ship that is not in the game state
+
+# Targets of the angle / distance features, in the order of the targets array columns
+TARGET_FEATURES = (
+    ('angle_enemy', 'distance_enemy'),
+    ('angle_border', 'distance_border'),
+    ('angle_gold', 'distance_gold'),
+    ('angle_asteroid', 'distance_asteroid'),
+)
+
+
+def inner_edges(bins):
+    """
+    Edges to np.searchsorted (side='right') a value into its bin [bins[i], bins[i + 1]).
+
+    Only the inner edges are searched, so values past the last edge land in the last
+    bin, like the label loops of the Q-learner always did (e.g. an angle difference of
+    exactly 180), and values below the first edge in the first bin.
+    """
+    return np.asarray(bins[1:-1], dtype=float)
+
+
+ANGLE_EDGES = inner_edges(ANGLE_DIFF_BINS)
+DISTANCE_EDGES = inner_edges(DISTANCE_BINS)
+SPEED_EDGES = inner_edges(SPEED_BINS)
+HEALTH_EDGES = inner_edges(HEALTH_BINS)
+
+
+def entity_arrays(game_state, kind):
+    """
+    Positions of the gold or asteroids of a state, taken from the per-tick spatial
+    index when there is one, so the states of a tick share the same arrays.
+    """
+    if game_state.spatial_index is not None:
+        grid = game_state.spatial_index.grid(kind)
+        return grid.xs, grid.ys
+    if kind == 'gold':
+        xy = np.asarray(game_state.gold_positions, dtype=float).reshape(-1, 2)
+        return xy[:, 0], xy[:, 1]
+    return (np.array([asteroid['x'] for asteroid in game_state.asteroids], dtype=float),
+            np.array([asteroid['y'] for asteroid in game_state.asteroids], dtype=float))
+
+
+class StateFeaturizer:
+    """
+    Args:
+        schema (StateSchema): Encoding of the ordinals into state codes.
+        look_ahead (float): Targets at this distance or further are "no-data".
+    """
+
+    def __init__(self, schema=STATE_SCHEMA, look_ahead=MAX_LOOK_AHEAD_DISTANCE):
+        self.schema = schema
+        self.look_ahead = look_ahead
+        columns = {name: index for index, name in enumerate(schema.names)}
+        no_data = [feature.no_data for feature in schema.features]
+        self.angle_columns = [columns[angle] for angle, _ in TARGET_FEATURES]
+        self.distance_columns = [columns[distance] for _, distance in TARGET_FEATURES]
+        self.angle_no_data = np.array([no_data[column] for column in self.angle_columns])
+        self.distance_no_data = np.array([no_data[column] for column in self.distance_columns])
+        self.own_columns = [columns[name] for name in ('angle_velocity', 'speed', 'health', 'can_shoot')]
+        self._cached_state = None
+        self._cached_ticks = None
+        self._cached_codes = {}
+
+    # ============================
+    # Single state, memoized per tick
+    # ============================
+
+    def state_code(self, game_state, ship_id):
+        """
+        State code of a ship, or None if the ship is not in the game state.
+
+        Codes are cached until a game state with other game_ticks (or another
+        GameState object) comes in.
+        """
+        if game_state is not self._cached_state or game_state.game_ticks != self._cached_ticks:
+            self._cached_state = game_state
+            self._cached_ticks = game_state.game_ticks
+            self._cached_codes = {}
+        code = self._cached_codes.get(ship_id)
+        if code is None:
+            code = int(self.state_codes([game_state], [ship_id])[0])
+            code = None if code == NO_STATE else code
+            self._cached_codes[ship_id] = code
+        return code
+
+    # ============================
+    # Batches
+    # ============================
+
+    def state_codes(self, game_states, ship_ids):
+        """
+        Returns:
+            np.ndarray: int64 state code per (game state, ship id) pair, NO_STATE for missing ships.
+        """
+        ordinals, found = self.ordinals(game_states, ship_ids)
+        return np.where(found, self.schema.encode_many(ordinals), NO_STATE)
+
+    def ordinals(self, game_states, ship_ids):
+        """
+        Bin ordinals of a batch of (game state, ship id) pairs.
+
+        Returns:
+            tuple: (n, len(schema)) int64 ordinals and a boolean mask of the pairs whose
+                   ship was found (rows of missing ships are all zeros).
+        """
+        found = []
+        ships = []    # Per found ship: x, y, heading, velocity x / y, health %, cannot shoot
+        nearest = []  # Per found ship: x, y and distance of each target, in TARGET_FEATURES order
+        for game_state, ship_id in zip(game_states, ship_ids):
+            ship = None
+            for other in game_state.ships:
+                if other['id'] == ship_id:
+                    ship = other
+                    break
+            found.append(ship is not None)
+            if ship is None:
+                continue
+            x, y = ship['x'], ship['y']
+
+            # A handful of ships: a Python scan beats building arrays
+            enemy = (np.nan, np.nan, np.inf)
+            for other in game_state.ships:
+                if other is not ship and other['health'] > 0:
+                    enemy_distance = math.hypot(other['x'] - x, other['y'] - y)
+                    if enemy_distance < enemy[2]:
+                        enemy = (other['x'], other['y'], enemy_distance)
+            nearest += enemy
+            config = game_state.config or DEFAULT_CONFIG
+            heading = ship['angle'] % 360
+            ships.append((x, y, heading, ship['velocity_x'], ship['velocity_y'],
+                          ship['health'] / config.health_full * 100,
+                          game_state.game_ticks - ship['last_shot_time'] < config.bullet_cooldown))
+
+            # Border straight ahead (one ray, cheaper in scalar math than as array operations)
+            left, top, right, bottom = config.bounds
+            border_distance = ray_to_border_distance(x, y, heading, left, right, top, bottom)
+            rad_angle = math.radians(heading)
+            nearest += (x + math.cos(rad_angle) * border_distance, y + math.sin(rad_angle) * border_distance,
+                        border_distance)
+            for xs, ys in (entity_arrays(game_state, 'gold'), entity_arrays(game_state, 'asteroids')):
+                if len(xs):
+                    dists = np.hypot(xs - x, ys - y)
+                    index = dists.argmin()
+                    nearest += (xs[index], ys[index], dists[index])
+                else:
+                    nearest += (np.nan, np.nan, np.inf)
+
+        found = np.array(found, dtype=bool)
+        ordinals = np.zeros((len(found), len(self.schema)), dtype=np.int64)
+        if not ships:
+            return ordinals, found
+        x, y, heading, velocity_x, velocity_y, health, cannot_shoot = np.array(ships).T
+        targets = np.reshape(nearest, (len(ships), len(TARGET_FEATURES), 3))  # Target x, y and distance
+
+        # Angles to turn towards the four targets, plus the drift angle of the velocity
+        delta_x = np.column_stack((targets[:, :, 0] - x[:, None], velocity_x))
+        delta_y = np.column_stack((targets[:, :, 1] - y[:, None], velocity_y))
+        desired_angle = np.degrees(np.arctan2(delta_y, delta_x)) % 360
+        angle_ordinals = np.searchsorted(ANGLE_EDGES, (desired_angle - heading[:, None] + 180) % 360 - 180, side='right')
+
+        # Targets at the look-ahead distance or further are no-data
+        in_range = targets[:, :, 2] < self.look_ahead
+        rows = ordinals[found]
+        rows[:, self.angle_columns] = np.where(in_range, angle_ordinals[:, :-1], self.angle_no_data)
+        rows[:, self.distance_columns] = np.where(
+            in_range, np.searchsorted(DISTANCE_EDGES, targets[:, :, 2], side='right'), self.distance_no_data)
+        rows[:, self.own_columns] = np.column_stack((
+            angle_ordinals[:, -1],
+            np.searchsorted(SPEED_EDGES, np.hypot(velocity_x, velocity_y), side='right'),
+            np.searchsorted(HEALTH_EDGES, health, side='right'),
+            cannot_shoot,  # Ordinal 0 is "can_shoot"
+        ))
+        ordinals[found] = rows
+        return ordinals, found
@@ -0,0 +1,51 @@
+# q_rewards.py
+"""
+Reward shaping of the Q-learner, shared by brains/qlearning_brain.py and the
+parallel actors of qlearning_actors.py.
+"""
+SCORE_REWARD_FACTOR = 1        # Multiplier for score-based rewards
+BULLET_HIT_REWARD_FACTOR = 20  # Multiplier for bullet hit-based rewards
+DESTROYED_REWARD = -4000       # Large negative reward for being destroyed
+STEP_REWARD = -0.1             # Small negative reward each step to encourage faster wins
+LOST_REWARD = -1000
+WON_REWARD = 4000
+
+
+def shaped_reward(ship, prev_score, prev_bullets_hit_count, end_of_game, won, episode_length, max_tick_count):
+    """
+    Reward of one step.
+
+    Args:
+        ship (dict): The ship in the new game state, None if it was destroyed.
+        prev_score (int): Score at the previous step.
+        prev_bullets_hit_count (int): Hits at the previous step.
+        episode_length (int): Steps played so far, for the early win bonus.
+
+    Returns:
+        float: The reward.
+    """
+    if not ship:
+        return DESTROYED_REWARD
+
+    score_change = ship['score'] - prev_score
+    bullets_hit_change = ship.get('bullets_hit_count', 0) - prev_bullets_hit_count
+
+    reward = 0
+    if score_change > 0:
+        # Reward for increase in score
+        reward += score_change * SCORE_REWARD_FACTOR
+    else:
+        reward += STEP_REWARD
+
+    if bullets_hit_change > 0:
+        # Reward for successful bullet hits
+        reward += bullets_hit_change * BULLET_HIT_REWARD_FACTOR
+
+    if end_of_game and not won:
+        reward += LOST_REWARD
+
+    if end_of_game and won:
+        reward += WON_REWARD
+        reward += (1 - (episode_length / max_tick_count)) * WON_REWARD  # Extra reward for completing in shorter time
+
+    return reward
@@ -0,0 +1,161 @@
+# q_state.py
+"""
+State schema of the Q-learner and its mixed-radix integer encoding.
+
+A state is one bin per feature (angle and distance to the nearest enemy, border, gold
+and asteroid, own speed, velocity angle, health and whether the ship can shoot). Each
+feature has its bin labels plus a trailing "no-data" bin, and the ordinals of the
+bins are the digits of one integer state code:
+
+    code = sum(ordinal[i] * place_value[i])
+
+The label strings are the ones the Q-learner always used, so pickled label-tuple
+Q-tables convert losslessly (see q_table.convert_pickle).
+"""
+import json
+
+import numpy as np
+
+from game_config import DEFAULT_CONFIG
+
+MAX_LOOK_AHEAD_DISTANCE = 1000    # Maximum distance to look ahead for objects
+
+# Angle Difference Bins: Ranges from -180 to 180 degrees
+ANGLE_DIFF_BINS = [-180, -10, -5, 0, 5, 10, 180]
+
+# Distance Bins for Enemy, Border, Gold, and Asteroid
+DISTANCE_BINS = [0, 50, 150, 400, 600, MAX_LOOK_AHEAD_DISTANCE]
+DISTANCE_BIN_NAMES = ["very-near", "near", "medium", "far", "very-far"]
+
+SPEED_BINS = [0, 50, 100, DEFAULT_CONFIG.max_velocity]
+SPEED_LABELS = ["speed-very-low", "speed-low", "speed-medium", "speed-high"]
+
+# Health Bins (percent of full health)
+HEALTH_BINS = [0, 50, 100]
+HEALTH_LABELS = ["health-low", "health-high"]
+
+CAN_SHOOT_LABELS = ["can_shoot", "cannot_shoot"]
+
+
+def generate_angle_labels(entity_type):
+    """
+    Generates angle labels based on ANGLE_DIFF_BINS.
+
+    Args:
+        entity_type (str): The type of entity (e.g., 'enemy', 'border', 'gold', 'velocity', 'asteroid').
+
+    Returns:
+        list: Labels like 'angle_enemy-from_-10_to_-5'.
+    """
+    return [f"angle_{entity_type}-from_{ANGLE_DIFF_BINS[i]}_to_{ANGLE_DIFF_BINS[i + 1]}"
+            for i in range(len(ANGLE_DIFF_BINS) - 1)]
+
+
+def generate_distance_labels(entity_type):
+    return [f"{entity_type}-{name}" for name in DISTANCE_BIN_NAMES]
+
+
+ANGLE_DIFF_LABELS_ENEMY = generate_angle_labels("enemy")
+ANGLE_DIFF_LABELS_BORDER = generate_angle_labels("border")
+ANGLE_DIFF_LABELS_GOLD = generate_angle_labels("gold")
+ANGLE_DIFF_LABELS_VELOCITY = generate_angle_labels("velocity")  # For agent's own velocity angle difference
+ANGLE_DIFF_LABELS_ASTEROID = generate_angle_labels("asteroid")
+
+DISTANCE_BINS_ENEMY = DISTANCE_BINS_BORDER = DISTANCE_BINS_GOLD = DISTANCE_BINS_ASTEROID = DISTANCE_BINS
+
+DISTANCE_LABELS_ENEMY = generate_distance_labels("enemy")
+DISTANCE_LABELS_BORDER = generate_distance_labels("border")
+DISTANCE_LABELS_GOLD = generate_distance_labels("gold")
+DISTANCE_LABELS_ASTEROID = generate_distance_labels("asteroid")
+
+
+class Feature:
+    """One state feature: its bin labels followed by the no-data label."""
+
+    def __init__(self, name, labels, no_data_label):
+        self.name = name
+        self.labels = list(labels) + [no_data_label]
+        self.no_data = len(labels)  # Ordinal of the no-data bin
+        self.radix = len(self.labels)
+        self.ordinals = {label: ordinal for ordinal, label in enumerate(self.labels)}
+
+    def __repr__(self):
+        return f"Feature({self.name!r}, radix={self.radix})"
+
+
+class StateSchema:
+    """
+    Ordered features and the mixed-radix encoding of their ordinals.
+
+    Args:
+        features (list): Feature objects, in state tuple order.
+    """
+
+    def __init__(self, features):
+        self.features = list(features)
+        self.names = [feature.name for feature in self.features]
+        self.radices = np.array([feature.radix for feature in self.features], dtype=np.int64)
+        # First feature is the least significant digit
+        self.place_values = np.concatenate(([1], np.cumprod(self.radices[:-1]))).astype(np.int64)
+        self.size = int(np.prod(self.radices))  # Number of representable states
+        self._place_values = self.place_values.tolist()
+        self._radices = self.radices.tolist()
+
+    def __len__(self):
+        return len(self.features)
+
+    # ============================
+    # Scalar encoding
+    # ============================
+
+    def encode(self, ordinals):
+        """State code of a sequence of bin ordinals."""
+        return sum(ordinal * place for ordinal, place in zip(ordinals, self._place_values))
+
+    def decode(self, code):
+        """Bin ordinals of a state code."""
+        ordinals = []
+        for radix in self._radices:
+            code, ordinal = divmod(code, radix)
+            ordinals.append(ordinal)
+        return tuple(ordinals)
+
+    def encode_labels(self, labels):
+        """State code of a label tuple (the old Q-table key format)."""
+        return self.encode(feature.ordinals[label] for feature, label in zip(self.features, labels))
+
+    def decode_labels(self, code):
+        return tuple(feature.labels[ordinal] for feature, ordinal in zip(self.features, self.decode(code)))
+
+    # ============================
+    # Batched encoding
+    # ============================
+
+    def encode_many(self, ordinals):
+        """State codes of an (n, len(schema)) array of ordinals."""
+        return np.asarray(ordinals, dtype=np.int64) @ self.place_values
+
+    def decode_many(self, codes):
+        """(n, len(schema)) array of ordinals of the given state codes."""
+        codes = np.asarray(codes, dtype=np.int64)
+        return (codes[:, None] // self.place_values) % self.radices
+
+    def signature(self):
+        """JSON description of the schema, stored with saved tables to detect incompatible layouts."""
+        return json.dumps([[feature.name, feature.labels] for feature in self.features])
+
+
+STATE_SCHEMA = StateSchema([
+    Feature('angle_enemy', ANGLE_DIFF_LABELS_ENEMY, "angle_enemy-no-data"),
+    Feature('distance_enemy', DISTANCE_LABELS_ENEMY, "enemy-no-data"),
+    Feature('angle_border', ANGLE_DIFF_LABELS_BORDER, "angle_border-no-data"),
+    Feature('distance_border', DISTANCE_LABELS_BORDER, "border-no-data"),
+    Feature('angle_gold', ANGLE_DIFF_LABELS_GOLD, "angle_gold-no-data"),
+    Feature('distance_gold', DISTANCE_LABELS_GOLD, "gold-no-data"),
+    Feature('angle_asteroid', ANGLE_DIFF_LABELS_ASTEROID, "angle_asteroid-no-data"),
+    Feature('distance_asteroid', DISTANCE_LABELS_ASTEROID, "asteroid-no-data"),
+    Feature('speed', SPEED_LABELS, "speed-no-data"),
+    Feature('angle_velocity', ANGLE_DIFF_LABELS_VELOCITY, "angle_velocity-no-data"),
+    Feature('health', HEALTH_LABELS, "health-no-data"),
+    Feature('can_shoot', CAN_SHOOT_LABELS, "can_shoot-no-data"),
+])
@@ -0,0 +1,270 @@
+# q_table.py
+"""
+Q-table indexed by integer state codes (see q_state.py).
+
+The state space has close to a billion codes (STATE_SCHEMA.size), but a training run
+only visits a few thousand, so the table is stored sparse: a dict from state code to
+row plus a float32 array of shape (rows, actions) that grows by doubling. Lookups and
+updates are one dict access and one array index; saving and loading is a single
+uncompressed .npz (plain .npy arrays) instead of pickling nested dicts.
+
+Usage (convert the old pickled tables):
+    python q_table.py q_table-qlearning_brain-....pkl [...]
+"""
+import os
+import json
+import pickle
+import argparse
+
+import numpy as np
+
+from brain_interface import Action
+from q_state import STATE_SCHEMA
+
+ACTIONS = list(Action)
+ACTION_INDEX = {action: index for index, action in enumerate(ACTIONS)}
+
+INITIAL_CAPACITY = 1024
+
+
+class QTable:
+    """
+    Args:
+        schema (StateSchema): Encoding of the state codes, stored with the table.
+        num_actions (int): Number of columns, one per Action.
+        capacity (int): Initial number of rows.
+    """
+
+    def __init__(self, schema=STATE_SCHEMA, num_actions=len(ACTIONS), capacity=INITIAL_CAPACITY):
+        self.schema = schema
+        self.num_actions = num_actions
+        self.rows = {}  # State code -> row in codes / values
+        self.codes = np.empty(capacity, dtype=np.int64)
+        self.values = np.zeros((capacity, num_actions), dtype=np.float32)
+        self.visits = np.zeros((capacity, num_actions), dtype=np.int64)  # Updates per (state, action)
+        self._unseen = np.zeros(num_actions, dtype=np.float32)  # Q-values of states never updated
+        self._unseen.flags.writeable = False
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, code):
+        return code in self.rows
+
+    # ============================
+    # Lookup and update
+    # ============================
+
+    def row(self, code):
+        """Row of a state code, added with zero Q-values if it is new."""
+        row = self.rows.get(code)
+        if row is None:
+            row = len(self.rows)
+            if row == len(self.codes):
+                self._grow()
+            self.codes[row] = code
+            self.values[row] = 0
+            self.visits[row] = 0
+            self.rows[code] = row
+        return row
+
+    def _grow(self):
+        capacity = 2 * len(self.codes)
+        codes = np.empty(capacity, dtype=np.int64)
+        values = np.zeros((capacity, self.num_actions), dtype=np.float32)
+        visits = np.zeros((capacity, self.num_actions), dtype=np.int64)
+        codes[:len(self.codes)] = self.codes
+        values[:len(self.values)] = self.values
+        visits[:len(self.visits)] = self.visits
+        self.codes, self.values, self.visits = codes, values, visits
+
+    def get(self, code):
+        """Q-values of a state (read-only zeros for unseen states)."""
+        row = self.rows.get(code)
+        return self._unseen if row is None else self.values[row]
+
+    def get_many(self, codes):
+        """(len(codes), actions) Q-values of many states (zeros for unseen states)."""
+        rows = np.fromiter((self.rows.get(code, -1) for code in np.asarray(codes).tolist()), dtype=np.int64,
+                           count=len(codes))
+        values = np.zeros((len(rows), self.num_actions), dtype=np.float32)
+        seen = rows >= 0
+        values[seen] = self.values[rows[seen]]
+        return values
+
+    def max_q(self, code):
+        row = self.rows.get(code)
+        # Python max over 5 floats beats a NumPy reduction call
+        return 0.0 if row is None else max(self.values[row].tolist())
+
+    def best_actions(self, code):
+        """Indices of the actions with the highest Q-value (all of them for unseen states)."""
+        q_values = self.get(code).tolist()
+        best = max(q_values)
+        return [index for index, q_value in enumerate(q_values) if q_value == best]
+
+    def update(self, code, action_index, reward, next_code, alpha, gamma):
+        """One Q-learning step: Q(s, a) += alpha * (reward + gamma * max Q(s') - Q(s, a))."""
+        target = reward + gamma * self.max_q(next_code)
+        row = self.row(code)
+        self.values[row, action_index] += alpha * (target - self.values[row, action_index])
+        self.visits[row, action_index] += 1
+
+    def update_many(self, codes, action_indices, rewards, next_codes, dones, alpha, gamma, weights=None):
+        """
+        Batched Q-learning step over arrays of transitions.
+
+        All targets are computed from the Q-values before the batch, and the steps of
+        transitions that share a (state, action) pair add up.
+
+        Args:
+            dones (np.ndarray): True for terminal transitions (no bootstrapping from next_codes).
+            weights (np.ndarray): Optional per-transition step scale (importance sampling weights).
+
+        Returns:
+            np.ndarray: The TD errors, e.g. new priorities for a prioritized replay buffer.
+        """
+        rows = np.fromiter((self.row(code) for code in codes.tolist()), dtype=np.int64, count=len(codes))
+        next_rows = np.fromiter((self.rows.get(code, -1) for code in next_codes.tolist()), dtype=np.int64,
+                                count=len(next_codes))
+        seen = (next_rows >= 0) & ~dones
+        next_max = np.zeros(len(rows), dtype=np.float32)
+        next_max[seen] = self.values[next_rows[seen]].max(axis=1)
+        td_errors = rewards + gamma * next_max - self.values[rows, action_indices]
+        steps = alpha * td_errors if weights is None else alpha * weights * td_errors
+        np.add.at(self.values, (rows, action_indices), steps)
+        np.add.at(self.visits, (rows, action_indices), 1)
+        return td_errors
+
+    def state_codes(self):
+        return self.codes[:len(self.rows)]
+
+    def q_values(self):
+        """(states, actions) view of the Q-values, in the order of state_codes()."""
+        return self.values[:len(self.rows)]
+
+    def visit_counts(self):
+        """(states, actions) view of the update counts, in the order of state_codes()."""
+        return self.visits[:len(self.rows)]
+
+    def copy(self):
+        table = QTable(self.schema, self.num_actions, capacity=len(self.codes))
+        table.rows = dict(self.rows)
+        table.codes[:] = self.codes
+        table.values[:] = self.values
+        table.visits[:] = self.visits
+        return table
+
+    # ============================
+    # Sparse deltas (parallel actors, see qlearning_actors.py)
+    # ============================
+
+    def deltas_since(self, base):
+        """
+        Changes made to this copy of `base`, restricted to the (state, action) pairs updated
+        since the visit counts were last reset.
+
+        Returns:
+            tuple: (codes, value deltas, visit counts), one row per updated state.
+        """
+        rows = np.flatnonzero(self.visit_counts().any(axis=1))
+        codes = self.codes[rows]
+        visits = self.visits[rows]
+        deltas = np.where(visits > 0, self.values[rows] - base.get_many(codes), 0).astype(np.float32)
+        return codes, deltas, visits
+
+    def merge(self, codes, deltas, visits):
+        """
+        Adds the deltas of several copies, as the visit-count weighted mean per (state, action):
+        a pair updated 100 times by one actor and once by another mostly moves the first way.
+
+        Args:
+            codes, deltas, visits: Concatenated deltas_since() results (the same code may repeat).
+        """
+        rows = np.fromiter((self.row(code) for code in codes.tolist()), dtype=np.int64, count=len(codes))
+        weighted = np.zeros((len(self.rows), self.num_actions))
+        weights = np.zeros((len(self.rows), self.num_actions))
+        np.add.at(weighted, rows, deltas * visits)
+        np.add.at(weights, rows, visits)
+        updated = weights > 0
+        self.q_values()[updated] += (weighted[updated] / weights[updated]).astype(np.float32)
+        self.visit_counts()[...] += weights.astype(np.int64)
+
+    # ============================
+    # Persistence
+    # ============================
+
+    def save(self, path, **metadata):
+        """
+        Writes the table as an .npz of plain .npy arrays.
+
+        Args:
+            path (str): Output file; np.savez appends '.npz' if missing.
+            **metadata: JSON-serializable values stored with the table (e.g. epsilon).
+        """
+        np.savez(path, codes=self.state_codes(), values=self.q_values(), visits=self.visit_counts(),
+                 schema=np.array(self.schema.signature()), metadata=np.array(json.dumps(metadata)))
+
+    @classmethod
+    def load(cls, path, schema=STATE_SCHEMA):
+        """
+        Returns:
+            tuple: (QTable, metadata dict).
+        """
+        with np.load(path) as data:
+            if str(data['schema']) != schema.signature():
+                raise ValueError(f"{path} was saved with a different state schema.")
+            codes = data['codes']
+            values = data['values']
+            visits = data['visits'] if 'visits' in data.files else None
+            metadata = json.loads(str(data['metadata']))
+        table = cls(schema, values.shape[1], capacity=max(INITIAL_CAPACITY, len(codes)))
+        table.codes[:len(codes)] = codes
+        table.values[:len(values)] = values
+        if visits is not None:
+            table.visits[:len(visits)] = visits
+        table.rows = dict(zip(codes.tolist(), range(len(codes))))
+        return table, metadata
+
+    # ============================
+    # Label-tuple dict format
+    # ============================
+
+    @classmethod
+    def from_dict(cls, q_table, schema=STATE_SCHEMA):
+        """Builds a table from the old {label tuple: {Action: q}} format."""
+        table = cls(schema, capacity=max(INITIAL_CAPACITY, len(q_table)))
+        for state, action_values in q_table.items():
+            row = table.row(schema.encode_labels(state))
+            for action, q_value in action_values.items():
+                table.values[row, ACTION_INDEX[action]] = q_value
+        return table
+
+    def to_dict(self):
+        """The table in the old {label tuple: {Action: q}} format, e.g. for visualize_q_table."""
+        return {self.schema.decode_labels(code): dict(zip(ACTIONS, q_values.tolist()))
+                for code, q_values in zip(self.state_codes().tolist(), self.q_values())}
+
+
+def convert_pickle(pickle_path, output_path=None):
+    """
+    Converts a pickled {'q_table': {...}, 'epsilon': ...} file to the .npz format.
+
+    Returns:
+        str: Path of the written file.
+    """
+    with open(pickle_path, 'rb') as f:
+        data = pickle.load(f)
+    table = QTable.from_dict(data.get('q_table', {}))
+    output_path = output_path or os.path.splitext(pickle_path)[0] + '.npz'
+    table.save(output_path, epsilon=data.get('epsilon'))
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convert pickled Q-tables to the .npz format.')
+    parser.add_argument('files', nargs='+', help='Pickled Q-table files.')
+    args = parser.parse_args()
+    for pickle_path in args.files:
+        output_path = convert_pickle(pickle_path)
+        print(f"{pickle_path} ({os.path.getsize(pickle_path)} bytes) -> {output_path} ({os.path.getsize(output_path)} bytes)")
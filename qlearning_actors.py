@@ -0,0 +1,286 @@
+# qlearning_actors.py
+"""
+Parallel Q-learning: actor processes play, a central learner merges.
+
+Each actor task loads the latest published Q-table snapshot, plays a few headless
+games with an epsilon-greedy Q-learner against the regular brains while updating its
+own copy of the table, and sends back only the sparse deltas: the codes, Q-value
+changes and visit counts of the (state, action) pairs it updated. The learner buffers
+the results completed between two publishes and merges them in one QTable.merge call,
+so the deltas of actors that started from the same table are averaged per (state,
+action), weighted by visit count, instead of being added up. It decays epsilon per
+game played and publishes a new snapshot version every few results.
+Actors reuse their loaded snapshot until a newer version is published, so the
+tables are not reloaded for every task.
+
+Usage:
+    python qlearning_actors.py [--games 1000] [--workers 4] [--games-per-task 4] [--output q_table-actors.npz]
+"""
+import os
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# Workers never open a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+
+from brain_interface import SpaceshipBrain, Action, GameState
+from game_config import DEFAULT_CONFIG
+from q_features import StateFeaturizer
+from q_rewards import shaped_reward
+from q_table import QTable, ACTIONS
+from space_game import GameEnvironment, SpaceGame, discover_brain_classes
+from training_stats import StatsWriter, QLEARNING_FIELDS
+from artifacts import ArtifactRegistry, save_atomic, Q_TABLE
+
+# Same parameters as brains/qlearning_brain.py
+INITIAL_EPSILON = 1.0
+LEARNING_RATE = 0.01
+DISCOUNT_FACTOR = 0.95
+MIN_EPSILON = 0.01
+EPSILON_DECAY = 0.999  # Per game
+
+GAMES_PER_TASK = 4
+PUBLISH_INTERVAL = 2  # Actor results merged into each published snapshot
+SNAPSHOT_SUFFIX = '.snapshot.npz'
+STATS_SUFFIX = '.stats.bin'  # One QLEARNING_FIELDS record per game (training_stats.py)
+
+
+class QLearningActorBrain(SpaceshipBrain):
+    """
+    Epsilon-greedy Q-learner playing from a local copy of the table, with the online
+    updates and reward shaping of QLearningBrain.
+    """
+
+    def __init__(self, q_table, epsilon, brain_id='Q-Learner'):
+        self._id = brain_id
+        self.q_table = q_table
+        self.epsilon = epsilon
+        self.featurizer = StateFeaturizer()
+        self.reset()
+
+    def reset(self):
+        self.prev_state = None
+        self.prev_action = None
+        self.prev_score = 0
+        self.prev_bullets_hit_count = 0
+        self.episode_length = 0
+        self.total_reward = 0
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    def current_ship(self, game_state: GameState):
+        for ship in game_state.ships:
+            if ship['id'] == self._id:
+                return ship
+        return None
+
+    def learn(self, game_state: GameState, end_of_game: bool, won: bool):
+        if self.prev_state is None:
+            return None
+        ship = self.current_ship(game_state)
+        max_tick_count = (game_state.config or DEFAULT_CONFIG).max_tick_count
+        reward = shaped_reward(ship, self.prev_score, self.prev_bullets_hit_count, end_of_game, won,
+                               self.episode_length, max_tick_count)
+        self.total_reward += reward
+        state = self.featurizer.state_code(game_state, self._id)
+        # No bootstrapping from terminal states
+        next_state = -1 if state is None or end_of_game else state
+        self.q_table.update(self.prev_state, self.prev_action, reward, next_state, LEARNING_RATE, DISCOUNT_FACTOR)
+        return state
+
+    def decide_what_to_do_next(self, game_state: GameState) -> Action:
+        self.episode_length += 1
+        self.learn(game_state, False, False)
+        state = self.featurizer.state_code(game_state, self._id)
+        if random.random() < self.epsilon:
+            action_index = random.randrange(len(ACTIONS))
+        else:
+            action_index = random.choice(self.q_table.best_actions(state))
+        self.prev_state = state
+        self.prev_action = action_index
+
+        ship = self.current_ship(game_state)
+        self.prev_score = ship['score'] if ship else 0
+        self.prev_bullets_hit_count = ship.get('bullets_hit_count', 0) if ship else 0
+        return ACTIONS[action_index]
+
+    def on_game_complete(self, final_state: GameState, won: bool):
+        self.learn(final_state, True, won)
+
+
+###################
+# Actor (worker process)
+###################
+_environment = None
+_snapshot = None  # (path, version, QTable) of the last loaded snapshot
+
+
+def load_snapshot(path, version):
+    """The published table, reloaded only when a newer version than the cached one is asked for."""
+    global _snapshot
+    if _snapshot is None or _snapshot[0] != path or _snapshot[1] < version:
+        table, metadata = QTable.load(path)
+        # The learner may have published an even newer version in the meantime, which is fine
+        _snapshot = (path, metadata['version'], table)
+    return _snapshot[2]
+
+
+def opponent_classes(count):
+    """The first brains of the regular lineup, without the Q-learner (it would load its own table)."""
+    return [obj for name, obj in discover_brain_classes() if 'qlearning' not in obj.__module__][:count]
+
+
+def play_actor_games(snapshot_path, version, epsilon, games, seed, config=None):
+    """
+    Plays seeded headless games with a Q-learner on a copy of the published table.
+
+    Returns:
+        dict: 'codes', 'deltas', 'visits' (QTable.deltas_since), 'version' of the snapshot played with,
+              and 'scores', 'wins', 'rewards' and 'ticks' (one entry per game).
+    """
+    global _environment
+    if _environment is None:
+        _environment = GameEnvironment(training_mode=True)
+    config = config or DEFAULT_CONFIG
+    base = load_snapshot(snapshot_path, version)
+    table = base.copy()
+    table.visit_counts()[...] = 0
+
+    rng = random.Random(seed)
+    brain = QLearningActorBrain(table, epsilon)
+    result = {'version': _snapshot[1], 'epsilon': epsilon, 'scores': [], 'wins': [], 'rewards': [], 'ticks': []}
+    opponents = opponent_classes(config.number_of_brains - 1)
+    for _ in range(games):
+        random.seed(rng.randrange(2 ** 32))
+        brain.reset()
+        game = SpaceGame(_environment, wins_per_brain={}, brains=[brain] + [cls() for cls in opponents],
+                         config=config)
+        winner = game.run()
+        ship = next(ship for ship in game.ships if ship.brain is brain)
+        result['scores'].append(ship.score)
+        result['wins'].append(winner is not None and winner.brain is brain)
+        result['rewards'].append(brain.total_reward)
+        result['ticks'].append(game.tick_count)
+
+    result['codes'], result['deltas'], result['visits'] = table.deltas_since(base)
+    return result
+
+
+###################
+# Learner
+###################
+def merge_results(table, results):
+    """Merges the deltas of several actor results at once, as visit-count weighted means."""
+    if results:
+        table.merge(np.concatenate([result['codes'] for result in results]),
+                    np.concatenate([result['deltas'] for result in results]),
+                    np.concatenate([result['visits'] for result in results]))
+
+
+def publish(table, snapshot_path, version, epsilon):
+    """Writes the snapshot atomically, so actors never read a half-written file."""
+    save_atomic(snapshot_path, lambda path: table.save(path, version=version, epsilon=epsilon))
+
+
+def train(num_games, workers=None, games_per_task=GAMES_PER_TASK, output_path='q_table-actors.npz',
+          publish_interval=PUBLISH_INTERVAL, seed=0, config=None):
+    """
+    Runs the actors until num_games games were played, merging their deltas at each publish.
+
+    Args:
+        output_path (str): Table to resume from if it exists, and where the result is saved. Per-game
+                           stats are appended next to it (STATS_SUFFIX).
+        publish_interval (int): Actor results merged into each snapshot version; lower is fresher
+                                but costs more saving and reloading.
+
+    Returns:
+        QTable: The merged table.
+    """
+    workers = workers or os.cpu_count() or 1
+    epsilon = INITIAL_EPSILON
+    if os.path.exists(output_path):
+        table, metadata = QTable.load(output_path)
+        epsilon = metadata.get('epsilon', INITIAL_EPSILON)
+        print(f"Resuming from {output_path}: {len(table)} states, epsilon {epsilon:.3f}")
+    else:
+        table = QTable()
+
+    snapshot_path = os.path.splitext(output_path)[0] + SNAPSHOT_SUFFIX
+    stats = StatsWriter(os.path.splitext(output_path)[0] + STATS_SUFFIX, QLEARNING_FIELDS)
+    version = 0
+    publish(table, snapshot_path, version, epsilon)
+
+    rng = random.Random(seed)
+    games_played = 0
+    games_submitted = 0
+    batch = []  # Results completed since the last publish
+    total_score = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            # Keep every worker busy with the current snapshot and epsilon
+            while len(pending) < workers * 2 and games_submitted < num_games:
+                games = min(games_per_task, num_games - games_submitted)
+                pending.add(pool.submit(play_actor_games, snapshot_path, version, epsilon, games,
+                                        rng.randrange(2 ** 32), config))
+                games_submitted += games
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Actor task failed: {e}")
+                    continue
+                batch.append(result)
+                for score, reward, won in zip(result['scores'], result['rewards'], result['wins']):
+                    stats.append(score, reward, result['epsilon'], won, len(table))
+                games = len(result['scores'])
+                games_played += games
+                total_score += sum(result['scores'])
+                epsilon = max(MIN_EPSILON, epsilon * EPSILON_DECAY ** games)
+                print(f"Games {games_played}/{num_games} (snapshot v{result['version']}): "
+                      f"score {np.mean(result['scores']):.0f}, reward {np.mean(result['rewards']):.0f}, "
+                      f"wins {sum(result['wins'])}/{games}, states {len(table)}, epsilon {epsilon:.3f}, "
+                      f"{games_played / (time.perf_counter() - start):.2f} games/s")
+
+            if len(batch) >= publish_interval:
+                merge_results(table, batch)
+                batch = []
+                version += 1
+                publish(table, snapshot_path, version, epsilon)
+
+    merge_results(table, batch)
+    save_atomic(output_path, lambda path: table.save(path, epsilon=epsilon))
+    stats.close()
+    os.remove(snapshot_path)
+    ArtifactRegistry(os.path.dirname(output_path)).register(
+        output_path, Q_TABLE, brain='qlearning_actors', run_id=os.path.splitext(os.path.basename(output_path))[0],
+        metrics={'score': total_score / max(1, games_played), 'games': games_played, 'states': len(table),
+                 'epsilon': epsilon})
+    print(f"Saved {len(table)} states to {output_path}")
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Parallel Q-learning with actor processes and a central learner.')
+    parser.add_argument('--games', type=int, default=1000, help='Games to play in total.')
+    parser.add_argument('--workers', type=int, default=None, help='Actor processes (default: CPU count).')
+    parser.add_argument('--games-per-task', type=int, default=GAMES_PER_TASK, help='Games per actor task.')
+    parser.add_argument('--publish-interval', type=int, default=PUBLISH_INTERVAL,
+                        help='Actor results merged into each published snapshot.')
+    parser.add_argument('--output', type=str, default='q_table-actors.npz', help='Table to resume from and save to.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the game seed sequence.')
+    args = parser.parse_args()
+
+    train(args.games, workers=args.workers, games_per_task=args.games_per_task, output_path=args.output,
+          publish_interval=args.publish_interval, seed=args.seed)
@@ -0,0 +1,97 @@
+# replay_buffer.py
+"""
+Experience replay for the Q-learner.
+
+Transitions (state code, action index, reward, next state code, done) go into
+fixed-size NumPy ring buffers; when full, the oldest ones are overwritten. The brain
+adds one transition per tick, which is only a few array writes, and every N ticks
+(and at the end of a game) samples a mini-batch that QTable.update_many applies in
+one vectorized step, so each experience can be learned from more than once.
+
+With prioritized sampling, transitions are drawn with probability proportional to
+|TD error| ** alpha (new transitions get the highest priority seen so far), so rare
+large rewards like kills, wins and deaths are replayed more often than the -0.1 of
+an uneventful tick. Importance sampling weights correct for the skewed sampling.
+"""
+import numpy as np
+
+REPLAY_CAPACITY = 50000
+PRIORITY_ALPHA = 0.6    # 0 is uniform sampling, 1 fully proportional to the TD error
+PRIORITY_BETA = 0.4     # Importance sampling correction, 1 fully compensates the bias
+PRIORITY_EPSILON = 1e-3  # Keeps transitions with a zero TD error sampleable
+
+
+class ReplayBuffer:
+    """
+    Args:
+        capacity (int): Number of transitions kept.
+        prioritized (bool): Sample by TD error instead of uniformly.
+        seed (int): Seed of the sampling generator.
+    """
+
+    def __init__(self, capacity=REPLAY_CAPACITY, prioritized=False, alpha=PRIORITY_ALPHA, beta=PRIORITY_BETA,
+                 seed=None):
+        self.capacity = capacity
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.beta = beta
+        self.rng = np.random.default_rng(seed)
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.priorities = np.zeros(capacity, dtype=np.float64)  # Already raised to alpha
+        self.max_priority = 1.0
+        self.position = 0  # Next slot to write
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state, done):
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.priorities[i] = self.max_priority
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def sample(self, batch_size):
+        """
+        Returns:
+            tuple: (indices, weights). weights is None for uniform sampling.
+        """
+        if not self.prioritized:
+            return self.rng.integers(0, self.size, size=batch_size), None
+        # Inverse transform sampling over the cumulative priorities (much cheaper than rng.choice with p)
+        cumulative = np.cumsum(self.priorities[:self.size])
+        total = cumulative[-1]
+        indices = np.searchsorted(cumulative, self.rng.random(batch_size) * total, side='right')
+        indices = np.minimum(indices, self.size - 1)
+        weights = (self.size * self.priorities[indices] / total) ** -self.beta
+        return indices, (weights / weights.max()).astype(np.float32)
+
+    def update_priorities(self, indices, td_errors):
+        priorities = (np.abs(td_errors) + PRIORITY_EPSILON) ** self.alpha
+        self.priorities[indices] = priorities
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+
+    def replay(self, q_table, batch_size, alpha, gamma):
+        """
+        Samples a mini-batch and applies it to the Q-table.
+
+        Returns:
+            int: Number of transitions applied (0 while the buffer is empty).
+        """
+        if not self.size:
+            return 0
+        indices, weights = self.sample(batch_size)
+        td_errors = q_table.update_many(self.states[indices], self.actions[indices], self.rewards[indices],
+                                        self.next_states[indices], self.dones[indices], alpha, gamma, weights)
+        if self.prioritized:
+            self.update_priorities(indices, td_errors)
+        return len(indices)
@@ -0,0 +1,460 @@
+# shared_state.py
+"""
+Zero-copy publication of the per-tick game state to brains running in other processes.
+
+On the decision ticks of its remote brains, the engine writes the state into a ring of
+fixed-layout NumPy records that live in a multiprocessing.shared_memory block, and
+requests a decision from each brain due to decide. Child processes attach to the same
+block by name, read the requested slot without any pickling, and write their chosen
+Action back into the action slot of their brain index (given when the child is
+spawned) tagged with the sequence number they answered.
+
+Both sides wait by spinning briefly on the shared sequence numbers, then block on a
+multiprocessing.Event per brain index (wake-up for the child, answered for the
+engine), so a waiting process does not take the CPU from the one it waits for. A
+remote decision still costs two process switches: benchmarks/bench_shared_state.py
+measures it (about 0.13 ms per decision on one core, against 10 us for a local
+call to the same brain), so remote brains pay off for brains that think much longer than
+that. Slots are seqlocked: the engine zeroes a slot's header sequence before writing
+it, and the child discards a decision whose slot changed while it was reading (only
+possible once the engine gave up waiting on it).
+
+Layout of the shared block (all arrays are views on the same buffer):
+    control   : latest published sequence number and a stop flag
+    headers   : one header per ring slot (sequence, game_ticks, entity counts)
+    ships     : (ring_size, max_ships) SHIP_DTYPE records
+    bullets   : (ring_size, max_bullets) BULLET_DTYPE records
+    asteroids : (ring_size, max_asteroids) ASTEROID_DTYPE records
+    gold      : (ring_size, max_gold) GOLD_DTYPE records
+    brain_ships: (ring_size, max_ships) index of the ship record of each brain index, -1 if absent
+    requests  : (max_ships,) sequence number each brain index has to answer, written by the engine
+    actions   : (max_ships,) ACTION_DTYPE records written by the children, one per brain index
+"""
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from brain_interface import SpaceshipBrain, Action, GameState
+
+SHIP_ID_LENGTH = 32
+
+CONTROL_DTYPE = np.dtype([('latest_seq', 'u8'), ('stop', 'u8')])
+HEADER_DTYPE = np.dtype([
+    ('seq', 'u8'),
+    ('game_ticks', 'f8'),
+    ('n_ships', 'i4'),
+    ('n_bullets', 'i4'),
+    ('n_asteroids', 'i4'),
+    ('n_gold', 'i4'),
+])
+SHIP_DTYPE = np.dtype([
+    ('id', f'S{SHIP_ID_LENGTH}'),
+    ('x', 'f8'),
+    ('y', 'f8'),
+    ('angle', 'f8'),
+    ('velocity_x', 'f8'),
+    ('velocity_y', 'f8'),
+    ('health', 'f8'),
+    ('score', 'i8'),
+    ('last_shot_time', 'f8'),
+    ('bullets_hit_count', 'i8'),
+])
+BULLET_DTYPE = np.dtype([('x', 'f8'), ('y', 'f8'), ('angle', 'f8'), ('owner', 'i4')])
+ASTEROID_DTYPE = np.dtype([('x', 'f8'), ('y', 'f8'), ('radius', 'f8')])
+GOLD_DTYPE = np.dtype([('x', 'f8'), ('y', 'f8')])
+ACTION_DTYPE = np.dtype([('seq', 'u8'), ('action', 'i1')])
+
+NO_ACTION = 0  # Value written in an action slot when the brain returned None
+
+DEFAULT_RING_SIZE = 4
+DEFAULT_MAX_SHIPS = 16
+DEFAULT_MAX_BULLETS = 256
+DEFAULT_MAX_ASTEROIDS = 64
+DEFAULT_MAX_GOLD = 1024
+
+ACTION_TIMEOUT = 5.0   # Seconds the engine waits for a child before giving up on a tick
+SPIN_ITERATIONS = 100  # Busy-wait iterations (a few microseconds) before blocking on an Event
+
+
+def _align(offset, alignment=64):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+class SharedGameState:
+    """
+    Owner (engine side) or attachment (child side) of the shared state block.
+
+    Create it in the engine process with SharedGameState(), hand its `name` and
+    `capacities` to the children, and let them attach with SharedGameState.attach().
+    """
+
+    def __init__(self, ring_size=DEFAULT_RING_SIZE, max_ships=DEFAULT_MAX_SHIPS,
+                 max_bullets=DEFAULT_MAX_BULLETS, max_asteroids=DEFAULT_MAX_ASTEROIDS,
+                 max_gold=DEFAULT_MAX_GOLD, name=None):
+        self.ring_size = ring_size
+        self.max_ships = max_ships
+        self.max_bullets = max_bullets
+        self.max_asteroids = max_asteroids
+        self.max_gold = max_gold
+
+        layout = [
+            ('control', CONTROL_DTYPE, (1,)),
+            ('headers', HEADER_DTYPE, (ring_size,)),
+            ('ships', SHIP_DTYPE, (ring_size, max_ships)),
+            ('bullets', BULLET_DTYPE, (ring_size, max_bullets)),
+            ('asteroids', ASTEROID_DTYPE, (ring_size, max_asteroids)),
+            ('gold', GOLD_DTYPE, (ring_size, max_gold)),
+            ('brain_ships', np.dtype('i2'), (ring_size, max_ships)),
+            ('requests', np.dtype('u8'), (max_ships,)),
+            ('actions', ACTION_DTYPE, (max_ships,)),
+        ]
+        offsets = {}
+        size = 0
+        for field, dtype, shape in layout:
+            size = _align(size)
+            offsets[field] = size
+            size += dtype.itemsize * int(np.prod(shape))
+
+        self.is_owner = name is None
+        if self.is_owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        for field, dtype, shape in layout:
+            view = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offsets[field])
+            setattr(self, field, view)
+
+        if self.is_owner:
+            self.control[0] = (0, 0)
+            self.headers[:] = np.zeros(ring_size, dtype=HEADER_DTYPE)
+            self.brain_ships[:] = -1
+            self.requests[:] = 0
+            self.actions[:] = np.zeros(max_ships, dtype=ACTION_DTYPE)
+
+        # Brain indices handed out to RemoteBrains (engine side only)
+        self._brain_count = 0
+        # Brain index -> (wake-up, answered) Events, created by the engine and handed to each child
+        self.events = {}
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def capacities(self):
+        """Keyword arguments needed to attach to this block from another process."""
+        return {
+            'ring_size': self.ring_size,
+            'max_ships': self.max_ships,
+            'max_bullets': self.max_bullets,
+            'max_asteroids': self.max_asteroids,
+            'max_gold': self.max_gold,
+        }
+
+    @classmethod
+    def attach(cls, name, capacities):
+        return cls(name=name, **capacities)
+
+    @property
+    def latest_seq(self):
+        return int(self.control[0]['latest_seq'])
+
+    @property
+    def stopped(self):
+        return bool(self.control[0]['stop'])
+
+    def stop(self):
+        self.control[0]['stop'] = 1
+        for wake, _ in self.events.values():
+            wake.set()
+
+    # ============================
+    # Engine side
+    # ============================
+
+    def allocate_brain_index(self):
+        """Gives a new RemoteBrain its action slot, fixed for the life of its child process."""
+        if self._brain_count == self.max_ships:
+            raise ValueError(f"The shared state has room for {self.max_ships} remote brains.")
+        brain_index = self._brain_count
+        self.events[brain_index] = (mp.Event(), mp.Event())
+        self._brain_count += 1
+        return brain_index
+
+    def publish(self, game, brain_indices=None):
+        """
+        Copies the current state of a SpaceGame into the next ring slot, bumps the
+        sequence number and wakes the children that have to answer it. Entities
+        beyond the configured capacities are dropped.
+
+        Args:
+            brain_indices (list): Brain indices deciding on this state (default: all of them).
+
+        Returns:
+            int: The sequence number of the published slot.
+        """
+        if brain_indices is None:
+            brain_indices = range(self._brain_count)
+        seq = self.latest_seq + 1
+        slot = seq % self.ring_size
+        # Readers still on the previous use of this slot see it change (seqlock)
+        self.headers[slot]['seq'] = 0
+
+        ships = game.ships[:self.max_ships]
+        bullets = game.bullets[:self.max_bullets]
+        asteroids = game.asteroids[:self.max_asteroids]
+        gold = game.gold_positions[:self.max_gold]
+
+        index_by_ship = {id(ship): i for i, ship in enumerate(ships)}
+        # Where each remote brain finds its ship this tick (ships are shuffled per game)
+        brain_ships = self.brain_ships[slot]
+        brain_ships[:] = -1
+        for i, ship in enumerate(ships):
+            brain_index = getattr(ship.brain, 'brain_index', None)
+            if brain_index is not None:
+                brain_ships[brain_index] = i
+
+        n_ships = len(ships)
+        if n_ships:
+            self.ships[slot, :n_ships] = [
+                (ship.id.encode()[:SHIP_ID_LENGTH], ship.x, ship.y, ship.angle,
+                 ship.velocity_x, ship.velocity_y, ship.health, ship.score,
+                 ship.last_shot_time, ship.bullets_hit_count)
+                for ship in ships
+            ]
+        n_bullets = len(bullets)
+        if n_bullets:
+            self.bullets[slot, :n_bullets] = [
+                (bullet['x'], bullet['y'], bullet['angle'], index_by_ship.get(id(bullet['owner']), -1))
+                for bullet in bullets
+            ]
+        n_asteroids = len(asteroids)
+        if n_asteroids:
+            self.asteroids[slot, :n_asteroids] = [
+                (asteroid.x, asteroid.y, asteroid.radius) for asteroid in asteroids
+            ]
+        n_gold = len(gold)
+        if n_gold:
+            self.gold[slot, :n_gold] = gold
+
+        self.headers[slot] = (seq, game.game_time, n_ships, n_bullets, n_asteroids, n_gold)
+        # Publishing the sequence number last makes the slot visible to readers
+        self.control[0]['latest_seq'] = seq
+        for brain_index in brain_indices:
+            wake, answered = self.events[brain_index]
+            # Cleared before the request is visible, so the child's answer cannot be missed
+            answered.clear()
+            self.requests[brain_index] = seq
+            wake.set()
+        return seq
+
+    def wait_for_action(self, brain_index, seq, timeout=ACTION_TIMEOUT):
+        """
+        Waits until the child with `brain_index` has answered sequence `seq`.
+
+        Returns:
+            Action or None: The action written by the child, None on timeout or no action.
+        """
+        slot = self.actions[brain_index:brain_index + 1]
+        _, answered = self.events[brain_index]
+        deadline = None
+        spins = 0
+        while slot['seq'][0] < seq:
+            spins += 1
+            if spins > SPIN_ITERATIONS:
+                if deadline is None:
+                    deadline = time.monotonic() + timeout
+                # The child sets the event after writing its answer; the loop rechecks the slot after clear()
+                if not answered.wait(deadline - time.monotonic()):
+                    return None
+                answered.clear()
+        value = int(slot['action'][0])
+        return Action(value) if value != NO_ACTION else None
+
+    # ============================
+    # Child side
+    # ============================
+
+    def wait_for_request(self, brain_index, last_seq):
+        """
+        Blocks until the engine requests a decision newer than `last_seq` from `brain_index`,
+        or the block is stopped.
+
+        Returns:
+            int: The requested sequence number.
+        """
+        request = self.requests[brain_index:brain_index + 1]
+        wake, _ = self.events[brain_index]
+        spins = 0
+        while request[0] <= last_seq and not self.stopped:
+            spins += 1
+            if spins > SPIN_ITERATIONS:
+                # The engine sets the event after writing the request; the loop rechecks it after clear()
+                wake.wait(ACTION_TIMEOUT)
+                wake.clear()
+        return int(request[0])
+
+    def is_current(self, seq):
+        """False once the slot of `seq` was (or is being) overwritten by a newer publish."""
+        return int(self.headers[seq % self.ring_size]['seq']) == seq
+
+    def view(self, seq):
+        """
+        Zero-copy views on the records of a published slot.
+
+        Returns:
+            dict: header plus 'ships', 'bullets', 'asteroids' and 'gold' record arrays.
+        """
+        slot = seq % self.ring_size
+        header = self.headers[slot]
+        return {
+            'header': header,
+            'ships': self.ships[slot, :header['n_ships']],
+            'bullets': self.bullets[slot, :header['n_bullets']],
+            'asteroids': self.asteroids[slot, :header['n_asteroids']],
+            'gold': self.gold[slot, :header['n_gold']],
+        }
+
+    def ship_of(self, seq, brain_index):
+        """Index of the brain's ship in the records of a published slot, -1 if it is not playing."""
+        return int(self.brain_ships[seq % self.ring_size, brain_index])
+
+    def game_state(self, seq):
+        """Rebuilds a regular GameState from a published slot for brains that expect dicts."""
+        records = self.view(seq)
+        ship_ids = [ship_id.decode() for ship_id in records['ships']['id']]
+        ships_data = [{
+            'id': ship_ids[i],
+            'x': x,
+            'y': y,
+            'angle': angle,
+            'velocity_x': velocity_x,
+            'velocity_y': velocity_y,
+            'health': health,
+            'score': score,
+            'last_shot_time': last_shot_time,
+            'bullets_hit_count': bullets_hit_count
+        } for i, (_, x, y, angle, velocity_x, velocity_y, health, score, last_shot_time, bullets_hit_count)
+            in enumerate(records['ships'].tolist())]
+        bullets_data = [{
+            'x': x,
+            'y': y,
+            'angle': angle,
+            'owner_id': ship_ids[owner] if owner >= 0 else None
+        } for x, y, angle, owner in records['bullets'].tolist()]
+        asteroids_data = [{
+            'x': x,
+            'y': y,
+            'radius': radius
+        } for x, y, radius in records['asteroids'].tolist()]
+        return GameState(
+            ships=ships_data,
+            bullets=bullets_data,
+            gold_positions=records['gold'].tolist(),
+            asteroids=asteroids_data,
+            game_ticks=float(records['header']['game_ticks'])
+        )
+
+    def write_action(self, brain_index, seq, action):
+        value = action.value if isinstance(action, Action) else NO_ACTION
+        # Action first, then the sequence number the engine is waiting on
+        self.actions[brain_index]['action'] = value
+        self.actions[brain_index]['seq'] = seq
+        self.events[brain_index][1].set()
+
+    def close(self):
+        self.shm.close()
+        if self.is_owner:
+            self.shm.unlink()
+
+
+def _remote_brain_worker(brain_factory, shm_name, capacities, brain_index, events, conn):
+    """Child process loop: answer every decision requested by the engine with the brain's next action."""
+    shared = SharedGameState.attach(shm_name, capacities)
+    shared.events[brain_index] = events
+    brain = brain_factory()
+    conn.send(brain.id)
+    # Brains that understand the raw records skip the GameState rebuild entirely
+    decide_from_shared_state = getattr(brain, 'decide_from_shared_state', None)
+    last_seq = int(shared.requests[brain_index])
+    try:
+        while True:
+            seq = shared.wait_for_request(brain_index, last_seq)
+            # Game-complete notifications are the only messages sent over the pipe and
+            # are delivered before the next decision (or before shutting down)
+            while conn.poll():
+                final_state, won = conn.recv()
+                try:
+                    brain.on_game_complete(final_state, won)
+                except Exception as e:
+                    print(f"Error in brain '{brain.id}' on_game_complete: {e}")
+            if shared.stopped:
+                break
+            last_seq = seq
+            ship_index = shared.ship_of(seq, brain_index)
+            if ship_index < 0:
+                continue
+            try:
+                if decide_from_shared_state is not None:
+                    action = decide_from_shared_state(shared.view(seq), ship_index)
+                else:
+                    action = brain.decide_what_to_do_next(shared.game_state(seq))
+            except Exception as e:
+                print(f"Error processing action for brain '{brain.id}': {e}")
+                action = None
+            if not shared.is_current(seq):
+                continue  # The engine gave up on this request and reused the slot meanwhile
+            shared.write_action(brain_index, seq, action)
+    finally:
+        shared.close()
+        conn.close()
+
+
+class RemoteBrain(SpaceshipBrain):
+    """
+    Runs a brain in a child process that reads the state published by the engine.
+
+    Pass a SpaceGame the same SharedGameState as `shared_state`; the engine then
+    publishes the state once per tick on which remote brains decide, and this proxy
+    only waits for the child's answer. Remote brains see the state as published at
+    the start of the tick.
+
+    A brain may implement decide_from_shared_state(records, ship_index) to read the
+    zero-copy record views (see SharedGameState.view) instead of a rebuilt GameState.
+    """
+    reads_shared_state = True  # The engine does not build a GameState for this brain
+
+    def __init__(self, brain_factory, shared_state: SharedGameState):
+        self.shared_state = shared_state
+        self.brain_index = shared_state.allocate_brain_index()  # Action slot, and ship lookup of the child
+        self._conn, child_conn = mp.Pipe()
+        self.process = mp.Process(
+            target=_remote_brain_worker,
+            args=(brain_factory, shared_state.name, shared_state.capacities, self.brain_index,
+                  shared_state.events[self.brain_index], child_conn),
+            daemon=True
+        )
+        self.process.start()
+        self._id = self._conn.recv()
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    def decide_what_to_do_next(self, game_state: GameState) -> Action:
+        seq = self.shared_state.latest_seq
+        if self.shared_state.ship_of(seq, self.brain_index) < 0:
+            return None  # Ship not published (beyond max_ships)
+        return self.shared_state.wait_for_action(self.brain_index, seq)
+
+    def on_game_complete(self, final_state: GameState, won: bool):
+        self._conn.send((final_state, won))
+
+    def close(self):
+        """Stops the child process. Call shared_state.stop() first when closing many brains."""
+        self.shared_state.stop()
+        self.process.join(timeout=ACTION_TIMEOUT)
+        self._conn.close()
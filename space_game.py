@@ -1,14 +1,19 @@
 #space_game.py
-import pygame
 import os
 import importlib
 import inspect
 import math
 import random
+import time
 from brain_interface import SpaceshipBrain, Action, GameState
 import matplotlib.pyplot as plt  # Import matplotlib for plotting
 import numpy as np  # Import numpy for numerical operations
-from helpers import cached_hypot
+import geometry
+from spatial_index import SpatialIndex, UniformGrid
+from game_config import GameConfig, DEFAULT_CONFIG
+from training_stats import StatsWriter, GAME_FIELDS
+from events import (EventBuffer, SHOT_FIRED, BULLET_HIT, SHIP_DESTROYED, GOLD_COLLECTED, GOLD_SPAWNED, COLLISION,
+                    BONUS_AWARDED)
 
 SPECIFIC_BRAINS_TO_RUN = [] #['Q-Learner', 'Defensive']
 # Constants
@@ -16,55 +21,68 @@ TRAINING_MODE = False
 TRAINING_MODE_GAMES = 100000
 
 PLOT_UPDATE_INTERVAL = 1000
-NUMBER_OF_BRAINS_TO_RUN = 6
-SCREEN_WIDTH = 1500
-SCREEN_HEIGHT = 800
+GAME_STATS_FILE_TEMPLATE = 'game_stats-{timestamp}.bin'  # Training mode, one GAME_FIELDS record per ship per game
 
-BORDER_LEFT = 50
-BORDER_RIGHT = 350  # Wider right border
-BORDER_TOP = 50
-BORDER_BOTTOM = 50
+# Rules and physics live in game_config.GameConfig. These aliases of the defaults are kept
+# for code importing them; changing them has no effect on games
+NUMBER_OF_BRAINS_TO_RUN = DEFAULT_CONFIG.number_of_brains
+SCREEN_WIDTH = DEFAULT_CONFIG.screen_width
+SCREEN_HEIGHT = DEFAULT_CONFIG.screen_height
 
-GAME_WIDTH = SCREEN_WIDTH - BORDER_LEFT - BORDER_RIGHT
-GAME_HEIGHT = SCREEN_HEIGHT - BORDER_TOP - BORDER_BOTTOM
+BORDER_LEFT = DEFAULT_CONFIG.border_left
+BORDER_RIGHT = DEFAULT_CONFIG.border_right
+BORDER_TOP = DEFAULT_CONFIG.border_top
+BORDER_BOTTOM = DEFAULT_CONFIG.border_bottom
 
-FPS = 60
-FIXED_DT = 0.016  # Fixed delta time for training mode
+GAME_WIDTH = DEFAULT_CONFIG.arena_width
+GAME_HEIGHT = DEFAULT_CONFIG.arena_height
 
-MAX_TICK_COUNT = 5000
+FPS = DEFAULT_CONFIG.fps
+FIXED_DT = DEFAULT_CONFIG.fixed_dt
+DECISION_INTERVAL = DEFAULT_CONFIG.decision_interval
+COARSE_STEP_FACTOR = DEFAULT_CONFIG.time_step_factor
 
-ASTEROID_SPEED = 10
-MAX_VELOCITY = 170
-ACCELERATION = 50
-FRICTION = 0.98
-SHIP_BRAKE_FACTOR = 0.9  # Added brake factor
-NUMBER_OF_ASTEROIDS = 13
-HEALTH_FULL = 100
-HEALTH_BULLET_DAMAGE = 4
+MAX_TICK_COUNT = DEFAULT_CONFIG.max_tick_count
 
-GOLD_SPAWN_INTERVAL = 3000
-GOLD_VALUE = 15
-GOLD_SCATTER_FRACTION = 0.5  # Fraction of gold to scatter when ship is destroyed
+BROAD_PHASE_MIN_SHIPS = DEFAULT_CONFIG.broad_phase_min_ships
+BROAD_PHASE_CELL_SIZE = DEFAULT_CONFIG.broad_phase_cell_size
 
-LAST_SHIP_STANDING_MULTIPLIER_BONUS = 2  # Bonus for the last ship remaining
-BULLET_HIT_SCORE = 10  # Score gained when hitting another ship
-SHIP_DISTRUCTION_SCORE = 100  # Score gained when destroying another ship
-SHIP_DESTROYED_ALL_SHIPS_BONUS = 20
+ASTEROID_SPEED = DEFAULT_CONFIG.asteroid_speed
+MAX_VELOCITY = DEFAULT_CONFIG.max_velocity
+ACCELERATION = DEFAULT_CONFIG.acceleration
+FRICTION = DEFAULT_CONFIG.friction
+SHIP_BRAKE_FACTOR = DEFAULT_CONFIG.brake_factor
+NUMBER_OF_ASTEROIDS = DEFAULT_CONFIG.number_of_asteroids
+HEALTH_FULL = DEFAULT_CONFIG.health_full
+HEALTH_BULLET_DAMAGE = DEFAULT_CONFIG.bullet_damage
 
-GOLD_SCATTER_DISTANCE_MIN = 20
-GOLD_SCATTER_DISTANCE_MAX = 50
+GOLD_SPAWN_INTERVAL = DEFAULT_CONFIG.gold_spawn_interval
+GOLD_VALUE = DEFAULT_CONFIG.gold_value
+GOLD_SCATTER_FRACTION = DEFAULT_CONFIG.gold_scatter_fraction
 
-INITIAL_GOLD_COUNT = 60
+LAST_SHIP_STANDING_MULTIPLIER_BONUS = DEFAULT_CONFIG.last_ship_standing_multiplier
+BULLET_HIT_SCORE = DEFAULT_CONFIG.bullet_hit_score
+SHIP_DISTRUCTION_SCORE = DEFAULT_CONFIG.ship_destruction_score
+SHIP_DESTROYED_ALL_SHIPS_BONUS = DEFAULT_CONFIG.ship_destroyed_all_ships_bonus
 
-BULLET_SPEED = 300
-BULLET_COOLDOWN = 1000
-BULLET_SIZE = 3
+GOLD_SCATTER_DISTANCE_MIN = DEFAULT_CONFIG.gold_scatter_distance_min
+GOLD_SCATTER_DISTANCE_MAX = DEFAULT_CONFIG.gold_scatter_distance_max
 
-SHIP_TURN_SPEED = 120 
-SHIP_COLLISION_RADIUS = 20  # For collision detection
-SHIP_COLLISION_DISTANCE = 30  # Collision radius between ships
+INITIAL_GOLD_COUNT = DEFAULT_CONFIG.initial_gold_count
 
-SHIP_SIZE = 20  # For drawing
+BULLET_SPEED = DEFAULT_CONFIG.bullet_speed
+BULLET_COOLDOWN = DEFAULT_CONFIG.bullet_cooldown
+BULLET_SIZE = DEFAULT_CONFIG.bullet_size
+
+SHIP_TURN_SPEED = DEFAULT_CONFIG.turn_speed
+SHIP_COLLISION_RADIUS = DEFAULT_CONFIG.ship_collision_radius
+SHIP_COLLISION_DISTANCE = DEFAULT_CONFIG.ship_collision_distance
+
+SHIP_SIZE = DEFAULT_CONFIG.ship_size
+GOLD_SIZE = DEFAULT_CONFIG.gold_size
+ASTEROID_RADIUS = DEFAULT_CONFIG.asteroid_radius
+
+# Drawing
 SHIP_SIDE_OFFSET = 10
 SHIP_SIDE_ANGLE = 140
 
@@ -80,8 +98,6 @@ SHIP_BRAIN_ID_DISPLAY_OFFSET_Y = 20
 SHIP_DESTROYED_COLOR = (128, 128, 128)
 SHIP_ACTIVE_COLOR = (255, 255, 255)
 
-GOLD_SIZE = 5  # Radius when drawing gold
-
 BULLET_COLOR = (255, 100, 100)
 GOLD_COLOR = (255, 215, 0)
 
@@ -91,11 +107,9 @@ TRAINING_STATUS_INTERVAL = 100
 
 IS_CONSTANT_STARTING_POSITIONS = False  # Set to True to use constant starting positions
 
-ASTEROID_RADIUS = 35
-
 # New: Define the Asteroid class
 class Asteroid:
-    def __init__(self, x: float, y: float, velocity_x: float, velocity_y: float, radius: int = ASTEROID_RADIUS):
+    def __init__(self, x: float, y: float, velocity_x: float, velocity_y: float, radius: int = DEFAULT_CONFIG.asteroid_radius):
         self.x = x
         self.y = y
         self.velocity_x = velocity_x
@@ -117,12 +131,25 @@ class Asteroid:
         elif self.y > screen_height - border_bottom - self.radius:
             self.y = border_top + self.radius
 
+pygame = None  # Imported by load_pygame() for the display: training mode runs without it
+
+
+def load_pygame():
+    """Imports and initializes pygame on first use, so headless training never loads it."""
+    global pygame
+    if pygame is None:
+        import pygame as module
+        module.init()
+        pygame = module
+    return pygame
+
+
 class GameEnvironment:
-    def __init__(self, training_mode=False):
+    def __init__(self, training_mode=False, config: GameConfig = DEFAULT_CONFIG):
         if not training_mode:
-            pygame.init()
-            self.screen_width = SCREEN_WIDTH
-            self.screen_height = SCREEN_HEIGHT
+            load_pygame()
+            self.screen_width = config.screen_width
+            self.screen_height = config.screen_height
             self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
             self.font = pygame.font.Font(None, 36)
             
@@ -136,41 +163,132 @@ class GameEnvironment:
                 self.background = None
                 self.screen.fill((0, 0, 0))
         else:
-            # Minimal initialization for training mode
-            pygame.init()
+            # Minimal initialization for training mode (no pygame)
             self.screen = None
             self.font = None
             self.background = None
-            self.screen_width = SCREEN_WIDTH
-            self.screen_height = SCREEN_HEIGHT
+            self.screen_width = config.screen_width
+            self.screen_height = config.screen_height
         self.training_mode = training_mode
 
 class Spaceship:
-    def __init__(self, brain: SpaceshipBrain, x: float, y: float):
+    def __init__(self, brain: SpaceshipBrain, x: float, y: float, config: GameConfig = DEFAULT_CONFIG):
         self.brain = brain
         self.x = x
         self.y = y
+        self.prev_x = x  # Position at the start of the tick, for swept collision tests
+        self.prev_y = y
         self.velocity_x = 0
         self.velocity_y = 0
-        self.max_velocity = MAX_VELOCITY
-        self.acceleration = ACCELERATION
-        self.friction = FRICTION
+        self.max_velocity = config.max_velocity
+        self.acceleration = config.acceleration
         self.angle = 0
-        self.health = HEALTH_FULL
+        self.health = config.health_full
         self.score = 0
         self.gold_collected = 0
         self.id = brain.id
         self.last_shot_time = 0
         self.is_destroyed = False
         self.bullets_hit_count = 0  # New attribute to track bullet hits
+        self.kills = 0  # Ships destroyed by this ship's bullets
+        self.decision_interval = config.decision_interval
+        self.current_action = None  # Last decided action, repeated until the next decision
+        self.index = -1  # Position in SpaceGame.ships, used by the event records
+
+def discover_brain_classes(brains_dir="brains", defined_in_module_only=False):
+    """
+    Imports every module of the brains directory (in sorted file order) and returns
+    the SpaceshipBrain subclasses found in them as (name, class) pairs.
+
+    :param defined_in_module_only: Skip classes a module merely imports from elsewhere.
+    """
+    if not os.path.isdir(brains_dir):
+        print(f"Brains directory '{brains_dir}' not found.")
+        return []
+
+    brain_classes = []
+    for file in sorted(os.listdir(brains_dir)):
+        if file.endswith(".py"):
+            module_name = file[:-3]
+            try:
+                module = importlib.import_module(f"{brains_dir}.{module_name}")
+            except Exception as e:
+                print(f"Error importing module '{module_name}': {e}")
+                continue
+
+            # Find brain classes in the module
+            for name, obj in inspect.getmembers(module):
+                if (inspect.isclass(obj) and issubclass(obj, SpaceshipBrain) and obj != SpaceshipBrain and
+                        (not defined_in_module_only or obj.__module__ == module.__name__)):
+                    brain_classes.append((name, obj))
+    return brain_classes
+
+def seeded_starting_positions(seed, config: GameConfig = DEFAULT_CONFIG, mirrored=False):
+    """
+    Start positions of config.number_of_brains ships drawn from a seed (seed 42 is the
+    IS_CONSTANT_STARTING_POSITIONS layout).
+
+    :param mirrored: Reflect the positions through the center of the arena, the antithetic
+                     layout of the same seed.
+    """
+    rng = random.Random(seed)
+    left, top, right, bottom = config.ship_bounds  # Adjusted for the ship size
+    positions = [(rng.randint(left, right), rng.randint(top, bottom)) for _ in range(config.number_of_brains)]
+    if mirrored:
+        positions = [(left + right - x, top + bottom - y) for x, y in positions]
+    return positions
 
 class SpaceGame:
-    def __init__(self, environment: GameEnvironment, wins_per_brain: dict):
+    def __init__(self, environment: GameEnvironment, wins_per_brain: dict, brains=None, shared_state=None,
+                 decision_interval=None, time_step_factor=None, arena_size=None, num_asteroids=None,
+                 initial_gold=None, broad_phase=None, config: GameConfig = None, starting_positions=None,
+                 record_events=False):
+        """
+        :param config: game_config.GameConfig with the rules and physics (DEFAULT_CONFIG if omitted),
+                       also given to the brains as GameState.config. The keyword arguments below
+                       override the matching config fields.
+        :param brains: Optional list of brain instances to play with instead of loading them from 'brains/'.
+        :param shared_state: Optional shared_state.SharedGameState the state is published to on the decision
+                             ticks of brains running in other processes (see shared_state.RemoteBrain).
+        :param decision_interval: Ticks between two decisions of a brain, either an int for all brains
+                                  or a dict {brain_id: ticks} (missing ids use config.decision_interval).
+                                  Physics still advance every tick with the last action repeated.
+        :param time_step_factor: Training mode only. Multiplies config.fixed_dt (2-4 for cheap screening runs),
+                                 divides the tick budget accordingly and switches to swept collision
+                                 tests so fast bullets and ships cannot tunnel through each other.
+        :param arena_size: Optional (width, height) of the play area, for stress arenas in training mode
+                           (the window keeps its size in visual mode).
+        :param num_asteroids: Number of asteroids.
+        :param initial_gold: Gold pieces at the start.
+        :param broad_phase: Force grid broad phases for the collision checks on or off. By default they
+                            are used from config.broad_phase_min_ships ships on; small games keep the
+                            exact all-pairs loops.
+        :param starting_positions: Optional (x, y) start positions, one per ship in brain order (see
+                                   seeded_starting_positions), e.g. to play the same layout with every
+                                   individual of a training generation.
+        :param record_events: Collect the engine events of every tick (events.py) and give them to
+                              the brains as GameState.events. Also enabled by subscribe() and by
+                              brains with a true `reads_events` attribute; off, it costs nothing.
+        """
+        overrides = {}
+        if arena_size:
+            overrides['arena_width'], overrides['arena_height'] = arena_size
+        if num_asteroids is not None:
+            overrides['number_of_asteroids'] = num_asteroids
+        if initial_gold is not None:
+            overrides['initial_gold_count'] = initial_gold
+        if time_step_factor:
+            overrides['time_step_factor'] = time_step_factor
+        if not environment.training_mode:
+            overrides['time_step_factor'] = 1  # Coarse steps are a training mode feature
+        config = config or DEFAULT_CONFIG
+        self.config = config = config.replace(**overrides) if overrides else config
+
         self.screen = environment.screen
         self.font = environment.font
         self.background = environment.background
         self.training_mode = environment.training_mode
-        self.text_font = pygame.font.Font(None, 24)
+        self.text_font = pygame.font.Font(None, 24) if not self.training_mode else None  # Only used by draw()
         if not self.training_mode:
             self.clock = pygame.time.Clock()
         else:
@@ -181,105 +299,160 @@ class SpaceGame:
         self.bullets = []
         self.asteroids = []  # New: List to hold asteroids
         self.last_gold_spawn_time = 0  # Initialize to 0 for correct spawning
-        self.gold_spawn_interval = GOLD_SPAWN_INTERVAL
+        self.gold_spawn_interval = config.gold_spawn_interval
         self.tick_count = 0
         self.game_over = False
         self.wins_per_brain = wins_per_brain  # Reference to the shared wins counter
-
-        # Define constants for screen and game area dimensions
-        self.border_left = BORDER_LEFT
-        self.border_right = BORDER_RIGHT  # Wider right border
-        self.border_top = BORDER_TOP
-        self.border_bottom = BORDER_BOTTOM
-        self.screen_width = environment.screen_width
-        self.screen_height = environment.screen_height
-        self.game_width = GAME_WIDTH
-        self.game_height = GAME_HEIGHT
+        self.spatial_index = None  # Built with the first GameState of each tick
+        self.tick_state = None  # GameState lists of the current tick, patched as ships act
+        self.shared_state = shared_state
+        self.events = None  # EventBuffer being filled during the tick, None while events are off
+        self.last_events = None  # Events of the previous tick, given to the brains
+        self.subscribers = []
+
+        # Screen and game area dimensions
+        self.border_left = config.border_left
+        self.border_right = config.border_right  # Wider right border
+        self.border_top = config.border_top
+        self.border_bottom = config.border_bottom
+        self.screen_width = config.screen_width
+        self.screen_height = config.screen_height
+        self.game_width = config.arena_width
+        self.game_height = config.arena_height
         self.bonus_awarded = False  # Initialize the bonus flag
 
         # Initialize game_time to track elapsed game time in milliseconds
         self.game_time = 0
 
-        # Generate starting positions if constant starting positions are enabled
-        if IS_CONSTANT_STARTING_POSITIONS:
-            starting_pos_rng = random.Random(42)  # Fixed seed for consistency
-            self.starting_positions = [
-                (
-                    starting_pos_rng.randint(self.border_left + SHIP_SIZE, self.screen_width - self.border_right - SHIP_SIZE),  # Adjusted for SHIP_SIZE
-                    starting_pos_rng.randint(self.border_top + SHIP_SIZE, self.screen_height - self.border_bottom - SHIP_SIZE)   # Adjusted for SHIP_SIZE
-                )
-                for _ in range(NUMBER_OF_BRAINS_TO_RUN)
-            ]
+        # Coarse time steps: cooldowns and spawn intervals are in game milliseconds and friction
+        # is already applied per second, so only per-tick quantities need rescaling (see GameConfig)
+        self.time_step_factor = config.time_step_factor
+        self.fixed_dt = config.dt
+        self.max_tick_count = config.tick_budget
+        self.brake_factor = config.brake_factor_per_step
+        self.swept_collisions = config.swept_collisions
+
+        # Given starting positions, or constant ones if enabled
+        if starting_positions is not None:
+            self.starting_positions = list(starting_positions)
+        elif IS_CONSTANT_STARTING_POSITIONS:
+            self.starting_positions = seeded_starting_positions(42, config)  # Fixed seed for consistency
         else:
             self.starting_positions = None
 
-        self.load_brains()
-        self.spawn_initial_gold()
-        self.spawn_initial_asteroids()  # New: Spawn initial asteroids
+        if brains is not None:
+            self.add_brains(brains)
+        else:
+            self.load_brains()
+        for index, ship in enumerate(self.ships):
+            ship.index = index
+        if record_events or any(getattr(ship.brain, 'reads_events', False) for ship in self.ships):
+            self.enable_events()
+        self.set_decision_interval(decision_interval)
+        self.broad_phase = len(self.ships) >= config.broad_phase_min_ships if broad_phase is None else broad_phase
+        self.spawn_initial_gold(config.initial_gold_count)
+        self.spawn_initial_asteroids(config.number_of_asteroids)  # New: Spawn initial asteroids
 
     def load_brains(self):
-        brains_dir = "brains"
         starting_pos_index = 0  # Initialize index for starting positions
 
-        if not os.path.isdir(brains_dir):
-            print(f"Brains directory '{brains_dir}' not found.")
-            return
-
-        for file in sorted(os.listdir(brains_dir)):
-            if file.endswith(".py"):
-                module_name = file[:-3]
+        for name, obj in discover_brain_classes():
+            if len(self.ships) < self.config.number_of_brains:
                 try:
-                    module = importlib.import_module(f"brains.{module_name}")
+                    brain = obj()
                 except Exception as e:
-                    print(f"Error importing module '{module_name}': {e}")
+                    print(f"Error initializing brain '{name}': {e}")
                     continue
+                # Assign starting position
+                if SPECIFIC_BRAINS_TO_RUN and brain.id not in SPECIFIC_BRAINS_TO_RUN:
+                    continue
+                if self.starting_positions and starting_pos_index < len(self.starting_positions):
+                    x, y = self.starting_positions[starting_pos_index]
+                    starting_pos_index += 1
+                else:
+                    x, y = self.random_ship_position()
+                ship = Spaceship(brain, x=x, y=y, config=self.config)
+                self.ships.append(ship)
+        random.shuffle(self.ships)
 
-                # Find brain classes in the module
-                for name, obj in inspect.getmembers(module):
-                    if (len(self.ships) < NUMBER_OF_BRAINS_TO_RUN and inspect.isclass(obj) and
-                        issubclass(obj, SpaceshipBrain) and
-                            obj != SpaceshipBrain):
-                        try:
-                            brain = obj()
-                        except Exception as e:
-                            print(f"Error initializing brain '{name}': {e}")
-                            continue
-                        # Assign starting position
-                        if SPECIFIC_BRAINS_TO_RUN and brain.id not in SPECIFIC_BRAINS_TO_RUN:
-                            continue
-                        if IS_CONSTANT_STARTING_POSITIONS and self.starting_positions:
-                            x, y = self.starting_positions[starting_pos_index]
-                            starting_pos_index += 1
-                        else:
-                            x = random.randint(self.border_left + SHIP_SIZE, self.screen_width - self.border_right - SHIP_SIZE)  # Adjusted for SHIP_SIZE
-                            y = random.randint(self.border_top + SHIP_SIZE, self.screen_height - self.border_bottom - SHIP_SIZE)    # Adjusted for SHIP_SIZE
-                        ship = Spaceship(brain, x=x, y=y)
-                        self.ships.append(ship)
+    def add_brains(self, brains):
+        """Creates one ship per given brain instance, using the same placement rules as load_brains."""
+        for starting_pos_index, brain in enumerate(brains):
+            if self.starting_positions and starting_pos_index < len(self.starting_positions):
+                x, y = self.starting_positions[starting_pos_index]
+            else:
+                x, y = self.random_ship_position()
+            self.ships.append(Spaceship(brain, x=x, y=y, config=self.config))
         random.shuffle(self.ships)
 
-    def spawn_initial_asteroids(self, number_of_asteroids: int = NUMBER_OF_ASTEROIDS):
+    def enable_events(self):
+        if self.events is None:
+            self.events = EventBuffer()
+            self.last_events = EventBuffer()
+
+    def subscribe(self, callback):
+        """
+        Calls callback(events, game) after every tick with the events.EventBuffer of the tick
+        (reused afterwards: copy what must be kept).
+        """
+        self.enable_events()
+        self.subscribers.append(callback)
+
+    def publish_events(self):
+        for callback in self.subscribers:
+            callback(self.events, self)
+        self.events, self.last_events = self.last_events, self.events
+        self.events.clear()
+
+    def random_ship_position(self):
+        left, top, right, bottom = self.config.ship_bounds  # Adjusted for the ship size
+        return random.randint(left, right), random.randint(top, bottom)
+
+    def keep_in_arena(self, ship: Spaceship):
+        left, top, right, bottom = self.config.ship_bounds
+        ship.x = max(left, min(ship.x, right))
+        ship.y = max(top, min(ship.y, bottom))
+
+    def set_decision_interval(self, decision_interval):
+        for ship in self.ships:
+            if isinstance(decision_interval, dict):
+                interval = decision_interval.get(ship.id, self.config.decision_interval)
+            else:
+                interval = decision_interval or self.config.decision_interval
+            ship.decision_interval = max(1, int(interval))
+
+    def spawn_initial_asteroids(self, number_of_asteroids: int = None):
         """Spawn a fixed number of asteroids at the start of the game."""
+        config = self.config
+        if number_of_asteroids is None:
+            number_of_asteroids = config.number_of_asteroids
+        left, top, right, bottom = config.bounds
+        margin = config.asteroid_radius + config.ship_size  # Prevent spawning too close to borders
         for _ in range(number_of_asteroids):
-            x = random.randint(self.border_left + ASTEROID_RADIUS + SHIP_SIZE, self.screen_width - self.border_right - ASTEROID_RADIUS - SHIP_SIZE)  # Adjusted to prevent spawning too close to borders
-            y = random.randint(self.border_top + ASTEROID_RADIUS + SHIP_SIZE, self.screen_height - self.border_bottom - ASTEROID_RADIUS - SHIP_SIZE)  # Adjusted to prevent spawning too close to borders
+            x = random.randint(left + margin, right - margin)
+            y = random.randint(top + margin, bottom - margin)
             # Assign slow velocities
-            velocity_x = random.uniform(-ASTEROID_SPEED, ASTEROID_SPEED)  # Pixels per second
-            velocity_y = random.uniform(-ASTEROID_SPEED, ASTEROID_SPEED)  # Pixels per second
-            asteroid = Asteroid(x, y, velocity_x, velocity_y)
+            velocity_x = random.uniform(-config.asteroid_speed, config.asteroid_speed)  # Pixels per second
+            velocity_y = random.uniform(-config.asteroid_speed, config.asteroid_speed)  # Pixels per second
+            asteroid = Asteroid(x, y, velocity_x, velocity_y, config.asteroid_radius)
             self.asteroids.append(asteroid)
 
     def run(self):
         running = True
         while running:
             if self.training_mode:
-                dt = FIXED_DT  # Fixed time step (~60 FPS)
+                dt = self.fixed_dt  # Fixed time step (~60 FPS, larger in coarse-step mode)
             else:
-                dt = self.clock.tick(FPS) / 1000.0  # Delta time in seconds
+                dt = self.clock.tick(self.config.fps) / 1000.0  # Delta time in seconds
             
             # Update game_time based on dt
             self.game_time += dt * 1000  # Convert dt to milliseconds
 
             self.tick_count += 1
+            self.spatial_index = None
+            self.tick_state = None
+            if self.events is not None:
+                self.events.tick = self.tick_count
             # Determine current_time based on mode
             if self.training_mode:
                 current_time = self.game_time
@@ -299,15 +472,19 @@ class SpaceGame:
 
             # Check win conditions
             alive_ships = [ship for ship in self.ships if not ship.is_destroyed]
-            if self.tick_count >= MAX_TICK_COUNT or len(alive_ships) <= 1:
+            if self.tick_count >= self.max_tick_count or len(alive_ships) <= 1:
                 
-                #if (self.tick_count < MAX_TICK_COUNT):
+                #if (self.tick_count < self.max_tick_count):
                 #    print(f"Game ended before max ticks with {len(alive_ships)} alive ships after {self.tick_count} ticks.")
                 winner = self.get_winner()
                 if winner:
                     winnerId = winner.id
                     self.wins_per_brain[winnerId] = self.wins_per_brain.get(winnerId, 0) + 1
 
+                # Events of the last tick (e.g. its gold spawn), also seen by the final state
+                if self.events is not None:
+                    self.publish_events()
+
                 # Notify all brains about game completion
                 final_state = self.create_game_state(winner)
                 for ship in self.ships:
@@ -328,17 +505,38 @@ class SpaceGame:
             for asteroid in self.asteroids:
                 asteroid.update_position(dt, self.border_left, self.border_right, self.border_top, self.border_bottom, self.screen_width, self.screen_height)
 
-            for ship in self.ships:
+            # Publish the tick once for brains living in other processes, when some of them decide
+            if self.shared_state is not None:
+                deciding = [ship.brain.brain_index for ship in self.ships
+                            if not ship.is_destroyed and getattr(ship.brain, 'reads_shared_state', False)
+                            and (self.tick_count - 1) % ship.decision_interval == 0]
+                if deciding:
+                    self.shared_state.publish(self, deciding)
+
+            if self.swept_collisions:
+                for ship in self.ships:
+                    ship.prev_x = ship.x
+                    ship.prev_y = ship.y
+
+            for ship_index, ship in enumerate(self.ships):
                 if not ship.is_destroyed:
                     try:
-                        game_state = self.create_game_state(ship)
-                        action = ship.brain.decide_what_to_do_next(game_state)
-                        self.process_action(ship, action, dt, current_time)  # Pass current_time
+                        # Only build the state and ask the brain on decision ticks
+                        if (self.tick_count - 1) % ship.decision_interval == 0:
+                            if getattr(ship.brain, 'reads_shared_state', False):
+                                game_state = None
+                            else:
+                                game_state = self.create_game_state(ship)
+                            ship.current_action = ship.brain.decide_what_to_do_next(game_state)
+                        self.process_action(ship, ship.current_action, dt, current_time)  # Pass current_time
                     except Exception as e:
                         print(f"Error processing action for brain '{ship.id}': {e}")
+                    self.refresh_tick_state(ship_index)
 
             self.update_bullets(dt)
             self.check_collisions()
+            if self.events is not None:
+                self.publish_events()
 
             if not self.training_mode:
                 self.draw()
@@ -350,8 +548,9 @@ class SpaceGame:
 
 # In space_game.py
 
-    def create_game_state(self, current_ship: Spaceship) -> GameState:
-        ships_data = [{
+    @staticmethod
+    def ship_data(ship: Spaceship) -> dict:
+        return {
             'id': ship.id,
             'x': ship.x,
             'y': ship.y,
@@ -362,28 +561,72 @@ class SpaceGame:
             'score': ship.score,
             'last_shot_time': ship.last_shot_time,
             'bullets_hit_count': ship.bullets_hit_count  # Include hit count
-        } for ship in self.ships]
+        }
 
-        bullets_data = [{
+    @staticmethod
+    def bullet_data(bullet: dict) -> dict:
+        return {
             'x': bullet['x'],
             'y': bullet['y'],
             'angle': bullet['angle'],
             'owner_id': bullet['owner'].id
-        } for bullet in self.bullets]
+        }
+
+    def play_area_bounds(self):
+        """(left, top, right, bottom) of the play area."""
+        return (self.border_left, self.border_top,
+                self.screen_width - self.border_right, self.screen_height - self.border_bottom)
+
+    def refresh_tick_state(self, ship_index: int):
+        """
+        Brings the tick's state lists up to date after a ship acted: during the decision phase only
+        the acting ship changes and new bullets are appended, so nothing else needs rebuilding.
+        """
+        if self.tick_state is None:
+            return
+        ships_data, bullets_data, _ = self.tick_state
+        ships_data[ship_index] = self.ship_data(self.ships[ship_index])
+        for bullet in self.bullets[len(bullets_data):]:
+            bullets_data.append(self.bullet_data(bullet))
+        if self.spatial_index is not None:
+            # The index reads these lists: its ship and bullet grids are rebuilt on the next query
+            self.spatial_index.invalidate('ships', 'bullets')
 
-        # Include asteroids in the game state
-        asteroids_data = [{
-            'x': asteroid.x,
-            'y': asteroid.y,
-            'radius': asteroid.radius
-        } for asteroid in self.asteroids]
+    def create_game_state(self, current_ship: Spaceship) -> GameState:
+        # The dicts are built once per tick and patched by refresh_tick_state, so every state
+        # only costs a shallow copy of the lists instead of rebuilding all entities per ship
+        if self.tick_state is None:
+            self.tick_state = (
+                [self.ship_data(ship) for ship in self.ships],
+                [self.bullet_data(bullet) for bullet in self.bullets],
+                # Include asteroids in the game state
+                [{
+                    'x': asteroid.x,
+                    'y': asteroid.y,
+                    'radius': asteroid.radius
+                } for asteroid in self.asteroids]
+            )
+        # One spatial index per tick over the tick's own lists, which refresh_tick_state patches (and
+        # then invalidates the moved grids), so every state sees current positions and bullets; indices
+        # match the state's lists since ships keep their order and new bullets are appended
+        if self.spatial_index is None:
+            self.spatial_index = SpatialIndex(
+                *self.tick_state, self.gold_positions,
+                bounds=self.play_area_bounds(),
+                radii={'ships': self.config.ship_collision_radius, 'bullets': self.config.bullet_size,
+                       'gold': self.config.gold_size}
+            )
+        ships_data, bullets_data, asteroids_data = (list(data) for data in self.tick_state)
 
         return GameState(
             ships=ships_data,
             bullets=bullets_data,
             gold_positions=self.gold_positions,
             asteroids=asteroids_data,
-            game_ticks=self.game_time  # Ensure game_time is set correctly
+            game_ticks=self.game_time,  # Ensure game_time is set correctly
+            spatial_index=self.spatial_index,
+            config=self.config,
+            events=self.last_events
         )
 
 
@@ -419,69 +662,201 @@ class SpaceGame:
             pygame.display.flip()
 
 
-    def check_collisions(self):
-        # Check bullet hits
-        for bullet in self.bullets[:]:
+    def bullet_hit_ship(self, bullet, ship):
+        config = self.config
+        ship.health -= config.bullet_damage
+        bullet['removed'] = True  # Dropped from self.bullets by compact_bullets after the checks
+        bullet['owner'].score += config.bullet_hit_score
+        bullet['owner'].bullets_hit_count += 1  # Increment hit counter
+        events = self.events
+        if events is not None:
+            events.emit(BULLET_HIT, bullet['owner'].index, ship.index, config.bullet_damage, bullet['x'], bullet['y'])
+
+        if ship.health <= 0 and not ship.is_destroyed:
+            bullet['owner'].score += config.ship_destruction_score
+            bullet['owner'].kills += 1
+            ship.is_destroyed = True
+            if events is not None:
+                events.emit(SHIP_DESTROYED, ship.index, bullet['owner'].index, config.ship_destruction_score,
+                            ship.x, ship.y)
+            self.scatter_gold(ship)
+
+            # Award to all living ships if a ship is destroyed
+            for other_ship in self.ships:
+                if not other_ship.is_destroyed:
+                    other_ship.score += config.ship_destroyed_all_ships_bonus
+                    if events is not None:
+                        events.emit(BONUS_AWARDED, other_ship.index, ship.index, config.ship_destroyed_all_ships_bonus,
+                                    other_ship.x, other_ship.y)
+
+            # Check if only one ship remains after this destruction
+            alive_ships = [s for s in self.ships if not s.is_destroyed]
+            if len(alive_ships) == 1 and not self.bonus_awarded:
+                surviving_ship = alive_ships[0]
+                score_before = surviving_ship.score
+                surviving_ship.score *= config.last_ship_standing_multiplier  # Award bonus
+                self.bonus_awarded = True  # Ensure bonus is only awarded once
+                if events is not None:
+                    events.emit(BONUS_AWARDED, surviving_ship.index, -1, surviving_ship.score - score_before,
+                                surviving_ship.x, surviving_ship.y)
+                #print(f"Bonus awarded to Ship {surviving_ship.id} for being the last ship remaining.")
+
+    def compact_bullets(self):
+        # One pass instead of a list.remove per hit, which is quadratic with thousands of bullets
+        self.bullets = [bullet for bullet in self.bullets if not bullet['removed']]
+
+    # ============================
+    # Collision broad phase
+    # ============================
+
+    def broad_phase_grid(self, xs, ys):
+        """Grid over the given positions for the collision checks, or None when the game is small enough for all-pairs loops."""
+        if not self.broad_phase or not len(xs):
+            return None
+        return UniformGrid(xs, ys, *self.play_area_bounds(), cell_size=self.config.broad_phase_cell_size)
+
+    @staticmethod
+    def nearby(grid, count, x0, y0, x1, y1, reach):
+        """
+        Indices, in ascending order, of the entities that may lie within `reach` of the segment
+        (x0, y0)-(x1, y1). Without a grid every index is returned, so both paths visit candidates
+        in the same order and only differ in how many are skipped.
+        """
+        if grid is None:
+            return range(count)
+        indices = grid.in_box(min(x0, x1) - reach, min(y0, y1) - reach, max(x0, x1) + reach, max(y0, y1) + reach)
+        return np.sort(indices).tolist()
+
+    def max_asteroid_radius(self):
+        return max((asteroid.radius for asteroid in self.asteroids), default=0)
+
+    def check_bullet_hits(self, ship_grid=None, asteroid_grid=None):
+        radius = self.config.ship_collision_radius
+        radius_sq = self.config.ship_collision_radius_sq
+        max_radius = self.max_asteroid_radius()
+        for bullet in self.bullets:
+            bx, by = bullet['x'], bullet['y']
             # Check collision with ships
-            for ship in self.ships:
+            for i in self.nearby(ship_grid, len(self.ships), bx, by, bx, by, radius):
+                ship = self.ships[i]
                 if ship is not bullet['owner'] and not ship.is_destroyed:
-                    if math.dist((bullet['x'], bullet['y']), (ship.x, ship.y)) < SHIP_COLLISION_RADIUS:
-                        ship.health -= HEALTH_BULLET_DAMAGE
-                        if bullet in self.bullets:
-                            self.bullets.remove(bullet)
-                        bullet['owner'].score += BULLET_HIT_SCORE
-                        bullet['owner'].bullets_hit_count += 1  # Increment hit counter
-
-                        if ship.health <= 0 and not ship.is_destroyed:
-                            bullet['owner'].score += SHIP_DISTRUCTION_SCORE
-                            ship.is_destroyed = True
-                            self.scatter_gold(ship)
-
-                            # Award to all living ships if a ship is destroyed
-                            for other_ship in self.ships:
-                                if not other_ship.is_destroyed:
-                                    other_ship.score += SHIP_DESTROYED_ALL_SHIPS_BONUS
-
-                            # Check if only one ship remains after this destruction
-                            alive_ships = [s for s in self.ships if not s.is_destroyed]
-                            if len(alive_ships) == 1 and not self.bonus_awarded:
-                                surviving_ship = alive_ships[0]
-                                surviving_ship.score *= LAST_SHIP_STANDING_MULTIPLIER_BONUS  # Award bonus
-                                self.bonus_awarded = True  # Ensure bonus is only awarded once
-                                #print(f"Bonus awarded to Ship {surviving_ship.id} for being the last ship remaining.")
+                    dx = bx - ship.x
+                    dy = by - ship.y
+                    if dx * dx + dy * dy < radius_sq:
+                        self.bullet_hit_ship(bullet, ship)
 
             # New: Check collision with asteroids
-            for asteroid in self.asteroids:
-                if math.dist((bullet['x'], bullet['y']), (asteroid.x, asteroid.y)) < asteroid.radius:
-                    if bullet in self.bullets:
-                        self.bullets.remove(bullet)
+            for i in self.nearby(asteroid_grid, len(self.asteroids), bx, by, bx, by, max_radius):
+                asteroid = self.asteroids[i]
+                if geometry.distance(bx, by, asteroid.x, asteroid.y) < asteroid.radius:
+                    bullet['removed'] = True
                     break  # Bullet destroyed, no need to check other asteroids
+        self.compact_bullets()
+
+    def check_bullet_hits_swept(self, ship_grid=None, asteroid_grid=None):
+        """
+        Coarse-step bullet checks: each bullet's path over the tick is tested against the
+        ships' paths (relative motion) and the asteroids, and only the earliest contact counts.
+        """
+        radius = self.config.ship_collision_radius
+        max_radius = self.max_asteroid_radius()
+        # The ship grid holds end-of-tick positions, so widen the search by the furthest any ship moved
+        ship_reach = radius + max((geometry.distance(ship.prev_x, ship.prev_y, ship.x, ship.y)
+                                                  for ship in self.ships), default=0)
+        for bullet in self.bullets:
+            x0, y0, x1, y1 = bullet['prev_x'], bullet['prev_y'], bullet['x'], bullet['y']
+            first_t = None
+            first_ship = None
+            for i in self.nearby(ship_grid, len(self.ships), x0, y0, x1, y1, ship_reach):
+                ship = self.ships[i]
+                if ship is not bullet['owner'] and not ship.is_destroyed:
+                    t = geometry.segment_circle_contact(x0 - ship.prev_x, y0 - ship.prev_y, x1 - ship.x, y1 - ship.y,
+                                               0, 0, radius)
+                    if t is not None and (first_t is None or t < first_t):
+                        first_t, first_ship = t, ship
+            for i in self.nearby(asteroid_grid, len(self.asteroids), x0, y0, x1, y1, max_radius):
+                asteroid = self.asteroids[i]
+                t = geometry.segment_circle_contact(x0, y0, x1, y1, asteroid.x, asteroid.y, asteroid.radius)
+                if t is not None and (first_t is None or t < first_t):
+                    first_t, first_ship = t, None
+            if first_t is None:
+                continue
+            if first_ship is not None:
+                self.bullet_hit_ship(bullet, first_ship)
+            else:
+                bullet['removed'] = True
+        self.compact_bullets()
 
-        # Check gold collection
-        for ship in self.ships:
-            if not ship.is_destroyed:
-                for gold_pos in self.gold_positions[:]:
-                    if math.dist((ship.x, ship.y), gold_pos) < SHIP_COLLISION_RADIUS:
-                        self.gold_positions.remove(gold_pos)
-                        ship.score += GOLD_VALUE
-                        ship.gold_collected += 1
-
-        # Check collisions between ships
+    def check_collisions(self):
+        # Asteroids do not move during the checks, so one grid serves bullets and ships
+        asteroid_grid = self.broad_phase_grid([asteroid.x for asteroid in self.asteroids],
+                                              [asteroid.y for asteroid in self.asteroids])
+        ship_grid = self.broad_phase_grid([ship.x for ship in self.ships], [ship.y for ship in self.ships])
+
+        # Check bullet hits
+        if self.swept_collisions:
+            self.check_bullet_hits_swept(ship_grid, asteroid_grid)
+            self.remove_escaped_bullets()
+        else:
+            self.check_bullet_hits(ship_grid, asteroid_grid)
+
+        # Check gold collection (all gold against one ship at a time, in ship order)
+        radius = self.config.ship_collision_radius
+        if self.gold_positions:
+            gold_xy = np.asarray(self.gold_positions, dtype=float)
+            gold_grid = self.broad_phase_grid(gold_xy[:, 0], gold_xy[:, 1])
+            collected = np.zeros(len(gold_xy), dtype=bool)
+            all_gold = np.arange(len(gold_xy))
+            for ship in self.ships:
+                if not ship.is_destroyed:
+                    x0, y0 = (ship.prev_x, ship.prev_y) if self.swept_collisions else (ship.x, ship.y)
+                    if gold_grid is None:
+                        candidates = all_gold
+                    else:
+                        candidates = np.asarray(self.nearby(gold_grid, len(gold_xy), x0, y0, ship.x, ship.y,
+                                                            radius), dtype=int)
+                    gold_x, gold_y = gold_xy[candidates, 0], gold_xy[candidates, 1]
+                    if self.swept_collisions:
+                        # Gold swept over during the tick is collected too
+                        hits = ~np.isnan(geometry.segment_circle_contacts(x0, y0, ship.x, ship.y,
+                                                                         gold_x, gold_y, radius))
+                    else:
+                        hits = (gold_x - ship.x) ** 2 + (gold_y - ship.y) ** 2 < self.config.ship_collision_radius_sq
+                    # Only the candidate indices are touched, not the whole gold array
+                    touched = candidates[hits]
+                    touched = touched[~collected[touched]]
+                    count = len(touched)
+                    if count:
+                        collected[touched] = True
+                        ship.score += self.config.gold_value * count
+                        ship.gold_collected += count
+                        if self.events is not None:
+                            self.events.emit(GOLD_COLLECTED, ship.index, -1, count, ship.x, ship.y)
+            if collected.any():
+                # Keep the list object itself, GameStates hold a reference to it
+                self.gold_positions[:] = [gold_pos for gold_pos, taken in zip(self.gold_positions, collected) if not taken]
+
+        # Check collisions between ships. The grid holds the positions before any push; the extra
+        # reach covers ships moved by earlier pushes of this pass
+        collision_distance = self.config.ship_collision_distance
         for i in range(len(self.ships)):
             ship_a = self.ships[i]
             if ship_a.is_destroyed:
                 continue
-            for j in range(i + 1, len(self.ships)):
+            for j in self.nearby(ship_grid, len(self.ships), ship_a.x, ship_a.y, ship_a.x, ship_a.y,
+                                 2 * collision_distance):
+                if j <= i:
+                    continue
                 ship_b = self.ships[j]
                 if ship_b.is_destroyed:
                     continue
                 # Check if ships are colliding
                 dx = ship_b.x - ship_a.x
                 dy = ship_b.y - ship_a.y
-                distance = cached_hypot(dx, dy)
-                if distance < SHIP_COLLISION_DISTANCE:
+                if dx * dx + dy * dy < self.config.ship_collision_distance_sq:
                     # Ships are colliding, resolve collision
-                    overlap = SHIP_COLLISION_DISTANCE - distance
+                    distance = math.hypot(dx, dy)
+                    overlap = collision_distance - distance
                     if distance == 0:
                         # Ships are in the same position; choose random direction
                         angle = random.uniform(0, 2 * math.pi)
@@ -490,28 +865,40 @@ class SpaceGame:
                     else:
                         dx /= distance
                         dy /= distance
+                    if self.events is not None:
+                        self.events.emit(COLLISION, ship_a.index, ship_b.index, overlap, ship_a.x, ship_a.y)
                     # Move ships apart equally
                     ship_a.x -= dx * overlap / 2
                     ship_a.y -= dy * overlap / 2
                     ship_b.x += dx * overlap / 2
                     ship_b.y += dy * overlap / 2
 
-                    # Ensure ships are within bounds considering SHIP_SIZE
-                    ship_a.x = max(self.border_left + SHIP_SIZE, min(ship_a.x, self.screen_width - self.border_right - SHIP_SIZE))
-                    ship_a.y = max(self.border_top + SHIP_SIZE, min(ship_a.y, self.screen_height - self.border_bottom - SHIP_SIZE))
-                    ship_b.x = max(self.border_left + SHIP_SIZE, min(ship_b.x, self.screen_width - self.border_right - SHIP_SIZE))
-                    ship_b.y = max(self.border_top + SHIP_SIZE, min(ship_b.y, self.screen_height - self.border_bottom - SHIP_SIZE))
+                    # Ensure ships are within bounds considering the ship size
+                    self.keep_in_arena(ship_a)
+                    self.keep_in_arena(ship_b)
 
         # New: Check collisions between ships and asteroids
+        radius = self.config.ship_collision_radius
+        asteroid_reach = radius + self.max_asteroid_radius()
         for ship in self.ships:
             if ship.is_destroyed:
                 continue
-            for asteroid in self.asteroids:
-                distance = math.dist((ship.x, ship.y), (asteroid.x, asteroid.y))
-                if distance < SHIP_COLLISION_RADIUS + asteroid.radius:
+            x0, y0 = (ship.prev_x, ship.prev_y) if self.swept_collisions else (ship.x, ship.y)
+            # Pushes out of one asteroid move the ship by less than the reach, so the candidates stay valid
+            for i in self.nearby(asteroid_grid, len(self.asteroids), x0, y0, ship.x, ship.y, 2 * asteroid_reach):
+                asteroid = self.asteroids[i]
+                if self.swept_collisions:
+                    # Stop a ship that crossed the asteroid's edge during the tick at the contact point
+                    t = geometry.segment_circle_contact(ship.prev_x, ship.prev_y, ship.x, ship.y,
+                                               asteroid.x, asteroid.y, radius + asteroid.radius)
+                    if t is not None and t > 0:
+                        ship.x = ship.prev_x + (ship.x - ship.prev_x) * t
+                        ship.y = ship.prev_y + (ship.y - ship.prev_y) * t
+                distance = geometry.distance(ship.x, ship.y, asteroid.x, asteroid.y)
+                if distance < radius + asteroid.radius:
                     
                     # Optional: Adjust ship's position to prevent overlapping
-                    overlap = SHIP_COLLISION_RADIUS + asteroid.radius - distance
+                    overlap = radius + asteroid.radius - distance
                     if distance == 0:
                         # Ships are in the same position as asteroid; choose random direction
                         angle = random.uniform(0, 2 * math.pi)
@@ -520,45 +907,57 @@ class SpaceGame:
                     else:
                         dx = (ship.x - asteroid.x) / distance
                         dy = (ship.y - asteroid.y) / distance
+                    if self.events is not None:
+                        self.events.emit(COLLISION, ship.index, -1, overlap, ship.x, ship.y)
                     # Move the ship out of collision
                     ship.x += dx * overlap
                     ship.y += dy * overlap
 
-                    # Ensure ship is within bounds considering SHIP_SIZE
-                    ship.x = max(self.border_left + SHIP_SIZE, min(ship.x, self.screen_width - self.border_right - SHIP_SIZE))
-                    ship.y = max(self.border_top + SHIP_SIZE, min(ship.y, self.screen_height - self.border_bottom - SHIP_SIZE))
+                    # Ensure ships are within bounds considering the ship size
+                    self.keep_in_arena(ship)
                     
                     # Since asteroid should not move, we do not alter its position or velocity
                     # If multiple collisions occur, additional handling might be necessary
 
     def spawn_gold(self):
-        x = random.randint(self.border_left + GOLD_SIZE, self.screen_width - self.border_right - GOLD_SIZE)  # Adjusted for GOLD_SIZE
-        y = random.randint(self.border_top + GOLD_SIZE, self.screen_height - self.border_bottom - GOLD_SIZE)    # Adjusted for GOLD_SIZE
+        left, top, right, bottom = self.config.gold_bounds  # Adjusted for the gold size
+        x = random.randint(left, right)
+        y = random.randint(top, bottom)
         self.gold_positions.append((x, y))
+        if self.events is not None:
+            self.events.emit(GOLD_SPAWNED, -1, -1, 1, x, y)
 
-    def spawn_initial_gold(self):
-        for _ in range(INITIAL_GOLD_COUNT):
+    def spawn_initial_gold(self, count: int = None):
+        for _ in range(self.config.initial_gold_count if count is None else count):
             self.spawn_gold()
 
     def update_bullets(self, dt):
-        for bullet in self.bullets[:]:  # Create copy to safely remove bullets
+        for bullet in self.bullets:
+            bullet['prev_x'] = bullet['x']
+            bullet['prev_y'] = bullet['y']
             bullet['x'] += bullet['speed'] * math.cos(math.radians(bullet['angle'])) * dt
             bullet['y'] += bullet['speed'] * math.sin(math.radians(bullet['angle'])) * dt
 
-            # Remove bullets that enter the border area considering BULLET_SIZE
-            if (bullet['x'] < self.border_left - BULLET_SIZE or bullet['x'] > self.screen_width - self.border_right + BULLET_SIZE or
-                bullet['y'] < self.border_top - BULLET_SIZE or bullet['y'] > self.screen_height - self.border_bottom + BULLET_SIZE):
-                self.bullets.remove(bullet)
+        # With swept collisions a bullet leaving the arena may still hit something on its way out,
+        # so escaped bullets are removed after the collision checks instead
+        if not self.swept_collisions:
+            self.remove_escaped_bullets()
+
+    def remove_escaped_bullets(self):
+        # Remove bullets that enter the border area considering the bullet size
+        left, top, right, bottom = self.config.bullet_bounds
+        self.bullets = [bullet for bullet in self.bullets
+                        if left <= bullet['x'] <= right and top <= bullet['y'] <= bottom]
 
     def process_action(self, ship: Spaceship, action: Action, dt: float, current_time: float):
         if ship.is_destroyed or ship.health <= 0:
             return
 
         if action == Action.ROTATE_RIGHT:
-            ship.angle += SHIP_TURN_SPEED * dt  # Adjusted rotation speed
+            ship.angle += self.config.turn_speed * dt  # Adjusted rotation speed
             ship.angle %= 360       # Normalize angle
         elif action == Action.ROTATE_LEFT:
-            ship.angle -= SHIP_TURN_SPEED * dt  # Adjusted rotation speed
+            ship.angle -= self.config.turn_speed * dt  # Adjusted rotation speed
             ship.angle %= 360       # Normalize angle
         elif action == Action.ACCELERATE:
             # Add acceleration
@@ -572,29 +971,32 @@ class SpaceGame:
                 ship.velocity_y = (ship.velocity_y / speed) * ship.max_velocity
         elif action == Action.SHOOT:
             # Check shooting cooldown
-            if current_time - ship.last_shot_time >= BULLET_COOLDOWN:
+            if current_time - ship.last_shot_time >= self.config.bullet_cooldown:
                 bullet = {
-                    'x': ship.x + SHIP_SIZE * math.cos(math.radians(ship.angle)),
-                    'y': ship.y + SHIP_SIZE * math.sin(math.radians(ship.angle)),
+                    'x': ship.x + self.config.ship_size * math.cos(math.radians(ship.angle)),
+                    'y': ship.y + self.config.ship_size * math.sin(math.radians(ship.angle)),
                     'angle': ship.angle,
-                    'speed': BULLET_SPEED,
-                    'owner': ship
+                    'speed': self.config.bullet_speed,
+                    'owner': ship,
+                    'removed': False
                 }
                 self.bullets.append(bullet)
                 ship.last_shot_time = current_time
+                if self.events is not None:
+                    self.events.emit(SHOT_FIRED, ship.index, -1, 0, bullet['x'], bullet['y'])
         elif action == Action.BRAKE:
-            ship.velocity_x *= SHIP_BRAKE_FACTOR
-            ship.velocity_y *= SHIP_BRAKE_FACTOR
+            ship.velocity_x *= self.brake_factor
+            ship.velocity_y *= self.brake_factor
 
         # Apply velocity and friction
-        ship.velocity_x *= ship.friction ** dt  # Adjusted for delta time
-        ship.velocity_y *= ship.friction ** dt  # Adjusted for delta time
+        friction = self.config.friction_factor(dt)  # Adjusted for delta time
+        ship.velocity_x *= friction
+        ship.velocity_y *= friction
         ship.x += ship.velocity_x * dt
         ship.y += ship.velocity_y * dt
 
-        # Keep ships within game area bounds considering SHIP_SIZE
-        ship.x = max(self.border_left + SHIP_SIZE, min(ship.x, self.screen_width - self.border_right - SHIP_SIZE))
-        ship.y = max(self.border_top + SHIP_SIZE, min(ship.y, self.screen_height - self.border_bottom - SHIP_SIZE))
+        # Keep ships within game area bounds considering the ship size
+        self.keep_in_arena(ship)
 
         # Optional: Add assertions to catch NaN values
         assert not math.isnan(ship.angle), "ship.angle is NaN"
@@ -604,17 +1006,21 @@ class SpaceGame:
         assert not math.isnan(ship.velocity_y), "ship.velocity_y is NaN"
 
     def scatter_gold(self, ship: Spaceship):
-        gold_to_scatter = int(ship.gold_collected * GOLD_SCATTER_FRACTION)  # Scatter 50% of collected gold
+        config = self.config
+        left, top, right, bottom = config.gold_bounds
+        gold_to_scatter = int(ship.gold_collected * config.gold_scatter_fraction)  # Scatter 50% of collected gold
         for _ in range(gold_to_scatter):
-            scatter_distance = random.randint(GOLD_SCATTER_DISTANCE_MIN, GOLD_SCATTER_DISTANCE_MAX)
+            scatter_distance = random.randint(config.gold_scatter_distance_min, config.gold_scatter_distance_max)
             scatter_angle = random.uniform(0, 360)
             x = ship.x + scatter_distance * math.cos(math.radians(scatter_angle))
             y = ship.y + scatter_distance * math.sin(math.radians(scatter_angle))
 
-            # Keep gold within game area bounds considering GOLD_SIZE
-            x = max(self.border_left + GOLD_SIZE, min(x, self.screen_width - self.border_right - GOLD_SIZE))
-            y = max(self.border_top + GOLD_SIZE, min(y, self.screen_height - self.border_bottom - GOLD_SIZE))
+            # Keep gold within game area bounds considering the gold size
+            x = max(left, min(x, right))
+            y = max(top, min(y, bottom))
             self.gold_positions.append((x, y))
+            if self.events is not None:
+                self.events.emit(GOLD_SPAWNED, ship.index, -1, 1, x, y)
 
         ship.gold_collected //= 2  # Reduce collected gold by 50%
 
@@ -666,8 +1072,8 @@ class SpaceGame:
 
             # Draw spaceship triangle
             ship_points = [
-                (ship.x + SHIP_SIZE * math.cos(math.radians(ship.angle)),
-                 ship.y + SHIP_SIZE * math.sin(math.radians(ship.angle))),
+                (ship.x + self.config.ship_size * math.cos(math.radians(ship.angle)),
+                 ship.y + self.config.ship_size * math.sin(math.radians(ship.angle))),
                 (ship.x + SHIP_SIDE_OFFSET * math.cos(math.radians(ship.angle + SHIP_SIDE_ANGLE)),
                  ship.y + SHIP_SIDE_OFFSET * math.sin(math.radians(ship.angle + SHIP_SIDE_ANGLE))),
                 (ship.x + SHIP_SIDE_OFFSET * math.cos(math.radians(ship.angle - SHIP_SIDE_ANGLE)),
@@ -676,7 +1082,7 @@ class SpaceGame:
             pygame.draw.polygon(self.screen, ship_color, ship_points)
 
             # Draw health bar (even for destroyed ships)
-            health_width = SHIP_HEALTH_BAR_WIDTH * (ship.health / HEALTH_FULL)
+            health_width = SHIP_HEALTH_BAR_WIDTH * (ship.health / self.config.health_full)
             pygame.draw.rect(self.screen, (255, 0, 0),
                              (ship.x - SHIP_HEALTH_BAR_WIDTH / 2, ship.y - 30, SHIP_HEALTH_BAR_WIDTH, SHIP_HEALTH_BAR_HEIGHT))
             pygame.draw.rect(self.screen, (0, 255, 0),
@@ -708,13 +1114,13 @@ class SpaceGame:
         # Draw gold pieces
         for gold_pos in self.gold_positions:
             pygame.draw.circle(self.screen, GOLD_COLOR,
-                               (int(gold_pos[0]), int(gold_pos[1])), GOLD_SIZE)
+                               (int(gold_pos[0]), int(gold_pos[1])), self.config.gold_size)
 
 
         # Draw bullets
         for bullet in self.bullets:
             pygame.draw.circle(self.screen, BULLET_COLOR,
-                               (int(bullet['x']), int(bullet['y'])), BULLET_SIZE)
+                               (int(bullet['x']), int(bullet['y'])), self.config.bullet_size)
 
         # Draw leaderboard in the right border area
         leaderboard_x = self.screen_width - self.border_right + 10
@@ -740,7 +1146,7 @@ class SpaceGame:
             self.screen.blit(fps_text, (10, 10))
             
             # Add ticks remaining counter
-            ticks_remaining = MAX_TICK_COUNT - self.tick_count
+            ticks_remaining = self.max_tick_count - self.tick_count
             ticks_text = self.font.render(f"Ticks remaining: {ticks_remaining}", True, (255, 255, 255))
             self.screen.blit(ticks_text, (150, 10))
 
@@ -863,8 +1269,12 @@ def update_plot(fig, ax_wins, ax_scores, ax_ticks, plot_x, plot_history_wins, pl
     fig.canvas.flush_events()
 
 # Main function to run the games
-def main(training_mode=False, num_games=1):
-    environment = GameEnvironment(training_mode)
+def main(training_mode=False, num_games=1, decision_interval=None, config=None, stats_file=None):
+    environment = GameEnvironment(training_mode, config=config or DEFAULT_CONFIG)
+    stats = None
+    if training_mode:
+        stats_file = stats_file or GAME_STATS_FILE_TEMPLATE.format(timestamp=time.strftime("%Y%m%d-%H%M%S"))
+        stats = StatsWriter(stats_file, GAME_FIELDS)
     wins_per_brain = {}
     game_winners = []  # List to track the winner of each game
     game_scores = []    # List to track scores of all brains per game
@@ -882,7 +1292,7 @@ def main(training_mode=False, num_games=1):
         fig.show()
 
     for game_num in range(num_games):
-        game = SpaceGame(environment, wins_per_brain)
+        game = SpaceGame(environment, wins_per_brain, decision_interval=decision_interval, config=config)
         winner = game.run()
 
         # Collect winner information
@@ -899,6 +1309,11 @@ def main(training_mode=False, num_games=1):
         # Collect tick count of the game
         game_ticks.append(game.tick_count)
 
+        if stats:
+            for ship in game.ships:
+                stats.append(game_num, ship.id.encode('utf-8'), ship.score, ship is winner, ship.is_destroyed,
+                             game.tick_count)
+
         if training_mode and (game_num + 1) % PLOT_UPDATE_INTERVAL == 0:
             # Update the plot every PLOT_UPDATE_INTERVAL games
             update_plot(fig, ax_wins, ax_scores, ax_ticks, plot_x, plot_history_wins, plot_history_avg, plot_history_ticks, game_winners, game_scores, game_ticks, interval_size=PLOT_UPDATE_INTERVAL)
@@ -909,12 +1324,13 @@ def main(training_mode=False, num_games=1):
 
     # After all games have been played
     if training_mode:
-        print("\nTraining completed.")
+        stats.close()
+        print(f"\nTraining completed. Per-game stats saved in {stats_file}.")
         for brain_id, wins in wins_per_brain.items():
             print(f"Brain {brain_id} won {wins} games.({wins / num_games * 100:.2f}% win rate)")
         
         # Print the number of games in which the game ticks were less than the max tick count
-        print(f"Number of games with less than {MAX_TICK_COUNT} ticks: {len([tick_count for tick_count in game_ticks if tick_count < MAX_TICK_COUNT])}")
+        print(f"Number of games with less than {game.max_tick_count} ticks: {len([tick_count for tick_count in game_ticks if tick_count < game.max_tick_count])}")
         # Notify all brains that training is complete
         for ship in game.ships:
             try:
@@ -0,0 +1,309 @@
+# spatial_index.py
+"""
+Per-tick spatial index over ships, bullets, asteroids and gold.
+
+The engine creates one SpatialIndex per tick and exposes it as GameState.spatial_index.
+Each kind of entity is bucketed into a uniform grid the first time it is queried, so
+brains that never use the index pay nothing, and a query only looks at the grid cells
+around the area of interest instead of scanning every entity.
+
+Results are Hit(kind, index, distance) tuples, where `index` points into the matching
+GameState list (ships, bullets, asteroids or gold_positions). Destroyed ships are not
+indexed.
+"""
+import math
+from collections import namedtuple
+
+import numpy as np
+
+import geometry
+
+KINDS = ('ships', 'bullets', 'asteroids', 'gold')
+SPATIAL_CELL_SIZE = 100  # Grid cell size in pixels
+
+Hit = namedtuple('Hit', ['kind', 'index', 'distance'])
+
+
+class UniformGrid:
+    """
+    Points bucketed by grid cell, stored CSR-style: indices sorted by cell id plus the
+    offset of every cell, so the content of a cell is one contiguous slice.
+    """
+
+    def __init__(self, xs, ys, left, top, right, bottom, cell_size=SPATIAL_CELL_SIZE):
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+        self.left = left
+        self.top = top
+        self.cell_size = cell_size
+        self.nx = max(1, int(math.ceil((right - left) / cell_size)))
+        self.ny = max(1, int(math.ceil((bottom - top) / cell_size)))
+
+        cells = self.cell_of(self.xs, self.ys)
+        self.order = np.argsort(cells, kind='stable')
+        self.offsets = np.searchsorted(cells[self.order], np.arange(self.nx * self.ny + 1))
+
+    def __len__(self):
+        return len(self.xs)
+
+    def cell_coords(self, x, y):
+        ix = np.clip(((np.asarray(x) - self.left) // self.cell_size).astype(int), 0, self.nx - 1)
+        iy = np.clip(((np.asarray(y) - self.top) // self.cell_size).astype(int), 0, self.ny - 1)
+        return ix, iy
+
+    def cell_of(self, x, y):
+        ix, iy = self.cell_coords(x, y)
+        return iy * self.nx + ix
+
+    def in_cell_range(self, ix0, iy0, ix1, iy1):
+        """Indices of the points in the inclusive rectangle of cells."""
+        ix0, ix1 = max(ix0, 0), min(ix1, self.nx - 1)
+        iy0, iy1 = max(iy0, 0), min(iy1, self.ny - 1)
+        if ix0 > ix1 or iy0 > iy1:
+            return np.empty(0, dtype=int)
+        slices = []
+        for iy in range(iy0, iy1 + 1):
+            # Cells of a row are contiguous, so one slice per row
+            start = self.offsets[iy * self.nx + ix0]
+            end = self.offsets[iy * self.nx + ix1 + 1]
+            if end > start:
+                slices.append(self.order[start:end])
+        if not slices:
+            return np.empty(0, dtype=int)
+        return slices[0] if len(slices) == 1 else np.concatenate(slices)
+
+    def scalar_cell_coords(self, x, y):
+        """cell_coords for one point with plain arithmetic, several times cheaper than NumPy on scalars."""
+        ix = min(max(int((x - self.left) // self.cell_size), 0), self.nx - 1)
+        iy = min(max(int((y - self.top) // self.cell_size), 0), self.ny - 1)
+        return ix, iy
+
+    def in_box(self, x0, y0, x1, y1):
+        ix0, iy0 = self.scalar_cell_coords(x0, y0)
+        ix1, iy1 = self.scalar_cell_coords(x1, y1)
+        return self.in_cell_range(ix0, iy0, ix1, iy1)
+
+    def within(self, x, y, radius):
+        """Indices and distances of the points closer than `radius`, sorted by distance."""
+        candidates = self.in_box(x - radius, y - radius, x + radius, y + radius)
+        dists = geometry.distances(x, y, self.xs[candidates], self.ys[candidates])
+        inside = dists <= radius
+        candidates, dists = candidates[inside], dists[inside]
+        order = np.argsort(dists, kind='stable')
+        return candidates[order], dists[order]
+
+    def nearest(self, x, y, k=1, mask=None):
+        """
+        The k closest points (restricted to `mask` when given), searching rings of cells
+        outwards until the k-th candidate is provably closer than anything unvisited.
+        """
+        if not len(self.xs):
+            return np.empty(0, dtype=int), np.empty(0)
+        cx, cy = (int(c) for c in self.cell_coords(x, y))
+        max_ring = max(cx, self.nx - 1 - cx, cy, self.ny - 1 - cy)
+        for ring in range(max_ring + 1):
+            candidates = self.in_cell_range(cx - ring, cy - ring, cx + ring, cy + ring)
+            if mask is not None:
+                candidates = candidates[mask[candidates]]
+            if len(candidates) < k and ring < max_ring:
+                continue
+            dists = geometry.distances(x, y, self.xs[candidates], self.ys[candidates])
+            order = np.argsort(dists, kind='stable')[:k]
+            # Everything outside the visited rings is at least this far away
+            covered = min(x - (self.left + (cx - ring) * self.cell_size),
+                          self.left + (cx + ring + 1) * self.cell_size - x,
+                          y - (self.top + (cy - ring) * self.cell_size),
+                          self.top + (cy + ring + 1) * self.cell_size - y)
+            if ring == max_ring or (len(order) == k and dists[order[-1]] <= covered):
+                return candidates[order], dists[order]
+        return np.empty(0, dtype=int), np.empty(0)
+
+
+class SpatialIndex:
+    """
+    Lazily built grids over the entities of one GameState.
+
+    Args:
+        ships, bullets, asteroids, gold_positions: The GameState lists.
+        bounds (tuple): Play area (left, top, right, bottom), used for the grid and border ray-casts.
+        radii (dict): Collision radius per kind for ray-casts (asteroids use their own radius).
+    """
+
+    def __init__(self, ships, bullets, asteroids, gold_positions, bounds, radii=None, cell_size=SPATIAL_CELL_SIZE):
+        self.sources = {
+            'ships': ships,
+            'bullets': bullets,
+            'asteroids': asteroids,
+            'gold': gold_positions,
+        }
+        self.bounds = bounds
+        self.radii = radii or {}
+        self.cell_size = cell_size
+        self._grids = {}
+        self._ship_ids = None
+
+    def invalidate(self, *kinds):
+        """Drops the grids of kinds whose source lists changed; they are rebuilt on the next query."""
+        for kind in kinds:
+            self._grids.pop(kind, None)
+
+    @classmethod
+    def from_game_state(cls, game_state, bounds, radii=None):
+        return cls(game_state.ships, game_state.bullets, game_state.asteroids, game_state.gold_positions, bounds, radii)
+
+    def grid(self, kind):
+        grid = self._grids.get(kind)
+        if grid is None:
+            source = self.sources[kind]
+            if kind == 'gold':
+                xy = np.asarray(source, dtype=float).reshape(-1, 2)
+                xs, ys = xy[:, 0], xy[:, 1]
+            else:
+                xs = [entity['x'] for entity in source]
+                ys = [entity['y'] for entity in source]
+            grid = UniformGrid(xs, ys, *self.bounds, cell_size=self.cell_size)
+            if kind == 'ships':
+                grid.alive = np.array([ship['health'] > 0 for ship in source], dtype=bool)
+            if kind == 'asteroids':
+                grid.radii = np.array([asteroid['radius'] for asteroid in source], dtype=float)
+            self._grids[kind] = grid
+        return grid
+
+    def _mask(self, kind, exclude_id=None):
+        if kind != 'ships':
+            return None
+        grid = self.grid(kind)
+        if exclude_id is None:
+            return grid.alive
+        if self._ship_ids is None:
+            self._ship_ids = np.array([ship['id'] for ship in self.sources['ships']], dtype=object)
+        return grid.alive & (self._ship_ids != exclude_id)
+
+    def _radii(self, kind, indices):
+        if kind == 'asteroids':
+            return self.grid(kind).radii[indices]
+        return np.full(len(indices), float(self.radii.get(kind, 0)))
+
+    # ============================
+    # Queries (absolute angles, in degrees)
+    # ============================
+
+    def nearest(self, kind, x, y, k=1, exclude_id=None):
+        """The k closest entities of one kind, closest first."""
+        indices, dists = self.grid(kind).nearest(x, y, k, self._mask(kind, exclude_id))
+        return [Hit(kind, int(i), float(d)) for i, d in zip(indices, dists)]
+
+    def within(self, x, y, radius, kinds=KINDS, exclude_id=None):
+        """All entities whose centre is within `radius`, closest first."""
+        hits = []
+        for kind in kinds:
+            indices, dists = self.grid(kind).within(x, y, radius)
+            mask = self._mask(kind, exclude_id)
+            for i, d in zip(indices, dists):
+                if mask is None or mask[i]:
+                    hits.append(Hit(kind, int(i), float(d)))
+        hits.sort(key=lambda hit: hit.distance)
+        return hits
+
+    def in_cone(self, x, y, angle, width, max_range, kinds=KINDS, exclude_id=None):
+        """Entities within `max_range` and `width` / 2 degrees of `angle`, closest first."""
+        hits = []
+        for kind in kinds:
+            grid = self.grid(kind)
+            indices, dists = grid.within(x, y, max_range)
+            if not len(indices):
+                continue
+            inside = np.abs(geometry.bearing_differences(x, y, angle, grid.xs[indices], grid.ys[indices])) <= width / 2
+            mask = self._mask(kind, exclude_id)
+            for i, d in zip(indices[inside], dists[inside]):
+                if mask is None or mask[i]:
+                    hits.append(Hit(kind, int(i), float(d)))
+        hits.sort(key=lambda hit: hit.distance)
+        return hits
+
+    def raycast(self, x, y, angle, max_distance=float('inf'), kinds=('ships', 'asteroids'), exclude_id=None):
+        """
+        First entity (by its collision radius) or border hit by a ray from (x, y).
+
+        Returns:
+            Hit or None: kind 'border' with index -1 when the ray reaches the play area edge first,
+                         None if nothing is hit within max_distance.
+        """
+        left, top, right, bottom = self.bounds
+        border_distance = geometry.ray_to_border_distance(x, y, angle, left, right, top, bottom)
+        length = min(max_distance, border_distance)
+        rad_angle = math.radians(angle)
+        end_x = x + math.cos(rad_angle) * length
+        end_y = y + math.sin(rad_angle) * length
+
+        best = None
+        for kind in kinds:
+            grid = self.grid(kind)
+            if not len(grid):
+                continue
+            margin = float(grid.radii.max()) if kind == 'asteroids' else float(self.radii.get(kind, 0))
+            # Walk the ray one cell at a time and test the circles of the cells around it
+            steps = max(1, int(math.ceil(length / self.cell_size)))
+            seen = set()
+            candidates = []
+            for step in range(steps + 1):
+                t = min(step * self.cell_size, length)
+                px = x + math.cos(rad_angle) * t
+                py = y + math.sin(rad_angle) * t
+                reach = margin + self.cell_size
+                for i in grid.in_box(px - reach, py - reach, px + reach, py + reach):
+                    if i not in seen:
+                        seen.add(i)
+                        candidates.append(i)
+            if not candidates:
+                continue
+            candidates = np.array(candidates, dtype=int)
+            mask = self._mask(kind, exclude_id)
+            if mask is not None:
+                candidates = candidates[mask[candidates]]
+            contacts = geometry.segment_circle_contacts(x, y, end_x, end_y, grid.xs[candidates], grid.ys[candidates],
+                                                        self._radii(kind, candidates)) if len(candidates) else np.empty(0)
+            if len(contacts) and not np.all(np.isnan(contacts)):
+                first = int(np.nanargmin(contacts))
+                hit = Hit(kind, int(candidates[first]), float(contacts[first] * length))
+                if best is None or hit.distance < best.distance:
+                    best = hit
+        if best is not None:
+            return best
+        if border_distance <= max_distance:
+            return Hit('border', -1, border_distance)
+        return None
+
+    def for_ship(self, ship_id):
+        """Queries centred on a ship, excluding it, with angles relative to its heading."""
+        for ship in self.sources['ships']:
+            if ship['id'] == ship_id:
+                return ShipView(self, ship)
+        return None
+
+
+class ShipView:
+    """
+    SpatialIndex queries from a ship's point of view. Angles are relative to the ship's
+    heading (0 is straight ahead, positive turns right like Action.ROTATE_RIGHT).
+    """
+
+    def __init__(self, index: SpatialIndex, ship):
+        self.index = index
+        self.ship = ship
+        self.x = ship['x']
+        self.y = ship['y']
+        self.heading = ship['angle']
+        self.ship_id = ship['id']
+
+    def nearest(self, kind, k=1):
+        return self.index.nearest(kind, self.x, self.y, k, exclude_id=self.ship_id)
+
+    def within(self, radius, kinds=KINDS):
+        return self.index.within(self.x, self.y, radius, kinds, exclude_id=self.ship_id)
+
+    def in_cone(self, angle, width, max_range, kinds=KINDS):
+        return self.index.in_cone(self.x, self.y, self.heading + angle, width, max_range, kinds, exclude_id=self.ship_id)
+
+    def raycast(self, angle=0, max_distance=float('inf'), kinds=('ships', 'asteroids')):
+        return self.index.raycast(self.x, self.y, self.heading + angle, max_distance, kinds, exclude_id=self.ship_id)
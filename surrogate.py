@@ -0,0 +1,210 @@
+# surrogate.py
+"""
+Cheap fitness models of GeneticHunterBrain parameters, NumPy only.
+
+Every individual of the genetic trainer costs GAMES_PER_INDIVIDUAL full games, while
+training_logs.csv already holds thousands of (params, fitness) rows. A surrogate is
+fitted on that history (and on the individuals evaluated since) and predicts the
+fitness of new candidates: the trainer breeds more candidates than it simulates, and
+only the most promising ones play their games (screen). Two models, both on the unit
+cube of the parameter bounds:
+
+    knn  k nearest neighbours, inverse-distance weighted mean of their fitnesses
+    gp   Gaussian process with an RBF kernel on the most recent points; the length
+         scale and noise level are picked by marginal likelihood on a small grid
+
+Usage:
+    model = make_surrogate('gp', PARAM_BOUNDS)
+    model.fit(*load_history("training_logs.csv", PARAM_BOUNDS))
+    simulated, predictions = screen(model, candidates, count=len(candidates) // 2)
+"""
+import csv
+import json
+import math
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+SURROGATES = ('knn', 'gp')
+MIN_POINTS = 10  # Fewer known individuals: no screening
+
+KNN_NEIGHBOURS = 10
+GP_MAX_POINTS = 500  # Most recent points kept by the Gaussian process (fitting is cubic)
+GP_LENGTH_SCALES = (0.1, 0.2, 0.4, 0.8)  # Unit cube coordinates
+GP_NOISE_RATIOS = (0.1, 0.3, 1.0, 3.0)  # Noise variance relative to the signal variance
+
+
+class Surrogate(ABC):
+    """
+    Args:
+        bounds (dict): {name: (lower, upper)} of the parameters (trainer.PARAM_BOUNDS).
+    """
+
+    def __init__(self, bounds):
+        self.names = list(bounds)
+        self.lower = np.array([bounds[name][0] for name in self.names], dtype=float)
+        self.upper = np.array([bounds[name][1] for name in self.names], dtype=float)
+        self.X = np.zeros((0, len(self.names)))
+        self.y = np.zeros(0)
+
+    def to_unit(self, params_list):
+        values = np.array([[params[name] for name in self.names] for params in params_list], dtype=float)
+        return np.clip((values.reshape(-1, len(self.names)) - self.lower) / (self.upper - self.lower), 0.0, 1.0)
+
+    def fit(self, params_list, fitnesses):
+        """Replaces the known points."""
+        self.X = self.to_unit(params_list)
+        self.y = np.asarray(fitnesses, dtype=float)
+        self._fit()
+        return self
+
+    def add(self, params_list, fitnesses):
+        """Adds newly evaluated individuals to the known points."""
+        self.X = np.vstack([self.X, self.to_unit(params_list)])
+        self.y = np.concatenate([self.y, np.asarray(fitnesses, dtype=float)])
+        self._fit()
+        return self
+
+    @property
+    def ready(self):
+        return len(self.y) >= MIN_POINTS
+
+    def predict(self, params_list):
+        """
+        Returns:
+            np.ndarray: Predicted fitness of each params dict.
+        """
+        return self._predict(self.to_unit(params_list))
+
+    def _fit(self):
+        pass
+
+    @abstractmethod
+    def _predict(self, X):
+        """Predicted fitness of each row of unit cube coordinates."""
+
+
+class KNNSurrogate(Surrogate):
+    def __init__(self, bounds, neighbours=KNN_NEIGHBOURS):
+        super().__init__(bounds)
+        self.neighbours = neighbours
+
+    def _predict(self, X):
+        k = min(self.neighbours, len(self.y))
+        distances = np.sqrt(((X[:, None, :] - self.X[None, :, :]) ** 2).sum(axis=2))
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        weights = 1.0 / (np.take_along_axis(distances, nearest, axis=1) + 1e-6)
+        return (weights * self.y[nearest]).sum(axis=1) / weights.sum(axis=1)
+
+
+class GaussianProcessSurrogate(Surrogate):
+    def __init__(self, bounds, max_points=GP_MAX_POINTS):
+        super().__init__(bounds)
+        self.max_points = max_points
+        self.length_scale = GP_LENGTH_SCALES[0]
+        self.noise_ratio = None
+
+    @staticmethod
+    def kernel(A, B, length_scale):
+        squared = ((A[:, None, :] - B[None, :, :]) ** 2).sum(axis=2)
+        return np.exp(-0.5 * squared / length_scale ** 2)
+
+    def _fit(self):
+        X, y = self.X[-self.max_points:], self.y[-self.max_points:]
+        self._train_X = X
+        self._alpha = np.zeros(len(y))
+        self._y_mean, self._y_std = (y.mean(), y.std() or 1.0) if len(y) else (0.0, 1.0)
+        if not len(y):
+            return
+        z = (y - self._y_mean) / self._y_std
+        best = None
+        for length_scale in GP_LENGTH_SCALES:
+            K = self.kernel(X, X, length_scale)
+            for noise_ratio in GP_NOISE_RATIOS:
+                # The standardized fitness has unit variance: signal 1 / (1 + ratio), noise the rest
+                signal = 1.0 / (1.0 + noise_ratio)
+                try:
+                    L = np.linalg.cholesky(signal * K + (1.0 - signal + 1e-8) * np.eye(len(z)))
+                except np.linalg.LinAlgError:
+                    continue
+                alpha = np.linalg.solve(L.T, np.linalg.solve(L, z))
+                log_likelihood = -0.5 * z @ alpha - np.log(np.diag(L)).sum() - 0.5 * len(z) * math.log(2 * math.pi)
+                if best is None or log_likelihood > best[0]:
+                    best = (log_likelihood, length_scale, noise_ratio, signal * alpha)
+        if best is not None:
+            _, self.length_scale, self.noise_ratio, self._alpha = best
+
+    def _predict(self, X):
+        return self._y_mean + self._y_std * (self.kernel(X, self._train_X, self.length_scale) @ self._alpha)
+
+
+def make_surrogate(kind, bounds):
+    if kind == 'knn':
+        return KNNSurrogate(bounds)
+    if kind == 'gp':
+        return GaussianProcessSurrogate(bounds)
+    raise ValueError(f"Unknown surrogate '{kind}', expected one of {SURROGATES}.")
+
+
+def load_history(csv_file, bounds):
+    """
+    (params, fitness) rows of a trainer CSV log (training_stats.IndividualLog, or the
+    old layout with a JSON "Params" column) that have a value for every bound.
+
+    Returns:
+        tuple: (list of params dicts, list of fitnesses), both empty if the file is missing.
+    """
+    params_list, fitnesses = [], []
+    try:
+        with open(csv_file, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                try:
+                    if "Params" in row:
+                        params = json.loads(row["Params"])
+                        params = {name: float(params[name]) for name in bounds}
+                    else:
+                        params = {name: float(row[name]) for name in bounds}
+                    fitness = float(row["Fitness"])
+                except (KeyError, TypeError, ValueError):
+                    continue  # Missing parameter or row cut short
+                params_list.append(params)
+                fitnesses.append(fitness)
+    except FileNotFoundError:
+        pass
+    return params_list, fitnesses
+
+
+def screen(model, candidates, count, keep=()):
+    """
+    Picks the candidates worth simulating.
+
+    Args:
+        candidates (list): Candidate params dicts, usually bred 1 / fraction times more
+                           numerous than the individuals simulated per generation.
+        count (int): Candidates to simulate, the best predicted first.
+        keep (iterable): Indices simulated whatever their prediction (e.g. the elite),
+                         counted in 'count'.
+
+    Returns:
+        tuple: (sorted indices to simulate, predictions or None if the model is not ready,
+               in which case the first candidates are simulated).
+    """
+    predictions = model.predict(candidates) if model.ready else None
+    order = np.argsort(-predictions) if predictions is not None else range(len(candidates))
+    selected = set(keep)
+    for index in order:
+        if len(selected) >= count:
+            break
+        selected.add(int(index))
+    return sorted(selected), predictions
+
+
+def rank_correlation(a, b):
+    """Spearman correlation of two sequences (None if fewer than 3 values or one is constant)."""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    if len(a) < 3:
+        return None
+    ranks_a, ranks_b = np.argsort(np.argsort(a)), np.argsort(np.argsort(b))
+    if ranks_a.std() == 0 or ranks_b.std() == 0:
+        return None
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
@@ -0,0 +1,244 @@
+# tournament.py
+"""
+Round-robin tournament between every brain found in 'brains/'.
+
+Lineups of NUMBER_OF_BRAINS_TO_RUN ships are drawn so that every brain plays the same
+number of games, the games run headless across a process pool with one seed each, and
+Plackett-Luce ratings (Weng & Lin's Bayesian approximation, the free-for-all cousin of
+TrueSkill) are updated as results stream in. The tournament stops once the confidence
+intervals of neighbouring brains in the ranking no longer overlap, or after max_games.
+
+Usage:
+    python tournament.py [--workers 4] [--max-games 600] [--seed 0]
+"""
+import os
+import math
+import random
+import argparse
+import importlib
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# Workers never open a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from space_game import GameEnvironment, SpaceGame, discover_brain_classes, NUMBER_OF_BRAINS_TO_RUN
+
+# Rating parameters (same defaults as TrueSkill / OpenSkill)
+INITIAL_MU = 25.0
+INITIAL_SIGMA = 25.0 / 3
+BETA = INITIAL_SIGMA / 2
+KAPPA = 0.0001
+CONFIDENCE_Z = 1.96  # Interval half-width in sigmas used for the stopping rule
+
+MIN_GAMES_PER_BRAIN = 10  # Never stop before every brain played this many games
+
+
+###################
+# Brain discovery and lineups
+###################
+def discover_entries(brains_dir="brains"):
+    """Returns 'module:Class' paths of all brain classes, one per class definition."""
+    return [f"{obj.__module__}:{obj.__name__}"
+            for _, obj in discover_brain_classes(brains_dir, defined_in_module_only=True)]
+
+
+def load_brain_class(entry):
+    module_name, class_name = entry.split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def balanced_lineups(entries, lineup_size, rng):
+    """
+    Endless generator of lineups. Each round shuffles all entries and deals them into
+    lineups; the last, short lineup is topped up with entries from the start of the round,
+    so appearance counts never differ by more than one round's top-up.
+    """
+    lineup_size = min(lineup_size, len(entries))
+    while True:
+        order = entries[:]
+        rng.shuffle(order)
+        for start in range(0, len(order), lineup_size):
+            lineup = order[start:start + lineup_size]
+            fillers = [entry for entry in order if entry not in lineup]
+            lineup += fillers[:lineup_size - len(lineup)]
+            yield lineup
+
+
+###################
+# Worker
+###################
+_environment = None
+
+
+def play_match(lineup, seed, config=None):
+    """
+    Plays one seeded headless game in a worker process.
+
+    Args:
+        config (GameConfig): Rules of the game, DEFAULT_CONFIG if None. Games with different
+                             configs can share the same pool.
+
+    Returns:
+        dict: 'lineup', 'seed', 'scores' (entry -> score), 'winner' (entry) and 'ticks'.
+    """
+    global _environment
+    if _environment is None:
+        _environment = GameEnvironment(training_mode=True)
+
+    random.seed(seed)
+    brains = []
+    entry_by_id = {}
+    for entry in lineup:
+        brain = load_brain_class(entry)()
+        brains.append(brain)
+        entry_by_id[brain.id] = entry
+
+    game = SpaceGame(_environment, wins_per_brain={}, brains=brains, config=config)
+    winner = game.run()
+    return {
+        'lineup': lineup,
+        'seed': seed,
+        'scores': {entry_by_id[ship.id]: ship.score for ship in game.ships},
+        'winner': entry_by_id[winner.id] if winner else None,
+        'ticks': game.tick_count,
+    }
+
+
+###################
+# Ratings
+###################
+class Rating:
+    def __init__(self, mu=INITIAL_MU, sigma=INITIAL_SIGMA):
+        self.mu = mu
+        self.sigma = sigma
+        self.games = 0
+        self.wins = 0
+
+    def interval(self, z=CONFIDENCE_Z):
+        return self.mu - z * self.sigma, self.mu + z * self.sigma
+
+    def __repr__(self):
+        return f"Rating(mu={self.mu:.2f}, sigma={self.sigma:.2f})"
+
+
+def update_ratings(ratings, scores):
+    """
+    Plackett-Luce update of a free-for-all game (Weng & Lin 2011, algorithm 4).
+    Higher score is a better rank; equal scores are ties.
+    """
+    players = list(scores)
+    c = math.sqrt(sum(ratings[p].sigma ** 2 + BETA ** 2 for p in players))
+    strength = {p: math.exp(ratings[p].mu / c) for p in players}
+    # Sum of strengths of everyone ranked at or below q, and the size of q's tie group
+    sum_q = {q: sum(strength[i] for i in players if scores[i] <= scores[q]) for q in players}
+    tie_count = {q: sum(1 for i in players if scores[i] == scores[q]) for q in players}
+
+    new_values = {}
+    for i in players:
+        omega = 0.0
+        delta = 0.0
+        for q in players:
+            if scores[q] < scores[i]:
+                continue  # Only players ranked at or above i enter its update
+            quotient = strength[i] / sum_q[q]
+            omega += ((1 if q == i else 0) - quotient) / tie_count[q]
+            delta += quotient * (1 - quotient) / tie_count[q]
+        rating = ratings[i]
+        variance = rating.sigma ** 2
+        gamma = rating.sigma / c
+        mu = rating.mu + variance / c * omega
+        sigma = rating.sigma * math.sqrt(max(1 - gamma * variance / c ** 2 * delta, KAPPA))
+        new_values[i] = (mu, sigma)
+
+    for i, (mu, sigma) in new_values.items():
+        ratings[i].mu = mu
+        ratings[i].sigma = sigma
+        ratings[i].games += 1
+
+
+def intervals_separated(ratings, z=CONFIDENCE_Z):
+    """True when the confidence intervals of every pair of neighbours in the ranking are disjoint."""
+    ranked = sorted(ratings.values(), key=lambda r: r.mu, reverse=True)
+    return all(upper.interval(z)[0] > lower.interval(z)[1] for upper, lower in zip(ranked, ranked[1:]))
+
+
+def print_standings(ratings, games_played):
+    print(f"\n=== Standings after {games_played} games ===")
+    ranked = sorted(ratings.items(), key=lambda item: item[1].mu, reverse=True)
+    for position, (entry, rating) in enumerate(ranked, 1):
+        low, high = rating.interval()
+        print(f"{position:2d}. {entry:<40} mu={rating.mu:6.2f} sigma={rating.sigma:5.2f} "
+              f"[{low:6.2f}, {high:6.2f}] games={rating.games} wins={rating.wins}")
+
+
+###################
+# Tournament
+###################
+def run_tournament(entries=None, lineup_size=NUMBER_OF_BRAINS_TO_RUN, workers=None, max_games=600,
+                   seed=0, z=CONFIDENCE_Z, status_interval=20, config=None):
+    """
+    Runs games until the ratings separate or max_games is reached.
+
+    Args:
+        config (GameConfig): Rules every game is played with, DEFAULT_CONFIG if None.
+
+    Returns:
+        dict: entry -> Rating.
+    """
+    entries = entries or discover_entries()
+    if len(entries) < 2:
+        print("A tournament needs at least two brains.")
+        return {}
+    rng = random.Random(seed)
+    lineups = balanced_lineups(entries, lineup_size, rng)
+    ratings = {entry: Rating() for entry in entries}
+    workers = workers or os.cpu_count() or 1
+
+    games_played = 0
+    games_submitted = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            # Keep every worker busy without queueing more games than needed
+            while len(pending) < workers * 2 and games_submitted < max_games:
+                pending.add(pool.submit(play_match, next(lineups), rng.randrange(2 ** 32), config))
+                games_submitted += 1
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Game failed: {e}")
+                    continue
+                update_ratings(ratings, result['scores'])
+                if result['winner']:
+                    ratings[result['winner']].wins += 1
+                games_played += 1
+                if games_played % status_interval == 0:
+                    print_standings(ratings, games_played)
+
+            enough_games = min(rating.games for rating in ratings.values()) >= MIN_GAMES_PER_BRAIN
+            if enough_games and intervals_separated(ratings, z):
+                print(f"\nRating intervals separated after {games_played} games.")
+                for future in pending:
+                    future.cancel()
+                break
+
+    print_standings(ratings, games_played)
+    return ratings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Round-robin tournament between all brains.')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count).')
+    parser.add_argument('--max-games', type=int, default=600, help='Upper bound on the number of games.')
+    parser.add_argument('--lineup-size', type=int, default=NUMBER_OF_BRAINS_TO_RUN, help='Ships per game.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the lineup and game seed sequence.')
+    parser.add_argument('--z', type=float, default=CONFIDENCE_Z, help='Confidence interval half-width in sigmas.')
+    args = parser.parse_args()
+
+    run_tournament(lineup_size=args.lineup_size, workers=args.workers, max_games=args.max_games,
+                   seed=args.seed, z=args.z)
@@ -1,110 +1,537 @@
 # genetic_trainer.py
 import os
-import csv
-import json
+import math
+import time
+import queue
+import pickle
 import random
+import argparse
+import multiprocessing as mp
 
-from space_game import GameEnvironment, SpaceGame
+from space_game import seeded_starting_positions
+from game_engine import GameEngine, default_opponents
+from game_config import DEFAULT_CONFIG
+from training_stats import StatsWriter, IndividualLog, TRAINER_FIELDS
+from artifacts import ArtifactRegistry, save_atomic, write_json_atomic, BEST_PARAMS
+from cma_es import CMAES
+from surrogate import SURROGATES, make_surrogate, load_history, screen, rank_correlation
 
 # Number of games played to evaluate the fitness of each individual
 GAMES_PER_INDIVIDUAL = 3
+SURVIVAL_BONUS = 50  # Added to the score of a game the ship survives
+
+# Log of every individual (one column per parameter), with an optional binary copy (--binary-log)
+LOG_FILE = "training_logs.csv"
+BINARY_LOG_FILE = "training_logs.bin"
+
+# Binary log of every evaluation game (see training_stats.py)
+STATS_FILE = "training_games.bin"
+
+# Range of each parameter: mutate() clamps to it, the CMA-ES optimizer searches within it
+PARAM_BOUNDS = {
+    'distance_weight': (0.1, 5.0),
+    'shoot_accuracy': (1, 40),
+    'retreat_threshold': (0.0, 1.0),
+    'aggressiveness': (0.0, 1.0),
+}
+
+OPTIMIZERS = ('ga', 'cma')
+
+# Training state after the last complete generation, for --resume
+CHECKPOINT_FILE = "trainer_checkpoint.pkl"
+CHECKPOINT_VERSION = 1
+
+# Share of the bred candidates simulated when a surrogate model screens them
+SURROGATE_FRACTION = 0.5
+
+# Island model (island_training): generations between migrations, emigrants per migration
+MIGRATION_INTERVAL = 5
+MIGRANTS = 2
+
+_engine = None  # One GameEngine per process (training_engine)
 
 ###################
 # Main Genetic Algorithm
 ###################
-def genetic_training(population_size=100, generations=100, mutation_rate=0.1):
+def genetic_training(population_size=100, generations=100, mutation_rate=0.1, optimizer='ga', seed=None,
+                     resume=False, time_budget=None, checkpoint_file=CHECKPOINT_FILE, common_random_numbers=True,
+                     mirrored=False, surrogate=None, surrogate_fraction=SURROGATE_FRACTION, binary_log=False):
     """
     Trains the 'GeneticHunterBrain' (group1-CharlesK.py) via 'space_game.py',
-    logs each individual (fitness, params) in a CSV file,
-    and saves the best global individual in 'best_brain_params.json'.
+    logs each individual (fitness, params) in a CSV file (and in BINARY_LOG_FILE with
+    binary_log), and saves the best global individual in 'best_brain_params.json'.
+
+    optimizer is 'ga' (crossover and mutation below) or 'cma' (cma_es.CMAES within
+    PARAM_BOUNDS, which needs far fewer individuals: population_size=None uses its default).
+
+    A checkpoint (population, best individual, fitness history, RNG state and settings) is
+    written atomically after every generation. resume=True continues from it, with the
+    settings it was started with and the given total number of generations. time_budget
+    (seconds of wall clock) stops the training between two individuals; the logs only get
+    complete generations, so a resume does not log an individual twice. However the training
+    ends (budget, crash, Ctrl+C), the best individual so far is saved.
+
+    With common_random_numbers, all individuals of a generation play the same seeded
+    scenarios (draw_scenarios, mirrored start positions optionally), so fitness differences
+    come from the params rather than from the arena; the variance reduction is printed
+    per generation (crn_variance_reduction).
+
+    surrogate ('knn' or 'gp', see surrogate.py; ga only) fits a fitness model on the CSV
+    log and on every individual evaluated since. Each generation then breeds
+    population_size / surrogate_fraction candidates, and only the population_size with the
+    best predictions (the elite included) play their games and become the parents; the
+    others are dropped. The accuracy of the predictions and the games saved are printed
+    per generation.
     """
+    if optimizer not in OPTIMIZERS:
+        raise ValueError(f"Unknown optimizer '{optimizer}', expected one of {OPTIMIZERS}.")
+    if surrogate is not None and (surrogate not in SURROGATES or optimizer != 'ga'):
+        raise ValueError(f"The surrogate must be one of {SURROGATES}, with the 'ga' optimizer.")
+    if surrogate is not None and not 0 < surrogate_fraction <= 1:
+        raise ValueError(f"The surrogate fraction must be in (0, 1], not {surrogate_fraction}.")
+    start_time = time.monotonic()
+
+    if resume and os.path.exists(checkpoint_file):
+        checkpoint = load_checkpoint(checkpoint_file)
+        settings = checkpoint['settings']
+        population_size, mutation_rate, optimizer = (settings['population_size'], settings['mutation_rate'],
+                                                     settings['optimizer'])
+        common_random_numbers = settings.get('common_random_numbers', False)
+        mirrored = settings.get('mirrored', False)
+        surrogate = settings.get('surrogate')
+        surrogate_fraction = settings.get('surrogate_fraction', SURROGATE_FRACTION)
+        population = checkpoint['population']
+        cma = checkpoint['cma']
+        best_params_ever = checkpoint['best_params_ever']
+        best_fitness_ever = checkpoint['best_fitness_ever']
+        history = checkpoint['history']
+        first_generation = checkpoint['generation']
+        random.setstate(checkpoint['random_state'])
+        print(f"Resuming from {checkpoint_file} at generation {first_generation + 1}/{generations} "
+              f"({optimizer}, best fitness so far {best_fitness_ever:.2f})")
+    else:
+        if resume:
+            print(f"No checkpoint {checkpoint_file} found, starting a new training.")
+        if seed is not None:
+            random.seed(seed)
+
+        # (1) Initial population
+        cma = None
+        if optimizer == 'cma':
+            cma = CMAES(PARAM_BOUNDS, population_size=population_size, seed=seed)
+            population = cma.ask()
+        else:
+            population_size = population_size or 100
+            population = [random_params() for _ in range(candidate_count(population_size, surrogate,
+                                                                         surrogate_fraction))]
+
+        # Variables to track the best global individual
+        best_params_ever = None
+        best_fitness_ever = float('-inf')
+        history = []  # Best and mean fitness of each generation
+        first_generation = 0
+    settings = {'population_size': population_size, 'mutation_rate': mutation_rate, 'optimizer': optimizer,
+                'seed': seed, 'games_per_individual': GAMES_PER_INDIVIDUAL,
+                'common_random_numbers': common_random_numbers, 'mirrored': mirrored,
+                'surrogate': surrogate, 'surrogate_fraction': surrogate_fraction}
+
+    # Individual logs, written once per generation
+    log = IndividualLog(LOG_FILE, PARAM_BOUNDS, BINARY_LOG_FILE if binary_log else None)
+    model = None
+    games_saved = 0
+    if surrogate is not None:
+        model = make_surrogate(surrogate, PARAM_BOUNDS).fit(*load_history(LOG_FILE, PARAM_BOUNDS))
+        print(f"Surrogate '{surrogate}' fitted on {len(model.y)} logged individuals.")
+    stats = StatsWriter(STATS_FILE, TRAINER_FIELDS)
+
+    out_of_time = False
+    completed = first_generation
+    try:
+        for gen in range(first_generation, generations):
+            print(f"\n=== Generation {gen+1}/{generations} ===")
+
+            # (2) Evaluate the population (on the same scenarios with common random numbers),
+            #     or only the population_size candidates the surrogate model predicts best
+            if population_size is None:
+                population_size = len(population)  # CMA-ES default
+            simulated, predictions = list(range(len(population))), None
+            if model is not None:
+                simulated, predictions = screen(model, population, population_size,
+                                                keep=[0] if best_params_ever is not None else [])
+                if predictions is not None:
+                    predictions = predictions[simulated]
+                    games_saved += (len(population) - len(simulated)) * GAMES_PER_INDIVIDUAL
+            scenarios = draw_scenarios(GAMES_PER_INDIVIDUAL, mirrored) if common_random_numbers else None
+            fitness_results = []
+            game_fitnesses = []
+            records = GameRecords()  # Games of the generation, written once it is complete
+            for i in simulated:
+                if time_budget is not None and time.monotonic() - start_time > time_budget:
+                    out_of_time = True
+                    break
+                params = population[i]
+                games = evaluate_games(params, scenarios or [None] * GAMES_PER_INDIVIDUAL, records, gen+1, i+1)
+                fitness = sum(games) / len(games)
+                game_fitnesses.append(games)
+                fitness_results.append((params, fitness))
+                print(f"  Individual #{i+1}: fitness={fitness:.2f}")
+
+                # Update the best global record
+                if fitness > best_fitness_ever:
+                    best_fitness_ever = fitness
+                    best_params_ever = params.copy()
+                    print(f"    => New global record! fitness={fitness:.2f}")
+
+            if out_of_time:
+                # The checkpoint keeps the last complete generation, which a resume evaluates again:
+                # the partial one is not logged, so its individuals are not logged (or fed to the surrogate) twice
+                print(f"\nTime budget of {time_budget:.0f}s reached during generation {gen+1}.")
+                break
+
+            # Log the generation (CSV and binary stats), under the index of each candidate
+            for i, (params, fitness) in zip(simulated, fitness_results):
+                log.append(gen+1, i+1, fitness, params)
+            for record in records:
+                stats.append(*record)
+            log.flush()
+            stats.flush()
+
+            # (3) Sort to identify the best individual of this generation (the CMA-ES update needs the ask() order)
+            fitnesses = [fitness for _, fitness in fitness_results]
+            if cma is not None:
+                cma.tell(fitnesses)
+            history.append((max(fitnesses), sum(fitnesses) / len(fitnesses)))
+            if common_random_numbers:
+                factor, scenario_share = crn_variance_reduction(game_fitnesses)
+                if factor is not None:
+                    print(f"  => Common random numbers: scenarios explain {scenario_share:.0%} of the game variance, "
+                          f"ranking as precise as with {factor:.1f}x the games")
+            if model is not None:
+                if predictions is not None:
+                    correlation = rank_correlation(predictions, fitnesses)
+                    error = sum(abs(p - f) for p, f in zip(predictions, fitnesses)) / len(fitnesses)
+                    print(f"  => Surrogate: simulated {len(simulated)}/{len(population)}, rank correlation "
+                          f"{'n/a' if correlation is None else f'{correlation:+.2f}'}, mean absolute error "
+                          f"{error:.1f}, {games_saved} games saved so far")
+                model.add([params for params, _ in fitness_results], fitnesses)
+            fitness_results.sort(key=lambda x: x[1], reverse=True)
+            gen_best_params, gen_best_fitness = fitness_results[0]
+            print(f"  => Best of this generation: fitness={gen_best_fitness:.2f}")
+
+            # (4) Create the new generation (reproduction + elitism, or sampled by CMA-ES)
+            if cma is not None:
+                population = cma.ask()
+            else:
+                population = reproduce_population(
+                    fitness_results,
+                    best_params_ever,       # Elitism: include the best global individual
+                    candidate_count(population_size, surrogate, surrogate_fraction),
+                    mutation_rate
+                )
+
+            completed = gen + 1
+            save_checkpoint(checkpoint_file, {
+                'generation': completed,
+                'population': population,
+                'cma': cma,
+                'best_params_ever': best_params_ever,
+                'best_fitness_ever': best_fitness_ever,
+                'history': history,
+                'random_state': random.getstate(),
+                'settings': settings,
+            })
+    finally:
+        # End of training (or interruption): save the best global individual
+        log.close()
+        stats.close()
+        save_best_params(best_params_ever, best_fitness_ever, completed, generations)
+    return best_params_ever, best_fitness_ever
+
+
+def candidate_count(population_size, surrogate, surrogate_fraction):
+    """Candidates bred per generation: 1 / surrogate_fraction times the individuals simulated with a surrogate."""
+    if surrogate is None:
+        return population_size
+    return math.ceil(population_size / surrogate_fraction)
+
+
+def save_best_params(best_params_ever, best_fitness_ever, completed, generations):
+    status = "completed" if completed == generations else f"stopped after {completed}/{generations} generations"
+    print(f"\n=== Training {status} ===")
+    if best_params_ever:
+        print(f"Best global fitness: {best_fitness_ever:.2f}")
+        write_json_atomic("best_brain_params.json", best_params_ever)
+        ArtifactRegistry().register("best_brain_params.json", BEST_PARAMS, brain="GeneticHunterBrain",
+                                    metrics={'score': best_fitness_ever, 'generations': completed})
+        print("Best final parameters saved in 'best_brain_params.json'.")
 
-    # (1) Initial population
-    population = [random_params() for _ in range(population_size)]
 
-    # Variables to track the best global individual
-    best_params_ever = None
-    best_fitness_ever = float('-inf')
+###################
+# Island model
+###################
+def island_training(islands=4, population_size=100, generations=100, mutation_rate=0.1,
+                    migration_interval=MIGRATION_INTERVAL, migrants=MIGRANTS, seed=None, time_budget=None,
+                    common_random_numbers=True, mirrored=False, binary_log=False):
+    """
+    Genetic training with 'islands' sub-populations (population_size // islands individuals
+    each) evolving in separate processes, each with its own reproduce_population loop.
+
+    Every migration_interval generations, each island sends copies of its 'migrants' best
+    individuals to the next island of a ring (one multiprocessing queue per island), where
+    they replace the last children of the new population. Islands wait for their immigrants,
+    so a run with a seed is reproducible. The islands report every evaluated generation to
+    this process, which writes the CSV and binary logs, tracks the best global individual
+    and saves it like genetic_training. Island i plays its own scenarios from seed + i.
+    """
+    if islands < 1 or population_size // islands < 2:
+        raise ValueError(f"{population_size} individuals cannot form {islands} islands of at least 2.")
+    island_size = population_size // islands
+    inboxes = [mp.Queue() for _ in range(islands)]
+    reports = mp.Queue()
+    stop = mp.Event()
+    settings = {'population_size': island_size, 'generations': generations, 'mutation_rate': mutation_rate,
+                'migration_interval': migration_interval, 'migrants': min(migrants, island_size - 1),
+                'common_random_numbers': common_random_numbers, 'mirrored': mirrored}
+    processes = [mp.Process(target=run_island, daemon=True,
+                            args=(island, None if seed is None else seed + island, settings,
+                                  inboxes[island], inboxes[(island + 1) % islands], reports, stop))
+                 for island in range(islands)]
+
+    log = IndividualLog(LOG_FILE, PARAM_BOUNDS, BINARY_LOG_FILE if binary_log else None)
+    stats = StatsWriter(STATS_FILE, TRAINER_FIELDS)
+    start_time = time.monotonic()
+    best_params_ever, best_fitness_ever = None, float('-inf')
+    generations_done = [0] * islands
+    running = islands
+    try:
+        for process in processes:
+            process.start()
+        while running:
+            if time_budget is not None and not stop.is_set() and time.monotonic() - start_time > time_budget:
+                print(f"\nTime budget of {time_budget:.0f}s reached, stopping the islands.")
+                stop.set()
+            try:
+                message = reports.get(timeout=1)
+            except queue.Empty:
+                if any(not process.is_alive() and process.exitcode for process in processes):
+                    print("\nAn island process died, stopping the others.")
+                    stop.set()
+                    break
+                continue
+            if message[0] == 'done':
+                running -= 1
+                continue
+
+            _, island, gen, results = message
+            generations_done[island] = gen
+            for i, (params, fitness, records) in enumerate(results):
+                log.append(gen, island * island_size + i + 1, fitness, params)
+                for record in records:
+                    stats.append(*record)
+                if fitness > best_fitness_ever:
+                    best_fitness_ever, best_params_ever = fitness, params.copy()
+            fitnesses = [fitness for _, fitness, _ in results]
+            print(f"[Island {island + 1}/{islands}] Generation {gen}/{generations}: best={max(fitnesses):.2f} "
+                  f"mean={sum(fitnesses) / len(fitnesses):.2f} (global best {best_fitness_ever:.2f})")
+            log.flush()
+            stats.flush()
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        log.close()
+        stats.close()
+        save_best_params(best_params_ever, best_fitness_ever, min(generations_done), generations)
+    return best_params_ever, best_fitness_ever
+
+
+def run_island(island, seed, settings, inbox, outbox, reports, stop):
+    """Evolves one island until settings['generations'] or the stop event (island_training worker)."""
+    if seed is not None:
+        random.seed(seed)
+    population = [random_params() for _ in range(settings['population_size'])]
+    best_params, best_fitness = None, float('-inf')
+    for gen in range(settings['generations']):
+        scenarios = (draw_scenarios(GAMES_PER_INDIVIDUAL, settings['mirrored'])
+                     if settings['common_random_numbers'] else [None] * GAMES_PER_INDIVIDUAL)
+        results = []
+        for i, params in enumerate(population):
+            if stop.is_set():
+                break
+            records = GameRecords()
+            games = evaluate_games(params, scenarios, records, gen + 1, island * len(population) + i + 1)
+            results.append((params, sum(games) / len(games), records))
+        if stop.is_set():
+            break
+        reports.put(('generation', island, gen + 1, results))
+
+        fitness_results = sorted(((params, fitness) for params, fitness, _ in results),
+                                 key=lambda x: x[1], reverse=True)
+        if fitness_results[0][1] > best_fitness:
+            best_params, best_fitness = fitness_results[0][0].copy(), fitness_results[0][1]
+        population = reproduce_population(fitness_results, best_params, len(population), settings['mutation_rate'])
+
+        # Migration along the ring, except after the last generation
+        if (gen + 1) % settings['migration_interval'] == 0 and gen + 1 < settings['generations']:
+            outbox.put([params.copy() for params, _ in fitness_results[:settings['migrants']]])
+            immigrants = receive_migrants(inbox, stop)
+            if immigrants:
+                population[-len(immigrants):] = immigrants
+    reports.put(('done', island))
+
+
+def receive_migrants(inbox, stop):
+    """Waits for the emigrants of the previous island; None once the training is stopped."""
+    while True:
+        try:
+            return inbox.get(timeout=1)
+        except queue.Empty:
+            if stop.is_set():
+                return None
+
+
+class GameRecords(list):
+    """
+    Collects TRAINER_FIELDS records like StatsWriter.append, until they are written to the
+    stats file (by the process writing it, once their generation is complete).
+    """
 
-    # CSV log file
-    LOG_FILE = "training_logs.csv"
-    create_csv_header_if_needed(LOG_FILE)
+    def append(self, *values):
+        super().append(values)
 
-    for gen in range(generations):
-        print(f"\n=== Generation {gen+1}/{generations} ===")
 
-        # (2) Evaluate the population
-        fitness_results = []
-        for i, params in enumerate(population):
-            fitness = evaluate_params(params, GAMES_PER_INDIVIDUAL)
-            fitness_results.append((params, fitness))
-            print(f"  Individual #{i+1}: fitness={fitness:.2f}")
-
-            # Log in the CSV
-            log_to_csv(LOG_FILE, gen+1, i+1, fitness, params)
-
-            # Update the best global record
-            if fitness > best_fitness_ever:
-                best_fitness_ever = fitness
-                best_params_ever = params.copy()
-                print(f"    => New global record! fitness={fitness:.2f}")
-
-        # (3) Sort to identify the best individual of this generation
-        fitness_results.sort(key=lambda x: x[1], reverse=True)
-        gen_best_params, gen_best_fitness = fitness_results[0]
-        print(f"  => Best of this generation: fitness={gen_best_fitness:.2f}")
-
-        # (4) Create the new generation (reproduction + elitism)
-        population = reproduce_population(
-            fitness_results,
-            best_params_ever,       # Elitism: include the best global individual
-            population_size,
-            mutation_rate
-        )
+###################
+# Checkpoints
+###################
+def save_checkpoint(checkpoint_file, checkpoint):
+    """Pickles the training state next to the file and renames it over the previous checkpoint."""
+    def write(path):
+        with open(path, 'wb') as f:
+            pickle.dump(dict(checkpoint, version=CHECKPOINT_VERSION), f)
+    save_atomic(checkpoint_file, write)
 
-    # End of training: save the best global individual
-    print(f"\n=== Training completed ===")
-    print(f"Best global fitness: {best_fitness_ever:.2f}")
-    if best_params_ever:
-        with open("best_brain_params.json", "w") as f:
-            json.dump(best_params_ever, f)
-        print("Best final parameters saved in 'best_brain_params.json'.")
+
+def load_checkpoint(checkpoint_file):
+    with open(checkpoint_file, 'rb') as f:
+        checkpoint = pickle.load(f)
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"{checkpoint_file} is a version {checkpoint.get('version')} checkpoint, "
+                         f"expected {CHECKPOINT_VERSION}.")
+    return checkpoint
 
 
 ###################
 # Evaluation (launch the game)
 ###################
-def evaluate_params(params, num_games):
+def evaluate_params(params, num_games, stats=None, generation=0, individual=0, scenarios=None):
     """
-    Injects 'params' into 'best_brain_params.json' so that group1-CharlesK.py uses them,
-    plays 'num_games' games, and returns the average fitness (score + survival bonus).
+    Plays 'num_games' games with a 'group1-CharlesK' brain using 'params' (see training_engine)
+    and returns the average fitness (score + survival bonus).
+    If a StatsWriter is given, one TRAINER_FIELDS record is appended per game.
+    With scenarios (see draw_scenarios), one seeded game is played per scenario instead.
     """
-    # (1) Temporarily write params for the 'CharlesK' brain
-    with open("best_brain_params.json", "w") as f:
-        json.dump(params, f)
+    fitnesses = evaluate_games(params, scenarios or [None] * num_games, stats, generation, individual)
+    if fitnesses:
+        return sum(fitnesses) / len(fitnesses)
+    else:
+        return 0
+
 
-    total_fitness = 0
-    for _ in range(num_games):
-        env = GameEnvironment(training_mode=True)
-        game = SpaceGame(env, wins_per_brain={})
-        winner = game.run()
+def evaluate_games(params, scenarios, stats=None, generation=0, individual=0):
+    """
+    Plays one game per scenario with 'params' (training_engine) and returns the fitness of each game.
 
-        # Retrieve the 'group1-CharlesK' ship
-        ship_perso = next((s for s in game.ships if s.id == "group1-CharlesK"), None)
-        if not ship_perso:
-            # If it does not exist, fitness is zero
-            continue
+    A scenario is a (seed, mirrored) pair: the game, its spawns, gold, asteroids and the
+    opponents' random choices are drawn from the seed (the trainer's own random state is
+    restored afterwards), so individuals evaluated on the same scenarios face the same
+    arenas. None plays an unseeded game.
+
+    If stats is given (a StatsWriter, or GameRecords), the generation, individual, game
+    index, score, survival, fitness and ticks of each game are appended to it (TRAINER_FIELDS).
+    """
+    from brains.Group1_CharlesK import GeneticHunterBrain
+
+    engine = training_engine()
+    fitnesses = []
+    for game_index, scenario in enumerate(scenarios):
+        # The brain plays 'params' directly: nothing goes through best_brain_params.json,
+        # so processes can evaluate different individuals at the same time
+        brain = GeneticHunterBrain(params=dict(params))
+        if scenario is None:
+            result = engine.run_single_game(brain)
+        else:
+            seed, mirrored = scenario
+            result = engine.run_single_game(brain, seed=seed,
+                                            starting_positions=seeded_starting_positions(seed, mirrored=mirrored))
 
         # Score + survival bonus
-        fitness = ship_perso.score
-        if not ship_perso.is_destroyed:
-            fitness += 50
-        total_fitness += fitness
+        fitness = result.score + (SURVIVAL_BONUS if result.survived else 0)
+        fitnesses.append(fitness)
+        if stats is not None:
+            stats.append(generation, individual, game_index, result.score, result.survived, fitness, result.ticks)
 
-    if num_games > 0:
-        return total_fitness / num_games
-    else:
-        return 0
+    return fitnesses
+
+
+def training_engine():
+    """
+    The GameEngine of the process, shared by every evaluation (genetic_training, CMA-ES,
+    island workers, benchmarks): GeneticHunterBrain against game_engine.default_opponents,
+    the regular lineup without the Q-learner, in the training environment of the process.
+    """
+    global _engine
+    if _engine is None:
+        from brains.Group1_CharlesK import GeneticHunterBrain
+        _engine = GameEngine(opponents=default_opponents({GeneticHunterBrain}, DEFAULT_CONFIG.number_of_brains - 1))
+    return _engine
+
+
+###################
+# Common random numbers
+###################
+def draw_scenarios(num_games, mirrored=False):
+    """
+    Scenarios shared by every individual of a generation, drawn from the trainer's random state.
+
+    With mirrored=True the scenarios come in pairs, a seed and the same seed with the start
+    positions reflected through the arena center (antithetic spawns), for the same number of games.
+    """
+    if not mirrored:
+        return [(random.randrange(2 ** 32), False) for _ in range(num_games)]
+    seeds = [random.randrange(2 ** 32) for _ in range((num_games + 1) // 2)]
+    return [(seed, flip) for seed in seeds for flip in (False, True)][:num_games]
+
+
+def crn_variance_reduction(fitness_matrix):
+    """
+    How much the shared scenarios sharpen the comparison of individuals.
+
+    Args:
+        fitness_matrix (list): One row of per-scenario fitnesses per individual.
+
+    Returns:
+        tuple: (factor, scenario share). factor is the variance of a game's fitness around the
+               individual's mean divided by what is left once the scenario effect is removed
+               (two-way ANOVA residual): differences between individuals are as precise as with
+               factor times more independent games. scenario share is the fraction of the
+               game-to-game variance due to the scenario. (None, None) if it cannot be estimated.
+    """
+    rows = [row for row in fitness_matrix if len(row) == len(fitness_matrix[0])]
+    individuals, games = len(rows), len(rows[0]) if rows else 0
+    if individuals < 2 or games < 2:
+        return None, None
+    row_means = [sum(row) / games for row in rows]
+    column_means = [sum(row[j] for row in rows) / individuals for j in range(games)]
+    grand_mean = sum(row_means) / individuals
+    within = (sum((value - row_means[i]) ** 2 for i, row in enumerate(rows) for value in row)
+              / (individuals * (games - 1)))
+    residual = sum((value - row_means[i] - column_means[j] + grand_mean) ** 2
+                   for i, row in enumerate(rows) for j, value in enumerate(row)) / ((individuals - 1) * (games - 1))
+    if within == 0 or residual == 0:
+        return None, None
+    return within / residual, max(0.0, 1 - residual / within)
 
 
 ###################
@@ -151,15 +578,10 @@ def mutate(params, mutation_rate):
             variation = random.uniform(-0.2, 0.2)
             params[k] += variation
 
-    # Example: optional clamping
-    if 'distance_weight' in params:
-        params['distance_weight'] = max(0.1, min(5.0, params['distance_weight']))
-    if 'shoot_accuracy' in params:
-        params['shoot_accuracy'] = max(1, min(40, params['shoot_accuracy']))
-    if 'retreat_threshold' in params:
-        params['retreat_threshold'] = max(0.0, min(1.0, params['retreat_threshold']))
-    if 'aggressiveness' in params:
-        params['aggressiveness'] = max(0.0, min(1.0, params['aggressiveness']))
+    # Clamp to PARAM_BOUNDS
+    for k, (lower, upper) in PARAM_BOUNDS.items():
+        if k in params:
+            params[k] = max(lower, min(upper, params[k]))
 
 
 ###################
@@ -178,31 +600,66 @@ def random_params():
     }
 
 
-###################
-# CSV Logging
-###################
-def create_csv_header_if_needed(csv_file_name):
-    """ Creates the CSV with a header if it does not exist. """
-    if not os.path.exists(csv_file_name):
-        with open(csv_file_name, mode='w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Generation", "Individual", "Fitness", "Params"])
-
-def log_to_csv(csv_file_name, generation, index, fitness, params):
-    """ Appends a line [generation, index, fitness, JSON(params)] into the CSV. """
-    with open(csv_file_name, mode='a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        params_str = json.dumps(params)
-        writer.writerow([generation, index, f"{fitness:.2f}", params_str])
-
-
 ###################
 # Main entry point
 ###################
 if __name__ == "__main__":
-    # Launches the genetic training with default parameters
-    genetic_training(
-        population_size=100,
-        generations=100,
-        mutation_rate=0.1
-    )
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Train the GeneticHunterBrain parameters.')
+    parser.add_argument('--optimizer', choices=OPTIMIZERS, default='ga', help='Genetic algorithm or CMA-ES.')
+    parser.add_argument('--population-size', type=int, default=None,
+                        help='Individuals per generation (default: 100 for ga, the CMA-ES default for cma).')
+    parser.add_argument('--generations', type=int, default=100, help='Number of generations.')
+    parser.add_argument('--mutation-rate', type=float, default=0.1, help='Mutation rate (ga only).')
+    parser.add_argument('--seed', type=int, default=None, help='Seed of the training (games and sampling).')
+    parser.add_argument('--resume', action='store_true', help=f'Continue from {CHECKPOINT_FILE}.')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Wall clock budget in hours; the training stops cleanly once it is spent.')
+    parser.add_argument('--checkpoint', type=str, default=CHECKPOINT_FILE, help='Checkpoint file.')
+    parser.add_argument('--no-crn', action='store_true',
+                        help='Unseeded games per individual instead of common scenarios per generation.')
+    parser.add_argument('--mirrored', action='store_true', help='Pair each scenario with mirrored start positions.')
+    parser.add_argument('--surrogate', choices=SURROGATES, default=None,
+                        help='Screen the candidates with a fitness model fitted on the CSV log (ga only).')
+    parser.add_argument('--surrogate-fraction', type=float, default=SURROGATE_FRACTION,
+                        help='Share of the bred candidates simulated with --surrogate.')
+    parser.add_argument('--binary-log', action='store_true', help=f'Also log the individuals to {BINARY_LOG_FILE}.')
+    parser.add_argument('--islands', type=int, default=None,
+                        help='Island model: split the population into this many processes (ga only, no --resume).')
+    parser.add_argument('--migration-interval', type=int, default=MIGRATION_INTERVAL,
+                        help='Generations between two migrations (islands).')
+    parser.add_argument('--migrants', type=int, default=MIGRANTS, help='Best individuals sent per migration (islands).')
+    args = parser.parse_args()
+
+    if args.islands:
+        if args.optimizer != 'ga' or args.resume or args.surrogate:
+            parser.error("--islands only runs the genetic algorithm, without --resume or --surrogate.")
+        island_training(
+            islands=args.islands,
+            population_size=args.population_size or 100,
+            generations=args.generations,
+            mutation_rate=args.mutation_rate,
+            migration_interval=args.migration_interval,
+            migrants=args.migrants,
+            seed=args.seed,
+            time_budget=args.time_budget * 3600 if args.time_budget else None,
+            common_random_numbers=not args.no_crn,
+            mirrored=args.mirrored,
+            binary_log=args.binary_log
+        )
+    else:
+        # Launches the training (the genetic algorithm with default parameters if no option is given)
+        genetic_training(
+            population_size=args.population_size,
+            generations=args.generations,
+            mutation_rate=args.mutation_rate,
+            optimizer=args.optimizer,
+            seed=args.seed,
+            resume=args.resume,
+            time_budget=args.time_budget * 3600 if args.time_budget else None,
+            checkpoint_file=args.checkpoint,
+            common_random_numbers=not args.no_crn,
+            mirrored=args.mirrored,
+            surrogate=args.surrogate,
+            surrogate_fraction=args.surrogate_fraction,
+            binary_log=args.binary_log
+        )
\ No newline at end of file
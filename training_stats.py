@@ -0,0 +1,306 @@
+# training_stats.py
+"""
+Buffered binary stats logs for training runs.
+
+A stats file is a small header (magic, then a JSON description of the record dtype)
+padded to 64 bytes, followed by fixed-size NumPy records. Writers keep records in a
+preallocated structured array and append them in chunks with a single write, so
+logging a game costs a few array stores instead of an open/format/close cycle.
+Loaders memory-map the records straight into a structured array (or a DataFrame)
+without parsing; a record cut short by a crash is ignored.
+
+Record layouts:
+    QLEARNING_FIELDS  one record per Q-learner episode (brains/qlearning_brain.py, qlearning_actors.py)
+    GAME_FIELDS       one record per ship per game (space_game.main in training mode)
+    TRAINER_FIELDS    one record per evaluation game of the genetic trainer (trainer.py)
+    INDIVIDUAL_FIELDS one record per individual of the genetic trainer, followed by one
+                      float field per parameter (IndividualLog, next to its CSV log)
+
+Usage:
+    python training_stats.py import qlearning_stats-*.txt   # Converts the old text logs
+    python training_stats.py show game_stats-*.bin
+"""
+import io
+import os
+import re
+import csv
+import json
+import atexit
+import argparse
+
+import numpy as np
+
+MAGIC = b'SGSTATS1'
+HEADER_ALIGNMENT = 64
+CHUNK_SIZE = 256  # Records buffered between two writes
+
+QLEARNING_FIELDS = [('score', '<i4'), ('reward', '<f8'), ('epsilon', '<f8'), ('won', '?'),
+                    ('states', '<i4')]  # Q-table size after the episode, -1 if unknown
+GAME_FIELDS = [('game', '<i4'), ('brain', 'S32'), ('score', '<i4'), ('won', '?'), ('destroyed', '?'),
+               ('ticks', '<i4')]
+TRAINER_FIELDS = [('generation', '<i4'), ('individual', '<i4'), ('game', '<i4'), ('score', '<i4'),
+                  ('survived', '?'), ('fitness', '<f8'), ('ticks', '<i4')]
+INDIVIDUAL_FIELDS = [('generation', '<i4'), ('individual', '<i4'), ('fitness', '<f8')]
+INDIVIDUAL_COLUMNS = ["Generation", "Individual", "Fitness"]  # CSV header, followed by the parameter names
+
+TEXT_LOG_PATTERN = re.compile(r"Score: (-?\d+), Total Reward: ([-+.\deE]+|nan), Epsilon: ([-+.\deE]+), Won: (True|False)")
+
+
+def encode_header(dtype):
+    description = json.dumps({'fields': [[name, dtype.fields[name][0].str] for name in dtype.names]}).encode()
+    header = MAGIC + len(description).to_bytes(4, 'little') + description
+    return header + b' ' * (-len(header) % HEADER_ALIGNMENT)
+
+
+def read_header(path):
+    """
+    Returns:
+        tuple: (record dtype, header size in bytes).
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a stats file.")
+        length = int.from_bytes(f.read(4), 'little')
+        description = json.loads(f.read(length))
+    header_size = len(MAGIC) + 4 + length
+    header_size += -header_size % HEADER_ALIGNMENT
+    return np.dtype([tuple(field) for field in description['fields']]), header_size
+
+
+class StatsWriter:
+    """
+    Appends records to a stats file, CHUNK_SIZE at a time.
+
+    Args:
+        path (str): Stats file, created with a header if missing. An existing file must
+                    have the same record layout.
+        fields (list): Record layout, e.g. QLEARNING_FIELDS.
+        chunk_size (int): Records buffered before they are written.
+
+    Buffered records are also written when the interpreter exits (e.g. a training run
+    stopped with Ctrl+C); only a hard crash loses the last chunk. Each chunk is written
+    with a single write followed by fsync, and a record cut short by a crash is dropped
+    when the file is opened again, so later records stay aligned.
+    """
+
+    def __init__(self, path, fields, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.dtype = np.dtype(fields)
+        if os.path.exists(path) and os.path.getsize(path):
+            existing, header_size = read_header(path)
+            if existing != self.dtype:
+                raise ValueError(f"{path} holds {existing} records, not {self.dtype}.")
+            size = os.path.getsize(path)
+            complete = header_size + max(0, size - header_size) // self.dtype.itemsize * self.dtype.itemsize
+            if size != complete:
+                # Drop the partial last record of an interrupted write
+                os.truncate(path, complete)
+        else:
+            with open(path, 'wb') as f:
+                f.write(encode_header(self.dtype))
+        self.buffer = np.zeros(chunk_size, dtype=self.dtype)
+        self._empty = np.zeros((), dtype=self.dtype)
+        self.count = 0
+        atexit.register(self.flush)
+
+    def append(self, *values, **named):
+        """Adds one record, given in field order or by field name (missing fields are zero)."""
+        if values:
+            self.buffer[self.count] = values
+        else:
+            self.buffer[self.count] = self._empty
+            for name, value in named.items():
+                self.buffer[name][self.count] = value
+        self.count += 1
+        if self.count == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        if self.count:
+            with open(self.path, 'ab') as f:
+                f.write(self.buffer[:self.count].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            self.count = 0
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class IndividualLog:
+    """
+    Log of the individuals evaluated by the genetic trainer, buffered until flush()
+    (once per generation).
+
+    The CSV has typed columns, INDIVIDUAL_COLUMNS then one per parameter, so it loads
+    without parsing JSON (pandas.read_csv). A CSV in the old layout (a JSON "Params"
+    column) is converted when opened. Each flush appends the buffered rows with a
+    single write followed by fsync, and a row cut short by a crash is dropped when the
+    file is opened again. With binary_path, the same records also go to a stats file
+    (INDIVIDUAL_FIELDS plus the parameters, see load_stats_frame) through a StatsWriter,
+    which has the same guarantees.
+
+    Args:
+        path (str): CSV file, created with a header if missing.
+        param_names (list): Parameters logged, one column each (missing values are left empty).
+        binary_path (str): Optional stats file.
+    """
+
+    def __init__(self, path, param_names, binary_path=None):
+        self.path = path
+        self.param_names = list(param_names)
+        self.header = INDIVIDUAL_COLUMNS + self.param_names
+        self.rows = []
+        self._open_csv()
+        self.binary = None
+        if binary_path:
+            fields = INDIVIDUAL_FIELDS + [(name, '<f8') for name in self.param_names]
+            self.binary = StatsWriter(binary_path, fields, chunk_size=CHUNK_SIZE)
+        atexit.register(self.flush)
+
+    def _open_csv(self):
+        if not os.path.exists(self.path) or not os.path.getsize(self.path):
+            with open(self.path, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(self.header)
+            return
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if not data.endswith(b'\n'):
+                # Drop the partial last row of an interrupted write
+                f.truncate(data.rfind(b'\n') + 1)
+        with open(self.path, newline='', encoding='utf-8') as f:
+            header = next(csv.reader(f), [])
+        if header == INDIVIDUAL_COLUMNS + ["Params"]:
+            convert_params_csv(self.path, self.param_names)
+        elif header != self.header:
+            raise ValueError(f"{self.path} has the columns {header}, not {self.header}.")
+
+    def append(self, generation, individual, fitness, params):
+        self.rows.append([generation, individual, f"{fitness:.2f}"] + [params.get(name, '') for name in self.param_names])
+        if self.binary is not None:
+            self.binary.append(generation, individual, fitness,
+                               *(params.get(name, np.nan) for name in self.param_names))
+
+    def flush(self):
+        if self.rows:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(self.rows)
+            with open(self.path, 'a', newline='', encoding='utf-8') as f:
+                f.write(buffer.getvalue())
+                f.flush()
+                os.fsync(f.fileno())
+            self.rows = []
+        if self.binary is not None:
+            self.binary.flush()
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+        if self.binary is not None:
+            self.binary.close()
+
+
+def convert_params_csv(path, param_names):
+    """
+    Rewrites a trainer CSV log of the old layout (generation, individual, fitness and the
+    params as a JSON string) with one column per parameter, atomically.
+    """
+    from artifacts import save_atomic
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))[1:]
+
+    def write(temporary):
+        with open(temporary, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(INDIVIDUAL_COLUMNS + list(param_names))
+            for row in rows:
+                try:
+                    params = json.loads(row[3])
+                except (IndexError, ValueError):
+                    continue  # Row cut short
+                writer.writerow(row[:3] + [params.get(name, '') for name in param_names])
+    save_atomic(path, write)
+    print(f"Converted {path} ({len(rows)} rows) to one column per parameter.")
+
+
+def load_stats(path):
+    """
+    Memory-maps the records of a stats file.
+
+    Returns:
+        np.ndarray: Read-only structured array (empty if no record was written yet).
+    """
+    dtype, header_size = read_header(path)
+    count = (os.path.getsize(path) - header_size) // dtype.itemsize
+    if count <= 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=header_size, shape=(count,))
+
+
+def load_stats_frame(path):
+    """The records as a pandas DataFrame, byte string columns decoded to str."""
+    import pandas as pd
+
+    records = load_stats(path)
+    frame = pd.DataFrame({name: np.asarray(records[name]) for name in records.dtype.names})
+    for name in records.dtype.names:
+        if records.dtype[name].kind == 'S':
+            frame[name] = frame[name].str.decode('utf-8')
+    return frame
+
+
+def import_text_log(text_path, output_path=None):
+    """
+    Converts a Q-learner text log ("Score: 30, Total Reward: -1030.4, Epsilon: 1.0, Won: False"
+    per line) to a stats file with QLEARNING_FIELDS records (states is -1).
+
+    Returns:
+        tuple: (output path, number of records).
+    """
+    with open(text_path, encoding='utf-8') as f:
+        matches = TEXT_LOG_PATTERN.findall(f.read())
+    records = np.zeros(len(matches), dtype=np.dtype(QLEARNING_FIELDS))
+    if matches:
+        scores, rewards, epsilons, wins = zip(*matches)
+        records['score'] = np.array(scores, dtype=np.int64)
+        records['reward'] = np.array(rewards, dtype=float)
+        records['epsilon'] = np.array(epsilons, dtype=float)
+        records['won'] = np.array(wins) == 'True'
+    records['states'] = -1
+
+    output_path = output_path or os.path.splitext(text_path)[0] + '.bin'
+    with open(output_path, 'wb') as f:
+        f.write(encode_header(records.dtype))
+        f.write(records.tobytes())
+    return output_path, len(records)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Binary training stats logs.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import', help='Convert Q-learner text logs.')
+    import_parser.add_argument('files', nargs='+', help='qlearning_stats-*.txt files.')
+    show_parser = subparsers.add_parser('show', help='Summarize stats files.')
+    show_parser.add_argument('files', nargs='+', help='Stats files.')
+    args = parser.parse_args()
+
+    for path in args.files:
+        if args.command == 'import':
+            output_path, count = import_text_log(path)
+            print(f"{path} ({os.path.getsize(path)} bytes) -> {output_path} ({os.path.getsize(output_path)} bytes, "
+                  f"{count} records)")
+        else:
+            records = load_stats(path)
+            print(f"{path}: {len(records)} records")
+            for name in records.dtype.names:
+                column = np.asarray(records[name])
+                if column.dtype.kind in 'biuf' and len(column):
+                    print(f"  {name:>12}: mean {column.mean():12.3f}  min {column.min():12.3f}  max {column.max():12.3f}")
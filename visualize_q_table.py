@@ -1,104 +1,309 @@
+"""
+Visualizations of a Q-table, one subcommand each:
+
+    python visualize_q_table.py summary [--file q_table-....npz]
+    python visualize_q_table.py heatmaps | umap | tsne | policy | ...
+    python visualize_q_table.py [all] [--file ...]     # Every plot, one after the other
+
+The plotting libraries (pandas, matplotlib, seaborn, umap, scikit-learn, plotly) are
+imported by the functions that use them, so a subcommand only pays for its own
+(SUBCOMMANDS lists them; `summary` needs none of them).
+"""
 import os
 import pickle
+import hashlib
 import argparse
+import importlib
+import importlib.util
 from datetime import datetime
 
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-from sklearn.manifold import TSNE
-import umap
-import plotly.express as px
-import matplotlib.patches as patches
+from q_table import QTable, ACTIONS
+from artifacts import ArtifactRegistry, Q_TABLE
+
+ACTION_NAMES = [action.name for action in ACTIONS]
+
+# Embeddings (UMAP, t-SNE) are cached next to the Q-table, keyed by its content hash
+EMBEDDING_CACHE_DIR = '.q_table_cache'
+MAX_EMBEDDING_STATES = 20000  # Larger tables are embedded on a stratified sample
+PCA_CHUNK_SIZE = 100000       # States per chunk of the incremental PCA
+
+# Subcommand -> (help, modules it imports)
+SUBCOMMANDS = {
+    'summary': ('Print table statistics (no plotting libraries).', []),
+    'distribution': ('Q-value histogram and average Q-value per action.', ['pandas', 'matplotlib.pyplot', 'seaborn']),
+    'heatmaps': ('Average and per-action Q-value heatmaps over two features.', ['pandas', 'matplotlib.pyplot', 'seaborn']),
+    'policy': ('Best action per state on a feature grid.', ['pandas', 'matplotlib.pyplot']),
+    'umap': ('UMAP clustering of the states.', ['pandas', 'matplotlib.pyplot', 'seaborn', 'umap']),
+    'tsne': ('Interactive t-SNE of the states.', ['pandas', 'sklearn.manifold', 'plotly.express']),
+    'pca': ('PCA projection of all states.', ['pandas', 'matplotlib.pyplot']),
+    'boxplots': ('Box and violin plots of the Q-values per action.', ['pandas', 'matplotlib.pyplot', 'seaborn']),
+    'correlation': ('Correlation matrix of the state features and best Q-values.',
+                    ['pandas', 'matplotlib.pyplot', 'seaborn']),
+}
+SUBCOMMANDS['all'] = ('Every visualization (default).',
+                      list(dict.fromkeys(module for _, modules in SUBCOMMANDS.values() for module in modules)))
+
+
+def missing_modules(command):
+    """Modules of a subcommand that are not installed."""
+    return [module for module in SUBCOMMANDS[command][1] if importlib.util.find_spec(module.split('.')[0]) is None]
+
 
-# Ensure plots use a style that is visually appealing
-sns.set(style='whitegrid')
+def import_dependencies(command):
+    """Imports the modules of a subcommand (benchmarks/bench_visualize_imports.py times this)."""
+    for module in SUBCOMMANDS[command][1]:
+        importlib.import_module(module)
 
 
-def find_latest_q_table(directory='.'):
+def seaborn():
+    import seaborn as sns
+    # Ensure plots use a style that is visually appealing
+    sns.set(style='whitegrid')
+    return sns
+
+
+def find_latest_q_table(directory='.', tag='latest'):
     """
-    Finds the latest Q-table pickle file in the given directory.
+    Finds a registered Q-table file (.npz or older .pkl) in the given directory.
     
     Args:
         directory (str): The directory to search in.
+        tag (str): 'latest', 'best' or a run id (see artifacts.py).
     
     Returns:
-        str: The filename of the latest Q-table pickle file.
+        str: The filename of the Q-table file.
     """
-    pkl_files = [f for f in os.listdir(directory) if f.startswith('q_table-') and f.endswith('.pkl')]
-    if not pkl_files:
-        raise FileNotFoundError("No Q-table pickle files found in the specified directory.")
-    latest_file = max(pkl_files, key=lambda x: os.path.getctime(os.path.join(directory, x)))
-    return os.path.join(directory, latest_file)
+    path = ArtifactRegistry(directory).find(Q_TABLE, tag)
+    if path is None:
+        raise FileNotFoundError(f"No Q-table file registered as '{tag}' in the specified directory.")
+    return path
 
 
 def load_q_table(file_path):
     """
-    Loads the Q-table from a pickle file.
+    Loads the Q-table from an .npz (q_table.QTable) or pickle file.
     
     Args:
-        file_path (str): Path to the pickle file.
+        file_path (str): Path to the Q-table file.
     
     Returns:
-        tuple: The Q-table dictionary and epsilon value.
+        tuple: The QTable and epsilon value.
     """
-    with open(file_path, 'rb') as f:
-        data = pickle.load(f)
-        q_table = data.get('q_table', {})
+    if file_path.endswith('.npz'):
+        table, metadata = QTable.load(file_path)
+        epsilon = metadata.get('epsilon')
+    else:
+        with open(file_path, 'rb') as f:
+            data = pickle.load(f)
+        table = QTable.from_dict(data.get('q_table', {}))
         epsilon = data.get('epsilon', None)
-    print(f"Loaded Q-table from {file_path}. Total states: {len(q_table)}. Epsilon: {epsilon}")
-    return q_table, epsilon
+    print(f"Loaded Q-table from {file_path}. Total states: {len(table)}. Epsilon: {epsilon}")
+    return table, epsilon
+
+
+def file_digest(file_path):
+    """SHA-1 of a file's content, the cache key of everything derived from a Q-table."""
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
+def state_feature_columns(table, ordinals, repeat=1):
+    """Categorical label columns state_feature_1... built from (states, features) ordinals."""
+    import pandas as pd
 
-def q_table_to_dataframe(q_table):
+    return {
+        f'state_feature_{idx+1}': pd.Categorical.from_codes(np.repeat(ordinals[:, idx], repeat), feature.labels)
+        for idx, feature in enumerate(table.schema.features)
+    }
+
+
+def q_table_to_dataframe(table):
     """
-    Converts the Q-table dictionary to a pandas DataFrame.
+    Converts the Q-table to a pandas DataFrame with one row per (state, action).
+    
+    The columns are built from the table arrays in one go: 'state' is the integer state
+    code, 'action' and the state features are categoricals.
     
     Args:
-        q_table (dict): The Q-table dictionary.
+        table (QTable): The Q-table.
     
     Returns:
         pd.DataFrame: DataFrame with state features, actions, and Q-values.
     """
-    records = []
-    for state, actions in q_table.items():
-        state_features = state  # Assuming state is a tuple of feature labels
-        for action, q_value in actions.items():
-            record = {
-                'state': state,
-                'action': action.name if hasattr(action, 'name') else str(action),
-                'q_value': q_value
-            }
-            # Optionally, split state features into separate columns
-            for idx, feature in enumerate(state_features):
-                record[f'state_feature_{idx+1}'] = feature
-            records.append(record)
-    df = pd.DataFrame(records)
+    import pandas as pd
+
+    codes = table.state_codes()
+    values = table.q_values()
+    num_actions = values.shape[1]
+    columns = {
+        'state': np.repeat(codes, num_actions),
+        'action': pd.Categorical.from_codes(np.tile(np.arange(num_actions), len(codes)), ACTION_NAMES),
+        'q_value': values.ravel(),
+    }
+    columns.update(state_feature_columns(table, table.schema.decode_many(codes), repeat=num_actions))
+    df = pd.DataFrame(columns)
     print(f"Converted Q-table to DataFrame with {len(df)} records.")
     return df
 
 
-def visualize_policy(df):
+def best_action_per_state(table):
+    """
+    Per-state aggregates, computed once from the table arrays (instead of a groupby/idxmax
+    for every plot).
+    
+    Args:
+        table (QTable): The Q-table.
+    
+    Returns:
+        pd.DataFrame: One row per state, in table order: 'state', best 'action', its 'q_value',
+                      'mean_q_value', 'visits' and the state features.
+    """
+    import pandas as pd
+
+    codes = table.state_codes()
+    values = table.q_values()
+    best = values.argmax(axis=1)
+    columns = {
+        'state': codes,
+        'action': pd.Categorical.from_codes(best, ACTION_NAMES),
+        'q_value': values[np.arange(len(codes)), best],
+        'mean_q_value': values.mean(axis=1),
+        'visits': table.visit_counts().sum(axis=1),
+    }
+    columns.update(state_feature_columns(table, table.schema.decode_many(codes)))
+    return pd.DataFrame(columns)
+
+
+def one_hot_states(table, rows=None):
+    """
+    One-hot encoding of the state features, the input of the embeddings.
+    
+    Args:
+        table (QTable): The Q-table.
+        rows (np.ndarray): Rows of the table to encode (all if None).
+    
+    Returns:
+        np.ndarray: float32 array of shape (states, sum of the feature radices).
+    """
+    codes = table.state_codes() if rows is None else table.state_codes()[rows]
+    ordinals = table.schema.decode_many(codes)
+    offsets = np.concatenate(([0], np.cumsum(table.schema.radices[:-1])))
+    X = np.zeros((len(codes), int(table.schema.radices.sum())), dtype=np.float32)
+    X[np.arange(len(codes))[:, None], ordinals + offsets] = 1
+    return X
+
+
+def stratified_sample(labels, size, seed=0):
+    """
+    Indices of about `size` rows drawn so every label keeps its share (and at least one row).
+    
+    Args:
+        labels (np.ndarray): Stratum of each row (e.g. the best action).
+    
+    Returns:
+        np.ndarray: Sorted row indices.
+    """
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(labels)
+    indices = []
+    for label in np.unique(labels):
+        members = np.flatnonzero(labels == label)
+        take = max(1, round(len(members) * size / len(labels)))
+        indices.append(rng.choice(members, size=min(take, len(members)), replace=False))
+    return np.sort(np.concatenate(indices))
+
+
+def incremental_pca(table, n_components=2, chunk_size=PCA_CHUNK_SIZE):
+    """
+    PCA of the one-hot states, accumulated chunk by chunk so memory stays bounded for
+    tables with millions of states.
+    
+    Returns:
+        np.ndarray: (states, n_components) projection.
+    """
+    n = len(table)
+    width = int(table.schema.radices.sum())
+    total = np.zeros(width)
+    scatter = np.zeros((width, width))
+    for start in range(0, n, chunk_size):
+        X = one_hot_states(table, np.arange(start, min(start + chunk_size, n))).astype(np.float64)
+        total += X.sum(axis=0)
+        scatter += X.T @ X
+    mean = total / n
+    covariance = scatter / n - np.outer(mean, mean)
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    components = eigenvectors[:, ::-1][:, :n_components]
+    projection = np.empty((n, n_components), dtype=np.float32)
+    for start in range(0, n, chunk_size):
+        rows = np.arange(start, min(start + chunk_size, n))
+        projection[rows] = (one_hot_states(table, rows) - mean) @ components
+    return projection
+
+
+def cached_embedding(cache_key, name, compute):
+    """
+    Loads an embedding from the cache, or computes and stores it.
+    
+    Args:
+        cache_key (tuple): (cache directory, Q-table file digest), None to disable caching.
+        name (str): Method and parameters, e.g. 'umap-15-0.1-20000'.
+        compute (callable): Returns (row indices, embedding) when the cache misses.
+    
+    Returns:
+        tuple: (row indices, embedding).
+    """
+    if cache_key is None:
+        return compute()
+    cache_dir, digest = cache_key
+    path = os.path.join(cache_dir, f"{digest}-{name}.npz")
+    if os.path.exists(path):
+        with np.load(path) as data:
+            print(f"Using cached {name} embedding from {path}")
+            return data['indices'], data['embedding']
+    indices, embedding = compute()
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez(path, indices=indices, embedding=embedding)
+    return indices, embedding
+
+
+def embedding_sample(states, max_states=MAX_EMBEDDING_STATES):
+    """All state rows, or a sample stratified by best action for large tables."""
+    if len(states) <= max_states:
+        return np.arange(len(states))
+    print(f"{len(states)} states: embedding a stratified sample of about {max_states}.")
+    return stratified_sample(states['action'].cat.codes.to_numpy(), max_states)
+
+
+def feature_columns(df):
+    return [col for col in df.columns if col.startswith('state_feature_')]
+
+
+def visualize_policy(states):
     """
     Visualizes the optimal policy on a grid if states have spatial features.
     
     Args:
-        df (pd.DataFrame): The Q-table DataFrame.
+        states (pd.DataFrame): Per-state best actions (best_action_per_state).
     """
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
     # Extract spatial features
-    feature_cols = [col for col in df.columns if col.startswith('state_feature_')]
+    feature_cols = feature_columns(states)
     
     if len(feature_cols) < 2:
         print("Policy visualization requires at least two state features for spatial representation.")
         return
     
-    # Assuming the first two features are x and y coordinates
+    # Assuming the first two features are x and y coordinates (bin ordinals of the categoricals)
     x_col, y_col = feature_cols[:2]
-    
-    # Determine the best action for each state
-    best_actions = df.loc[df.groupby('state')['q_value'].idxmax()]
+    xs = states[x_col].cat.codes.to_numpy()
+    ys = states[y_col].cat.codes.to_numpy()
     
     # Create a grid
     plt.figure(figsize=(10, 8))
@@ -112,16 +317,13 @@ def visualize_policy(df):
         'right': (0.4, 0)
     }
     
-    # Plot each state with an arrow indicating the best action
-    for _, row in best_actions.iterrows():
-        x = row[x_col]
-        y = row[y_col]
-        action = row['action'].lower()
-        
-        dx, dy = action_directions.get(action, (0, 0))  # Default to no movement if action not recognized
-        
-        ax.arrow(x, y, dx, dy, head_width=0.1, head_length=0.1, fc='k', ec='k')
-        ax.plot(x, y, 'ko')  # Mark the state location
+    # One arrow per distinct (x, y, best action), a quiver call instead of one arrow per state
+    cells = pd.DataFrame({'x': xs, 'y': ys, 'action': states['action'].astype(str).str.lower()}).drop_duplicates()
+    directions = np.array([action_directions.get(action, (0, 0)) for action in cells['action']]).reshape(-1, 2)
+    ax.quiver(cells['x'], cells['y'], directions[:, 0], directions[:, 1], angles='xy', scale_units='xy', scale=1)
+    ax.plot(cells['x'], cells['y'], 'ko')  # Mark the state locations
+    ax.set_xticks(range(len(states[x_col].cat.categories)), states[x_col].cat.categories, rotation=45)
+    ax.set_yticks(range(len(states[y_col].cat.categories)), states[y_col].cat.categories)
     
     plt.title('Optimal Policy Visualization')
     plt.xlabel(x_col)
@@ -137,20 +339,24 @@ def action_specific_heatmaps(df):
     Args:
         df (pd.DataFrame): The Q-table DataFrame.
     """
-    feature_cols = [col for col in df.columns if col.startswith('state_feature_')]
+    import matplotlib.pyplot as plt
+    sns = seaborn()
+
+    feature_cols = feature_columns(df)
     if len(feature_cols) < 2:
         print("Action-specific heatmaps require at least two state features.")
         return
     
     feature_x, feature_y = feature_cols[:2]
-    actions = df['action'].unique()
+    # One groupby for all actions instead of a filter and pivot per action
+    means = df.groupby(['action', feature_y, feature_x], observed=True)['q_value'].mean()
+    actions = means.index.get_level_values('action').unique()
     
     num_actions = len(actions)
     fig, axes = plt.subplots(1, num_actions, figsize=(6 * num_actions, 5), squeeze=False)
     
     for idx, action in enumerate(actions):
-        action_df = df[df['action'] == action]
-        pivot_table = action_df.pivot_table(index=feature_y, columns=feature_x, values='q_value', aggfunc='mean')
+        pivot_table = means.loc[action].unstack(feature_x)
         sns.heatmap(pivot_table, cmap='viridis', ax=axes[0, idx], cbar=(idx == 0))
         axes[0, idx].set_title(f'Heatmap of Q-Values for Action: {action}')
         axes[0, idx].set_xlabel(feature_x)
@@ -160,28 +366,32 @@ def action_specific_heatmaps(df):
     plt.show()
 
 
-def cluster_states_umap(df):
+def cluster_states_umap(table, states, cache_key=None):
     """
     Clusters states using UMAP and visualizes the clusters.
     
     Args:
-        df (pd.DataFrame): The Q-table DataFrame.
+        table (QTable): The Q-table.
+        states (pd.DataFrame): Per-state best actions (best_action_per_state).
+        cache_key (tuple): Embedding cache (see cached_embedding).
     """
-    feature_cols = [col for col in df.columns if col.startswith('state_feature_')]
-    if not feature_cols:
+    import matplotlib.pyplot as plt
+    sns = seaborn()
+
+    if not feature_columns(states):
         print("No state feature columns found for clustering.")
         return
     
-    # Aggregate Q-values by state
-    state_best = df.loc[df.groupby('state')['q_value'].idxmax()]
-    X = state_best[feature_cols].values
-    
-    # Apply UMAP
-    reducer = umap.UMAP(n_neighbors=15, min_dist=0.1, metric='euclidean', random_state=42)
-    embedding = reducer.fit_transform(X)
+    def compute():
+        import umap
+
+        rows = embedding_sample(states)
+        # Apply UMAP on the one-hot features, the bins are categories and not distances
+        reducer = umap.UMAP(n_neighbors=15, min_dist=0.1, metric='euclidean', random_state=42)
+        return rows, reducer.fit_transform(one_hot_states(table, rows))
     
-    state_best['umap_1'] = embedding[:, 0]
-    state_best['umap_2'] = embedding[:, 1]
+    rows, embedding = cached_embedding(cache_key, f'umap-15-0.1-{MAX_EMBEDDING_STATES}', compute)
+    state_best = states.iloc[rows].assign(umap_1=embedding[:, 0], umap_2=embedding[:, 1])
     
     plt.figure(figsize=(12, 8))
     sns.scatterplot(
@@ -200,25 +410,34 @@ def cluster_states_umap(df):
     plt.show()
 
 
-def interactive_tsne(df):
+def interactive_tsne(table, states, cache_key=None):
     """
     Creates an interactive t-SNE visualization using Plotly.
     
     Args:
-        df (pd.DataFrame): The Q-table DataFrame.
+        table (QTable): The Q-table.
+        states (pd.DataFrame): Per-state best actions (best_action_per_state).
+        cache_key (tuple): Embedding cache (see cached_embedding).
     """
-    feature_columns = [col for col in df.columns if col.startswith('state_feature_')]
-    if not feature_columns:
+    feature_cols = feature_columns(states)
+    if not feature_cols:
         print("No state feature columns found for t-SNE visualization.")
         return
     
-    state_best = df.loc[df.groupby('state')['q_value'].idxmax()]
-    state_features = pd.get_dummies(state_best[feature_columns])
-    
-    tsne = TSNE(n_components=2, random_state=42, perplexity=30, n_iter=1000)
-    tsne_results = tsne.fit_transform(state_features)
-    state_best['tsne_1'] = tsne_results[:, 0]
-    state_best['tsne_2'] = tsne_results[:, 1]
+    def compute():
+        from sklearn.manifold import TSNE
+
+        rows = embedding_sample(states)
+        X = one_hot_states(table, rows)
+        # t-SNE is quadratic in the states: start it from the (cheap) PCA projection
+        init = 'pca' if len(rows) == len(table) else 'random'
+        tsne = TSNE(n_components=2, random_state=42, perplexity=min(30, max(1, len(rows) - 1)), init=init)
+        return rows, tsne.fit_transform(X)
+    
+    import plotly.express as px
+
+    rows, tsne_results = cached_embedding(cache_key, f'tsne-30-{MAX_EMBEDDING_STATES}', compute)
+    state_best = states.iloc[rows].assign(tsne_1=tsne_results[:, 0], tsne_2=tsne_results[:, 1])
     
     fig = px.scatter(
         state_best,
@@ -227,12 +446,39 @@ def interactive_tsne(df):
         color='action',
         title='Interactive t-SNE Visualization of States Colored by Best Action',
         labels={'tsne_1': 't-SNE Dimension 1', 'tsne_2': 't-SNE Dimension 2'},
-        hover_data=feature_columns
+        hover_data=feature_cols
     )
     fig.update_layout(legend=dict(title='Action'), width=800, height=600)
     fig.show()
 
 
+def pca_projection(table, states, cache_key=None):
+    """
+    Plots the states on their first two principal components, colored by best action.
+    Unlike UMAP and t-SNE this scales to every state of the table (incremental_pca).
+    
+    Args:
+        table (QTable): The Q-table.
+        states (pd.DataFrame): Per-state best actions (best_action_per_state).
+        cache_key (tuple): Embedding cache (see cached_embedding).
+    """
+    import matplotlib.pyplot as plt
+
+    rows, projection = cached_embedding(cache_key, 'pca-2',
+                                        lambda: (np.arange(len(table)), incremental_pca(table)))
+    plt.figure(figsize=(12, 8))
+    for code, action in enumerate(states['action'].cat.categories):
+        selected = (states['action'].cat.codes.to_numpy()[rows] == code)
+        if selected.any():
+            plt.scatter(projection[selected, 0], projection[selected, 1], s=4, alpha=0.5, label=action)
+    plt.title('PCA Projection of States Colored by Best Action')
+    plt.xlabel('Principal Component 1')
+    plt.ylabel('Principal Component 2')
+    plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.tight_layout()
+    plt.show()
+
+
 def box_violin_plots(df):
     """
     Creates box and violin plots for Q-values across different actions.
@@ -240,6 +486,9 @@ def box_violin_plots(df):
     Args:
         df (pd.DataFrame): The Q-table DataFrame.
     """
+    import matplotlib.pyplot as plt
+    sns = seaborn()
+
     plt.figure(figsize=(14, 6))
     
     # Box Plot
@@ -262,23 +511,25 @@ def box_violin_plots(df):
     plt.show()
 
 
-def correlation_matrix(df):
+def correlation_matrix(states):
     """
     Plots a correlation matrix of state features and Q-values.
     
     Args:
-        df (pd.DataFrame): The Q-table DataFrame.
+        states (pd.DataFrame): Per-state best actions (best_action_per_state).
     """
-    feature_cols = [col for col in df.columns if col.startswith('state_feature_')]
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    sns = seaborn()
+
+    feature_cols = feature_columns(states)
     if not feature_cols:
         print("No state feature columns found for correlation matrix.")
         return
     
-    # Aggregate Q-values by state
-    state_best = df.loc[df.groupby('state')['q_value'].idxmax()]
-    
-    # Select relevant columns
-    corr_df = state_best[feature_cols + ['q_value']]
+    # Bin ordinals of the categorical features, next to the best Q-value of each state
+    corr_df = pd.DataFrame({col: states[col].cat.codes for col in feature_cols})
+    corr_df['q_value'] = states['q_value']
     
     # Compute correlation matrix
     corr = corr_df.corr()
@@ -290,14 +541,18 @@ def correlation_matrix(df):
     plt.show()
 
 
-def create_visualizations(df, epsilon):
+def q_value_distribution(df, table):
     """
-    Creates and displays various visualizations from the Q-table DataFrame.
+    Plots the distribution of the Q-values and the average Q-value per action.
     
     Args:
         df (pd.DataFrame): The Q-table DataFrame.
-        epsilon (float): The current epsilon value.
+        table (QTable): The Q-table.
     """
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    sns = seaborn()
+
     # Q-Value Distribution
     plt.figure(figsize=(10, 6))
     sns.histplot(df['q_value'], bins=50, kde=True, color='skyblue')
@@ -307,9 +562,9 @@ def create_visualizations(df, epsilon):
     plt.tight_layout()
     plt.show()
     
-    # Average Q-Value per Action
+    # Average Q-Value per Action (column means of the table)
     plt.figure(figsize=(10, 6))
-    avg_q_per_action = df.groupby('action')['q_value'].mean().sort_values(ascending=False)
+    avg_q_per_action = pd.Series(table.q_values().mean(axis=0), index=ACTION_NAMES).sort_values(ascending=False)
     sns.barplot(x=avg_q_per_action.index, y=avg_q_per_action.values, palette='viridis')
     plt.title('Average Q-Value per Action')
     plt.xlabel('Action')
@@ -317,13 +572,24 @@ def create_visualizations(df, epsilon):
     plt.xticks(rotation=45)
     plt.tight_layout()
     plt.show()
+
+
+def average_heatmap(df):
+    """
+    Heatmap of the average Q-values over two selected state features.
     
-    # Heatmap of Q-Values for two selected state features
-    feature_cols = [col for col in df.columns if col.startswith('state_feature_')]
+    Args:
+        df (pd.DataFrame): The Q-table DataFrame.
+    """
+    import matplotlib.pyplot as plt
+    sns = seaborn()
+
+    feature_cols = feature_columns(df)
     if len(feature_cols) >= 2:
         feature_x = feature_cols[0]
         feature_y = feature_cols[1]
-        pivot_table = df.pivot_table(index=feature_y, columns=feature_x, values='q_value', aggfunc='mean')
+        pivot_table = df.pivot_table(index=feature_y, columns=feature_x, values='q_value', aggfunc='mean',
+                                     observed=True)
         plt.figure(figsize=(12, 8))
         sns.heatmap(pivot_table, cmap='coolwarm', linewidths=.5)
         plt.title(f'Heatmap of Average Q-Values\nFeatures: {feature_x} vs {feature_y}')
@@ -333,57 +599,135 @@ def create_visualizations(df, epsilon):
         plt.show()
     else:
         print("Not enough state features for heatmap visualization.")
+
+
+def print_summary(table, epsilon):
+    """
+    Prints the size of the table and per-action statistics, from the arrays only.
+    
+    Args:
+        table (QTable): The Q-table.
+        epsilon (float): The current epsilon value.
+    """
+    values = table.q_values()
+    visits = table.visit_counts()
+    print(f"States: {len(table)}   Epsilon: {epsilon}")
+    if not len(table):
+        return
+    print(f"Q-values: min {values.min():.2f}  mean {values.mean():.2f}  max {values.max():.2f}")
+    best_counts = np.bincount(values.argmax(axis=1), minlength=len(ACTION_NAMES))
+    print(f"{'Action':>14} {'Mean Q':>10} {'Best in':>8} {'Updates':>10}")
+    for index, name in enumerate(ACTION_NAMES):
+        print(f"{name:>14} {values[:, index].mean():10.2f} {best_counts[index] / len(table):8.1%} "
+              f"{visits[:, index].sum():10d}")
+    ordinals = table.schema.decode_many(table.state_codes())
+    print("Bins seen per state feature:")
+    for index, feature in enumerate(table.schema.features):
+        print(f"  {feature.name:>24}: {len(np.unique(ordinals[:, index]))}/{feature.radix}")
+
+
+def create_visualizations(table, epsilon, cache_key=None, command='all'):
+    """
+    Creates and displays the visualizations of a subcommand.
+    
+    Args:
+        table (QTable): The Q-table.
+        epsilon (float): The current epsilon value.
+        cache_key (tuple): Embedding cache (see cached_embedding), None to recompute.
+        command (str): A SUBCOMMANDS key; 'all' displays every visualization.
+    """
+    if command == 'summary':
+        print_summary(table, epsilon)
+        return
+    run_all = command == 'all'
+    # Only build the frames the command uses
+    df = q_table_to_dataframe(table) if command in ('all', 'distribution', 'heatmaps', 'boxplots') else None
+    states = best_action_per_state(table)
+    
+    if run_all or command == 'distribution':
+        q_value_distribution(df, table)
+    
+    if run_all or command == 'heatmaps':
+        average_heatmap(df)
     
     # Interactive t-SNE Visualization
-    interactive_tsne(df)
+    if run_all or command == 'tsne':
+        interactive_tsne(table, states, cache_key)
     
     # Policy Visualization
-    visualize_policy(df)
+    if run_all or command == 'policy':
+        visualize_policy(states)
     
     # Action-Specific Q-Value Heatmaps
-    action_specific_heatmaps(df)
+    if run_all or command == 'heatmaps':
+        action_specific_heatmaps(df)
     
     # UMAP Clustering of States
-    cluster_states_umap(df)
+    if run_all or command == 'umap':
+        cluster_states_umap(table, states, cache_key)
+    
+    # PCA Projection of all States
+    if run_all or command == 'pca':
+        pca_projection(table, states, cache_key)
     
     # Box and Violin Plots for Q-Values
-    box_violin_plots(df)
+    if run_all or command == 'boxplots':
+        box_violin_plots(df)
     
     # Correlation Matrix
-    correlation_matrix(df)
+    if run_all or command == 'correlation':
+        correlation_matrix(states)
     
     # Display Epsilon
     print(f"Final Epsilon: {epsilon}")
 
 
+def add_common_arguments(parser, default=None):
+    parser.add_argument('--file', type=str, default=default,
+                        help="Path to the Q-table file (.npz or .pkl), or 'latest', 'best' or a run id.")
+    parser.add_argument('--no-cache', action='store_true', default=default or False,
+                        help='Recompute the embeddings instead of using the cache.')
+
+
 def main():
     parser = argparse.ArgumentParser(description='Visualize Q-Table from Q-Learning Brain.')
-    parser.add_argument('--file', type=str, default=None, help='Path to the Q-table pickle file.')
+    add_common_arguments(parser)
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    for name, (help_text, _) in SUBCOMMANDS.items():
+        # SUPPRESS keeps options given before the subcommand
+        add_common_arguments(subparsers.add_parser(name, help=help_text), default=argparse.SUPPRESS)
+    parser.set_defaults(command='all')
     args = parser.parse_args()
     
-    # Determine Q-table file path
-    if args.file:
-        if not os.path.exists(args.file):
-            print(f"Specified file {args.file} does not exist.")
-            return
+    missing = missing_modules(args.command)
+    if missing:
+        print(f"The {args.command} subcommand needs modules that are not installed: {', '.join(missing)}")
+        return
+    
+    # Determine Q-table file path: a file, or a tag of the artifact registry
+    if args.file and os.path.exists(args.file):
         q_table_file = args.file
     else:
         try:
-            q_table_file = find_latest_q_table()
-            print(f"No file specified. Using the latest Q-table file: {q_table_file}")
+            q_table_file = find_latest_q_table(tag=args.file or 'latest')
+            print(f"Using the {args.file or 'latest'} Q-table file: {q_table_file}")
         except FileNotFoundError as e:
             print(e)
             return
     
     # Load Q-table
-    q_table, epsilon = load_q_table(q_table_file)
+    table, epsilon = load_q_table(q_table_file)
     
-    # Convert Q-table to DataFrame
-    df = q_table_to_dataframe(q_table)
+    # Embeddings are cached next to the table, keyed by its content
+    cache_key = None
+    if not args.no_cache:
+        cache_key = (os.path.join(os.path.dirname(os.path.abspath(q_table_file)), EMBEDDING_CACHE_DIR),
+                     file_digest(q_table_file))
     
     # Create and display visualizations
-    create_visualizations(df, epsilon)
-    print("All visualizations displayed on screen.")
+    create_visualizations(table, epsilon, cache_key, args.command)
+    if args.command != 'summary':
+        print("All visualizations displayed on screen.")
 
 
 if __name__ == '__main__':